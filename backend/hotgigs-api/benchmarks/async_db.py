@@ -0,0 +1,83 @@
+"""
+Async DB Benchmark
+Requests/second for the jobs listing query under concurrency, comparing the
+previous route shape (async def calling the synchronous Session) with the
+AsyncSession route shape.
+
+Requires a reachable, seeded DATABASE_URL. Usage:
+    python benchmarks/async_db.py --requests 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import httpx
+from fastapi import FastAPI, Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from db.session import get_db, get_async_db, async_engine
+from models.job import Job
+
+
+def build_app(limit: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/sync/jobs")
+    async def list_jobs_sync(db: Session = Depends(get_db)):
+        """Before: each query blocks the event loop"""
+        jobs = db.query(Job).filter(Job.is_active.is_(True)).limit(limit).all()
+        return [str(job.id) for job in jobs]
+
+    @app.get("/async/jobs")
+    async def list_jobs_async(db: AsyncSession = Depends(get_async_db)):
+        """After: the event loop serves other requests while the query runs"""
+        result = await db.execute(select(Job).where(Job.is_active.is_(True)).limit(limit))
+        return [str(job.id) for job in result.scalars().all()]
+
+    return app
+
+
+async def run(client: httpx.AsyncClient, path: str, requests: int, concurrency: int) -> float:
+    """Requests/second for `requests` GETs with `concurrency` in flight"""
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            response = await client.get(path)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main(args):
+    app = build_app(args.limit)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm up both connection pools
+        for path in ("/sync/jobs", "/async/jobs"):
+            await run(client, path, args.concurrency, args.concurrency)
+
+        print(f"requests={args.requests} concurrency={args.concurrency} limit={args.limit}")
+        for label, path in (("sync Session", "/sync/jobs"), ("AsyncSession", "/async/jobs")):
+            rps = await run(client, path, args.requests, args.concurrency)
+            print(f"{label:<14} {rps:10.1f} req/s")
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async DB routes")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20, help="Jobs per page")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,78 @@
+"""
+Email Digest Benchmark
+Users/second through the digest delivery stage (render + rate-limited,
+retried sends on the worker pool) against a file transport with simulated
+relay latency and transient failures. No database needed. Usage:
+    python benchmarks/email_digest.py --users 5000 --latency-ms 20 --workers 1 8 32
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from services.email_digest import EmailDigestService, render_digest
+from services.email_transport import FileTransport, TransientEmailError
+
+
+class SimulatedRelay(FileTransport):
+    """File transport that waits like a network round trip and sometimes fails"""
+
+    def __init__(self, directory: str, latency_ms: float, failure_rate: float):
+        super().__init__(directory)
+        self.latency = latency_ms / 1000
+        self.failure_rate = failure_rate
+
+    def send(self, message):
+        time.sleep(self.latency)
+        if random.random() < self.failure_rate:
+            raise TransientEmailError("421 try again later")
+        super().send(message)
+
+
+def build_messages(users: int, per_user: int):
+    notifications = [
+        SimpleNamespace(title=f"Notification {i}", message="Something happened", action_url=f"/items/{i}")
+        for i in range(per_user)
+    ]
+    return [render_digest(f"user{i}@example.com", f"User {i}", notifications) for i in range(users)]
+
+
+def main(args):
+    print(f"users={args.users} per_user={args.per_user} latency={args.latency_ms}ms "
+          f"failure_rate={args.failure_rate} rate_limit={args.rate}/s")
+
+    start = time.perf_counter()
+    messages = build_messages(args.users, args.per_user)
+    print(f"{'render':<12} {args.users / (time.perf_counter() - start):10.1f} users/s")
+
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as directory:
+            transport = SimulatedRelay(directory, args.latency_ms, args.failure_rate)
+            service = EmailDigestService(db=None, workers=workers, rate_per_second=args.rate)
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = service.deliver(pool, transport, messages)
+            elapsed = time.perf_counter() - start
+
+        delivered = sum(1 for sent, _ in results if sent)
+        retries = sum(retries for _, retries in results)
+        print(f"{workers:>3} workers {args.users / elapsed:10.1f} users/s "
+              f"({delivered} delivered, {retries} retries)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark email digest delivery")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--per-user", type=int, default=5, help="Notifications per digest")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Simulated relay round trip")
+    parser.add_argument("--failure-rate", type=float, default=0.01, help="Share of sends failing transiently")
+    parser.add_argument("--rate", type=float, default=10000.0, help="Rate limit, sends/sec")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 32])
+    main(parser.parse_args())
@@ -0,0 +1,103 @@
+"""
+Login Storm Benchmark
+Latency of an unrelated endpoint while a burst of logins runs, comparing
+bcrypt on the event loop with bcrypt on the bounded hasher pool.
+
+Needs no database. Usage:
+    python benchmarks/login_storm.py --logins 200 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import httpx
+from fastapi import FastAPI
+
+from core.security import get_password_hash, verify_password, verify_password_async, password_hasher
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    hashed_password = get_password_hash("correct horse battery staple")
+
+    @app.post("/blocking/login")
+    async def login_blocking():
+        """Before: bcrypt runs on the event loop"""
+        return {"ok": verify_password("correct horse battery staple", hashed_password)}
+
+    @app.post("/pooled/login")
+    async def login_pooled():
+        """After: bcrypt runs on the bounded pool"""
+        return {"ok": await verify_password_async("correct horse battery staple", hashed_password)}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def storm(client: httpx.AsyncClient, path: str, logins: int, concurrency: int, interval: float):
+    """Fire `logins` logins while pinging; returns ping latencies and login status counts"""
+    remaining = iter(range(logins))
+    statuses = {}
+    done = asyncio.Event()
+
+    async def login_worker():
+        for _ in remaining:
+            response = await client.post(path)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    async def pinger():
+        # Latency is measured from when the ping was due, so time spent
+        # waiting for a blocked event loop is counted
+        latencies = []
+        due = time.perf_counter()
+        while True:
+            await client.get("/ping")
+            latencies.append((time.perf_counter() - due) * 1000)
+            if done.is_set():
+                return latencies
+            due = max(due + interval, time.perf_counter())
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+
+    ping_task = asyncio.create_task(pinger())
+    await asyncio.gather(*(login_worker() for _ in range(concurrency)))
+    done.set()
+
+    return await ping_task, statuses
+
+
+async def main(args):
+    transport = httpx.ASGITransport(app=build_app())
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        print(f"logins={args.logins} concurrency={args.concurrency} "
+              f"pool={password_hasher.max_workers}+{password_hasher.max_queue}")
+
+        for label, path in (("blocking", "/blocking/login"), ("pooled", "/pooled/login")):
+            latencies, statuses = await storm(
+                client, path, args.logins, args.concurrency, args.ping_interval
+            )
+            print(f"{label:<9} /ping p50={percentile(latencies, 50):8.2f}ms "
+                  f"p99={percentile(latencies, 99):8.2f}ms max={max(latencies):8.2f}ms "
+                  f"samples={len(latencies)} "
+                  f"login statuses={statuses}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark /ping latency during a login storm")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--ping-interval", type=float, default=0.005, help="Seconds between pings")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,76 @@
+"""
+Typeahead Benchmark
+Latency of GET /api/search/suggest through the search router: the first
+request on a cold index, which builds it from the active jobs in the
+database, then warm requests against the built index.
+
+Requires a reachable, seeded DATABASE_URL. Usage:
+    python benchmarks/typeahead.py --requests 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import httpx
+from fastapi import FastAPI
+
+from api.routes import search
+from db.session import async_engine
+from services.typeahead import typeahead_index
+
+PREFIXES = ["p", "py", "pyth", "se", "senior", "dev", "data", "new", "san", "re", "java", "eng"]
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(search.router, prefix="/api/search")
+    return app
+
+
+async def run(client: httpx.AsyncClient, requests: int, concurrency: int) -> float:
+    """Requests/second for `requests` suggest calls with `concurrency` in flight"""
+    remaining = zip(range(requests), itertools.cycle(PREFIXES))
+
+    async def worker():
+        for _, prefix in remaining:
+            response = await client.get("/api/search/suggest", params={"q": prefix})
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main(args):
+    # No snapshot, so the first request has to build the index from the database
+    typeahead_index.snapshot_path = ''
+    transport = httpx.ASGITransport(app=build_app())
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        response = await client.get("/api/search/suggest", params={"q": PREFIXES[0]})
+        response.raise_for_status()
+        cold_ms = (time.perf_counter() - start) * 1000
+
+        if not typeahead_index.is_built:
+            sys.exit("suggest returned without building the index")
+
+        print(f"index: {typeahead_index.stats()}")
+        print(f"cold request (builds index) {cold_ms:10.1f} ms")
+        rps = await run(client, args.requests, args.concurrency)
+        print(f"warm requests               {rps:10.1f} req/s")
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the typeahead suggest route")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -1,19 +1,31 @@
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from pydantic import BaseModel
 import uuid
 
-from db.session import get_db
-from models.candidate import CandidateProfile, CandidateSkill
+from db.session import get_async_db
+from models.candidate import CandidateProfile
 from models.job import Job
 from models.user import User
 from core.security import get_current_user
-from services.ai_matching import AIMatchingService
+from services.ai_matching import AIMatchingService, experience_level_for_years, job_work_model
+from services.skill_index import skill_index
+from services.skill_dictionary import skill_dictionary
+from services.match_cache import match_cache
+from services.match_features import MatchFeatureService
+from services.semantic_index import (
+    job_semantic_index, candidate_semantic_index, job_text, candidate_text
+)
 
 router = APIRouter()
 matching_service = AIMatchingService()
 
+# Candidate pruning strategies for the ranking endpoints
+MATCH_MODES = ("skills", "semantic")
+
 class MatchScoreResponse(BaseModel):
     match_score: float
     breakdown: dict
@@ -24,42 +36,65 @@ class MatchScoreResponse(BaseModel):
 async def get_matched_jobs_for_candidate(
     candidate_id: str,
     limit: int = 20,
+    mode: str = "skills",
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get AI-matched jobs for a candidate"""
     
+    if mode not in MATCH_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(MATCH_MODES)}")
+    
     # Get candidate profile
-    candidate = db.query(CandidateProfile).filter(
-        CandidateProfile.id == uuid.UUID(candidate_id)
-    ).first()
+    candidate = await db.get(CandidateProfile, uuid.UUID(candidate_id))
     
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
-    # Get candidate skills
-    skills = db.query(CandidateSkill).filter(
-        CandidateSkill.candidate_id == candidate.id
-    ).all()
+    # Get precomputed match features
+    features = await db.run_sync(
+        lambda session: MatchFeatureService(session, matching_service).get_for_candidate(candidate)
+    )
     
     # Build candidate profile dict
     candidate_dict = {
         'id': str(candidate.id),
-        'skills': [{'name': skill.skill_name, 'proficiency': skill.proficiency_level} for skill in skills],
+        'updated_at': candidate.updated_at,
+        'skills': features['skill_names'],
+        'match_features': features,
         'years_of_experience': candidate.years_of_experience or 0,
-        'experience_level': candidate.experience_level or 'entry',
+        'experience_level': experience_level_for_years(candidate.years_of_experience),
         'location': candidate.location or '',
         'remote_preference': True,  # TODO: Add to model
         'education': []  # TODO: Fetch from education table
     }
     
-    # Get active jobs
-    jobs = db.query(Job).filter(Job.status == 'active').limit(100).all()
+    if mode == "semantic":
+        # Nearest jobs by embedding similarity (rule-based scoring ranks the pool)
+        await db.run_sync(job_semantic_index.ensure_built)
+        job_ids = {
+            job_id for job_id, _ in job_semantic_index.search_text(candidate_text(
+                candidate.title, candidate.current_position, candidate.bio, features['skill_names']
+            ))
+        }
+    else:
+        # Get active jobs sharing at least one skill, including related and
+        # partial variants (batch scoring handles the rest)
+        await db.run_sync(skill_index.ensure_built)
+        job_ids = skill_index.find_jobs(skill_dictionary.expand(features['skill_names']))
+    
+    jobs = (await db.execute(
+        select(Job).where(
+            Job.id.in_(job_ids),
+            Job.is_active.is_(True)
+        )
+    )).scalars().all() if job_ids else []
     
     # Convert jobs to dicts
     jobs_dict = [
         {
             'id': str(job.id),
+            'updated_at': job.updated_at,
             'title': job.title,
             'company_id': str(job.company_id),
             'description': job.description,
@@ -67,34 +102,39 @@ async def get_matched_jobs_for_candidate(
             'preferred_skills': job.preferred_skills or [],
             'experience_level': job.experience_level,
             'location': job.location,
-            'work_model': job.work_model,
-            'requirements': job.requirements or [],
+            'work_model': job_work_model(job.remote_policy),
+            'requirements': [job.education_requirement] if job.education_requirement else [],
             'salary_min': job.salary_min,
             'salary_max': job.salary_max
         }
         for job in jobs
     ]
     
-    # Rank jobs using AI matching
-    ranked_jobs = matching_service.rank_jobs_for_candidate(candidate_dict, jobs_dict)
-    
-    return ranked_jobs[:limit]
+    # Rank jobs using AI matching (top-k only), off the event loop
+    return await run_in_threadpool(
+        matching_service.top_jobs_for_candidate,
+        candidate_dict, jobs_dict, limit, cache=match_cache
+    )
 
 @router.get("/job/{job_id}/candidates", response_model=List[dict])
 async def get_matched_candidates_for_job(
     job_id: str,
     limit: int = 20,
+    mode: str = "skills",
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get AI-matched candidates for a job"""
     
+    if mode not in MATCH_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(MATCH_MODES)}")
+    
     # Check if user is employer
     if current_user.role != "employer":
         raise HTTPException(status_code=403, detail="Only employers can access this endpoint")
     
     # Get job
-    job = db.query(Job).filter(Job.id == uuid.UUID(job_id)).first()
+    job = await db.get(Job, uuid.UUID(job_id))
     
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -102,6 +142,7 @@ async def get_matched_candidates_for_job(
     # Build job dict
     job_dict = {
         'id': str(job.id),
+        'updated_at': job.updated_at,
         'title': job.title,
         'company_id': str(job.company_id),
         'description': job.description,
@@ -109,74 +150,105 @@ async def get_matched_candidates_for_job(
         'preferred_skills': job.preferred_skills or [],
         'experience_level': job.experience_level,
         'location': job.location,
-        'work_model': job.work_model,
-        'requirements': job.requirements or [],
+        'work_model': job_work_model(job.remote_policy),
+        'requirements': [job.education_requirement] if job.education_requirement else [],
         'salary_min': job.salary_min,
         'salary_max': job.salary_max
     }
     
-    # Get all candidates
-    candidates = db.query(CandidateProfile).limit(100).all()
+    if mode == "semantic":
+        # Nearest candidates by embedding similarity (rule-based scoring ranks the pool)
+        await db.run_sync(candidate_semantic_index.ensure_built)
+        candidate_ids = {
+            candidate_id for candidate_id, _ in candidate_semantic_index.search_text(job_text(
+                job.title, job.description, job.required_skills, job.preferred_skills
+            ))
+        }
+        candidates = (await db.execute(
+            select(CandidateProfile).where(CandidateProfile.id.in_(candidate_ids))
+        )).scalars().all() if candidate_ids else []
+    # Get candidates sharing at least one required skill or a related/partial variant
+    elif job.required_skills:
+        await db.run_sync(skill_index.ensure_built)
+        candidate_ids = skill_index.find_candidates(skill_dictionary.expand(job.required_skills))
+        candidates = (await db.execute(
+            select(CandidateProfile).where(CandidateProfile.id.in_(candidate_ids))
+        )).scalars().all() if candidate_ids else []
+    else:
+        # No required skills: every candidate gets a full skill score
+        candidates = (await db.execute(select(CandidateProfile))).scalars().all()
+    
+    # Precomputed match features: one row per candidate, no skill joins
+    features_by_id = await db.run_sync(
+        lambda session: MatchFeatureService(session, matching_service).get_features(candidates)
+    )
+    
+    # Candidate names live on the user account
+    user_ids = {candidate.user_id for candidate in candidates}
+    names_by_user = dict((await db.execute(
+        select(User.id, User.full_name).where(User.id.in_(user_ids))
+    )).all()) if user_ids else {}
     
-    # Build candidates list with skills
+    # Build candidates list with features
     candidates_dict = []
     for candidate in candidates:
-        skills = db.query(CandidateSkill).filter(
-            CandidateSkill.candidate_id == candidate.id
-        ).all()
+        features = features_by_id[candidate.id]
         
         candidates_dict.append({
             'id': str(candidate.id),
+            'updated_at': candidate.updated_at,
             'user_id': str(candidate.user_id),
-            'full_name': candidate.full_name,
-            'headline': candidate.headline,
-            'skills': [{'name': skill.skill_name, 'proficiency': skill.proficiency_level} for skill in skills],
+            'full_name': names_by_user.get(candidate.user_id),
+            'headline': candidate.title or candidate.current_position,
+            'skills': features['skill_names'],
+            'match_features': features,
             'years_of_experience': candidate.years_of_experience or 0,
-            'experience_level': candidate.experience_level or 'entry',
+            'experience_level': experience_level_for_years(candidate.years_of_experience),
             'location': candidate.location or '',
             'remote_preference': True,
             'education': []
         })
     
-    # Rank candidates using AI matching
-    ranked_candidates = matching_service.rank_candidates_for_job(candidates_dict, job_dict)
-    
-    return ranked_candidates[:limit]
+    # Rank candidates using AI matching (top-k only), off the event loop
+    return await run_in_threadpool(
+        matching_service.top_candidates_for_job,
+        candidates_dict, job_dict, limit, cache=match_cache
+    )
 
 @router.post("/calculate-match", response_model=MatchScoreResponse)
 async def calculate_match_score(
     candidate_id: str,
     job_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Calculate match score between a specific candidate and job"""
     
     # Get candidate
-    candidate = db.query(CandidateProfile).filter(
-        CandidateProfile.id == uuid.UUID(candidate_id)
-    ).first()
+    candidate = await db.get(CandidateProfile, uuid.UUID(candidate_id))
     
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
     # Get job
-    job = db.query(Job).filter(Job.id == uuid.UUID(job_id)).first()
+    job = await db.get(Job, uuid.UUID(job_id))
     
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    # Get candidate skills
-    skills = db.query(CandidateSkill).filter(
-        CandidateSkill.candidate_id == candidate.id
-    ).all()
+    # Get precomputed match features
+    features = await db.run_sync(
+        lambda session: MatchFeatureService(session, matching_service).get_for_candidate(candidate)
+    )
     
     # Build candidate profile dict
     candidate_dict = {
         'id': str(candidate.id),
-        'skills': [{'name': skill.skill_name, 'proficiency': skill.proficiency_level} for skill in skills],
+        'updated_at': candidate.updated_at,
+        'skills': features['skill_names'],
+        'match_features': features,
         'years_of_experience': candidate.years_of_experience or 0,
-        'experience_level': candidate.experience_level or 'entry',
+        'experience_level': experience_level_for_years(candidate.years_of_experience),
         'location': candidate.location or '',
         'remote_preference': True,
         'education': []
@@ -185,17 +257,39 @@ async def calculate_match_score(
     # Build job dict
     job_dict = {
         'id': str(job.id),
+        'updated_at': job.updated_at,
         'title': job.title,
         'required_skills': job.required_skills or [],
         'preferred_skills': job.preferred_skills or [],
         'experience_level': job.experience_level,
         'location': job.location,
-        'work_model': job.work_model,
-        'requirements': job.requirements or []
+        'work_model': job_work_model(job.remote_policy),
+        'requirements': [job.education_requirement] if job.education_requirement else []
     }
     
     # Calculate match score
-    match_result = matching_service.calculate_match_score(candidate_dict, job_dict)
+    match_result = matching_service.calculate_match_score(
+        candidate_dict, job_dict, cache=match_cache
+    )
     
     return match_result
 
+@router.get("/cache-stats")
+async def get_match_cache_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Get match score cache hit/miss counters"""
+    
+    return match_cache.stats()
+
+@router.get("/semantic-index-stats")
+async def get_semantic_index_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Get semantic index sizes"""
+    
+    return {
+        'jobs': job_semantic_index.get_stats(),
+        'candidates': candidate_semantic_index.get_stats()
+    }
+
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from pydantic import BaseModel, EmailStr
 from sqlalchemy.orm import Session
-from core.security import create_access_token, get_password_hash, verify_password
+from core.security import create_access_token, get_password_hash_async, verify_password_async
 from db.session import get_db
 from models.user import User, UserRole
 from datetime import timedelta
@@ -36,7 +36,7 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
         )
     
     # Hash password
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     
     # Create new user
     new_user = User(
@@ -78,7 +78,7 @@ async def login(credentials: UserLogin, db: Session = Depends(get_db)):
         )
     
     # Verify password
-    if not user.hashed_password or not verify_password(credentials.password, user.hashed_password):
+    if not user.hashed_password or not await verify_password_async(credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -6,6 +6,9 @@ from datetime import datetime
 from db.session import get_db
 from models.candidate import CandidateProfile, CandidateSkill, WorkExperience, Education
 from models.user import User
+from services.skill_index import skill_index
+from services.match_features import MatchFeatureService
+from services.semantic_index import candidate_semantic_index, candidate_text
 import uuid
 
 router = APIRouter()
@@ -128,9 +131,15 @@ async def create_candidate_profile(
     )
     
     db.add(profile)
+    db.flush()
+    features = MatchFeatureService(db).refresh_candidate(profile)
     db.commit()
     db.refresh(profile)
     
+    candidate_semantic_index.upsert(profile.id, candidate_text(
+        profile.title, profile.current_position, profile.bio, features.skill_names
+    ))
+    
     return profile
 
 @router.get("/profile/{user_email}")
@@ -188,9 +197,14 @@ async def update_candidate_profile(
         setattr(profile, field, value)
     
     profile.updated_at = datetime.utcnow()
+    features = MatchFeatureService(db).refresh_candidate(profile)
     db.commit()
     db.refresh(profile)
     
+    candidate_semantic_index.upsert(profile.id, candidate_text(
+        profile.title, profile.current_position, profile.bio, features.skill_names
+    ))
+    
     return profile
 
 @router.post("/profile/{user_email}/skills", status_code=status.HTTP_201_CREATED)
@@ -214,9 +228,16 @@ async def add_skill(
     )
     
     db.add(skill)
+    profile.updated_at = datetime.utcnow()  # Invalidates cached match scores
+    features = MatchFeatureService(db).refresh_candidate(profile)
     db.commit()
     db.refresh(skill)
     
+    skill_index.add_candidate_skill(profile.id, skill.skill_name)
+    candidate_semantic_index.upsert(profile.id, candidate_text(
+        profile.title, profile.current_position, profile.bio, features.skill_names
+    ))
+    
     return skill
 
 @router.get("/profile/{user_email}/skills")
@@ -257,6 +278,8 @@ async def add_work_experience(
     )
     
     db.add(experience)
+    profile.updated_at = datetime.utcnow()  # Invalidates cached match scores
+    MatchFeatureService(db).refresh_candidate(profile)
     db.commit()
     db.refresh(experience)
     
@@ -303,6 +326,8 @@ async def add_education(
     )
     
     db.add(education)
+    profile.updated_at = datetime.utcnow()  # Invalidates cached match scores
+    MatchFeatureService(db).refresh_candidate(profile)
     db.commit()
     db.refresh(education)
     
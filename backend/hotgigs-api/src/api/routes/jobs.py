@@ -1,15 +1,26 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from datetime import datetime
 import uuid
 
-from db.session import get_db
+from db.session import get_db, get_async_db
 from models.job import Job, Company, CompanyTeamMember
 from models.candidate import Application
 from models.user import User
 from core.security import get_current_user
+from services.ai_matching import job_work_model
+from services.skill_index import skill_index
+from services.search_cache import search_result_cache
+from services.semantic_index import job_semantic_index, job_text
+from services.text_index import job_text_index
+from services.typeahead import typeahead_index
+from services.job_match_fanout import run_new_job_match_fanout
+from services.location_index import location_filter, location_index
+from services.search_alerts import run_saved_search_alerts
 
 router = APIRouter()
 
@@ -68,6 +79,33 @@ class JobResponse(BaseModel):
     
     class Config:
         from_attributes = True
+    
+    @model_validator(mode="before")
+    @classmethod
+    def from_job(cls, data):
+        """Map a Job row onto the response fields (the columns are named differently)"""
+        if not isinstance(data, Job):
+            return data
+        return {
+            'id': str(data.id),
+            'company_id': str(data.company_id),
+            'title': data.title,
+            'description': data.description,
+            'requirements': [data.education_requirement] if data.education_requirement else [],
+            'responsibilities': data.responsibilities or [],
+            'location': data.location,
+            'work_model': job_work_model(data.remote_policy),
+            'employment_type': data.job_type,
+            'experience_level': data.experience_level,
+            'salary_min': data.salary_min,
+            'salary_max': data.salary_max,
+            'required_skills': data.required_skills or [],
+            'preferred_skills': data.preferred_skills or [],
+            'benefits': data.benefits or [],
+            'status': "active" if data.is_active else "inactive",
+            'created_at': data.created_at,
+            'updated_at': data.updated_at,
+        }
 
 class ApplicationStatusUpdate(BaseModel):
     status: str  # submitted, reviewed, shortlisted, interview, offer, rejected, withdrawn
@@ -75,6 +113,7 @@ class ApplicationStatusUpdate(BaseModel):
 @router.post("/", response_model=JobResponse, status_code=201)
 async def create_job(
     job_data: JobCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -104,24 +143,36 @@ async def create_job(
         posted_by=current_user.id,
         title=job_data.title,
         description=job_data.description,
-        requirements=job_data.requirements,
+        education_requirement="; ".join(job_data.requirements) or None,
         responsibilities=job_data.responsibilities,
         location=job_data.location,
-        work_model=job_data.work_model,
-        employment_type=job_data.employment_type,
+        remote_policy=job_data.work_model.lower().replace("-", ""),
+        job_type=job_data.employment_type,
         experience_level=job_data.experience_level,
         salary_min=job_data.salary_min,
         salary_max=job_data.salary_max,
         required_skills=job_data.required_skills,
         preferred_skills=job_data.preferred_skills,
         benefits=job_data.benefits,
-        status="active"
+        is_active=True
     )
     
     db.add(job)
     db.commit()
     db.refresh(job)
     
+    skill_index.set_job_skills(job.id, job.required_skills, job.preferred_skills)
+    job_semantic_index.upsert(job.id, job_text(
+        job.title, job.description, job.required_skills, job.preferred_skills
+    ))
+    job_text_index.set_job(job.id, job.title, job.required_skills, job.description)
+    typeahead_index.set_job(job.id, job.title, job.required_skills, job.location, company.name)
+    search_result_cache.invalidate()
+    
+    # Notify matching candidates and saved-search alert subscribers after the response is sent
+    background_tasks.add_task(run_new_job_match_fanout, job.id)
+    background_tasks.add_task(run_saved_search_alerts, job.id)
+    
     return job
 
 @router.get("/", response_model=List[JobResponse])
@@ -133,32 +184,37 @@ async def get_jobs(
     employment_type: str | None = None,
     experience_level: str | None = None,
     status: str | None = "active",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all jobs with optional filtering"""
-    query = db.query(Job)
+    query = select(Job)
     
     if status:
-        query = query.filter(Job.status == status)
+        # Jobs are active or not; any other status lists the inactive ones
+        query = query.where(Job.is_active.is_(status == "active"))
     if location:
-        query = query.filter(Job.location.ilike(f"%{location}%"))
+        dialect_name = db.get_bind().dialect.name
+        if dialect_name != "postgresql" and not location_index.is_built:
+            await db.run_sync(location_index.ensure_built)
+        query = query.where(location_filter(Job.location_normalized, location, dialect_name))
     if work_model:
-        query = query.filter(Job.work_model == work_model)
+        # remote_policy is stored as remote, hybrid or onsite
+        query = query.where(Job.remote_policy == work_model.lower().replace("-", ""))
     if employment_type:
-        query = query.filter(Job.employment_type == employment_type)
+        query = query.where(Job.job_type == employment_type)
     if experience_level:
-        query = query.filter(Job.experience_level == experience_level)
+        query = query.where(Job.experience_level == experience_level)
     
-    jobs = query.offset(skip).limit(limit).all()
-    return jobs
+    result = await db.execute(query.offset(skip).limit(limit))
+    return result.scalars().all()
 
 @router.get("/{job_id}", response_model=JobResponse)
 async def get_job(
     job_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific job by ID"""
-    job = db.query(Job).filter(Job.id == uuid.UUID(job_id)).first()
+    job = await db.get(Job, uuid.UUID(job_id))
     
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -189,6 +245,14 @@ async def update_job(
     
     # Update fields
     update_data = job_data.dict(exclude_unset=True)
+    if "requirements" in update_data:
+        update_data["education_requirement"] = "; ".join(update_data.pop("requirements") or []) or None
+    if "work_model" in update_data:
+        update_data["remote_policy"] = (update_data.pop("work_model") or "").lower().replace("-", "") or None
+    if "employment_type" in update_data:
+        update_data["job_type"] = update_data.pop("employment_type")
+    if "status" in update_data:
+        update_data["is_active"] = update_data.pop("status") == "active"
     for field, value in update_data.items():
         setattr(job, field, value)
     
@@ -197,6 +261,20 @@ async def update_job(
     db.commit()
     db.refresh(job)
     
+    job_text_index.set_job(job.id, job.title, job.required_skills, job.description)
+    search_result_cache.invalidate()
+    if job.is_active:
+        skill_index.set_job_skills(job.id, job.required_skills, job.preferred_skills)
+        job_semantic_index.upsert(job.id, job_text(
+            job.title, job.description, job.required_skills, job.preferred_skills
+        ))
+        company_name = db.query(Company.name).filter(Company.id == job.company_id).scalar()
+        typeahead_index.set_job(job.id, job.title, job.required_skills, job.location, company_name)
+    else:
+        skill_index.remove_job(job.id)
+        job_semantic_index.remove(job.id)
+        typeahead_index.remove_job(job.id)
+    
     return job
 
 @router.delete("/{job_id}", status_code=204)
@@ -223,6 +301,12 @@ async def delete_job(
     db.delete(job)
     db.commit()
     
+    skill_index.remove_job(job.id)
+    job_semantic_index.remove(job.id)
+    job_text_index.remove_job(job.id)
+    typeahead_index.remove_job(job.id)
+    search_result_cache.invalidate()
+    
     return None
 
 # Application Management for Jobs
@@ -1,17 +1,31 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
-from ...db.session import get_db
+from ...db.session import get_async_db
 from ...models.message import Conversation, Message, ConversationStatus, MessageType
 from ...models.user import User
 from ...core.security import get_current_user
+from ...services.unread_counters import UnreadCounterService
 
 router = APIRouter(prefix="/messages", tags=["messages"])
 
 
+def _unread_column(conversation: Conversation, user_id):
+    """The conversation's unread counter column for one participant"""
+    if conversation.candidate_id == user_id:
+        return 'candidate_unread_count'
+    return 'recruiter_unread_count'
+
+
+async def _add_unread_messages(db: AsyncSession, deltas):
+    """Apply per-user deltas to the unread message counters (same transaction)"""
+    await db.run_sync(lambda session: UnreadCounterService(session).add('messages', deltas))
+
+
 # Pydantic models
 class MessageCreate(BaseModel):
     content: str
@@ -65,36 +79,33 @@ class ConversationResponse(BaseModel):
 async def get_conversations(
     status: Optional[ConversationStatus] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all conversations for the current user"""
-    query = db.query(Conversation).filter(
+    query = select(Conversation).where(
         (Conversation.candidate_id == current_user.id) | 
         (Conversation.recruiter_id == current_user.id)
     )
     
     if status:
-        query = query.filter(Conversation.status == status)
+        query = query.where(Conversation.status == status)
     
-    conversations = query.order_by(Conversation.last_message_at.desc()).all()
+    conversations = (await db.execute(
+        query.order_by(Conversation.last_message_at.desc())
+    )).scalars().all()
     
     # Add unread count and last message for each conversation
     result = []
     for conv in conversations:
         conv_dict = ConversationResponse.from_orm(conv).dict()
-        
-        # Get unread count
-        unread_count = db.query(Message).filter(
-            Message.conversation_id == conv.id,
-            Message.sender_id != current_user.id,
-            Message.is_read == False
-        ).count()
-        conv_dict['unread_count'] = unread_count
+        conv_dict['unread_count'] = getattr(conv, _unread_column(conv, current_user.id))
         
         # Get last message
-        last_message = db.query(Message).filter(
-            Message.conversation_id == conv.id
-        ).order_by(Message.created_at.desc()).first()
+        last_message = await db.scalar(
+            select(Message).where(
+                Message.conversation_id == conv.id
+            ).order_by(Message.created_at.desc()).limit(1)
+        )
         
         if last_message:
             conv_dict['last_message'] = MessageResponse.from_orm(last_message)
@@ -108,16 +119,18 @@ async def get_conversations(
 async def create_conversation(
     conversation: ConversationCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new conversation"""
     # Check if conversation already exists
-    existing = db.query(Conversation).filter(
-        Conversation.candidate_id == current_user.id,
-        Conversation.recruiter_id == conversation.recruiter_id,
-        Conversation.job_id == conversation.job_id,
-        Conversation.status == ConversationStatus.ACTIVE
-    ).first()
+    existing = await db.scalar(
+        select(Conversation).where(
+            Conversation.candidate_id == current_user.id,
+            Conversation.recruiter_id == conversation.recruiter_id,
+            Conversation.job_id == conversation.job_id,
+            Conversation.status == ConversationStatus.ACTIVE
+        ).limit(1)
+    )
     
     if existing:
         # Add message to existing conversation
@@ -128,8 +141,10 @@ async def create_conversation(
         )
         db.add(new_message)
         existing.last_message_at = datetime.utcnow()
-        db.commit()
-        db.refresh(existing)
+        existing.recruiter_unread_count = Conversation.recruiter_unread_count + 1
+        await _add_unread_messages(db, {existing.recruiter_id: 1})
+        await db.commit()
+        await db.refresh(existing)
         return existing
     
     # Create new conversation
@@ -138,11 +153,12 @@ async def create_conversation(
         recruiter_id=conversation.recruiter_id,
         job_id=conversation.job_id,
         application_id=conversation.application_id,
-        subject=conversation.subject
+        subject=conversation.subject,
+        recruiter_unread_count=1
     )
     db.add(new_conversation)
-    db.commit()
-    db.refresh(new_conversation)
+    await db.commit()
+    await db.refresh(new_conversation)
     
     # Add initial message
     initial_message = Message(
@@ -151,7 +167,8 @@ async def create_conversation(
         content=conversation.initial_message
     )
     db.add(initial_message)
-    db.commit()
+    await _add_unread_messages(db, {new_conversation.recruiter_id: 1})
+    await db.commit()
     
     return new_conversation
 
@@ -162,15 +179,17 @@ async def get_messages(
     limit: int = 50,
     offset: int = 0,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get messages for a conversation"""
     # Verify user has access to this conversation
-    conversation = db.query(Conversation).filter(
-        Conversation.id == conversation_id,
-        (Conversation.candidate_id == current_user.id) | 
-        (Conversation.recruiter_id == current_user.id)
-    ).first()
+    conversation = await db.scalar(
+        select(Conversation).where(
+            Conversation.id == conversation_id,
+            (Conversation.candidate_id == current_user.id) | 
+            (Conversation.recruiter_id == current_user.id)
+        )
+    )
     
     if not conversation:
         raise HTTPException(
@@ -179,17 +198,29 @@ async def get_messages(
         )
     
     # Get messages
-    messages = db.query(Message).filter(
-        Message.conversation_id == conversation_id
-    ).order_by(Message.created_at.desc()).offset(offset).limit(limit).all()
+    messages = (await db.execute(
+        select(Message).where(
+            Message.conversation_id == conversation_id
+        ).order_by(Message.created_at.desc()).offset(offset).limit(limit)
+    )).scalars().all()
     
     # Mark messages as read
-    db.query(Message).filter(
-        Message.conversation_id == conversation_id,
-        Message.sender_id != current_user.id,
-        Message.is_read == False
-    ).update({"is_read": True, "read_at": datetime.utcnow()})
-    db.commit()
+    marked = (await db.execute(
+        update(Message).where(
+            Message.conversation_id == conversation_id,
+            Message.sender_id != current_user.id,
+            Message.is_read == False
+        ).values(is_read=True, read_at=datetime.utcnow())
+    )).rowcount
+    if marked:
+        await db.execute(
+            update(Conversation).where(
+                Conversation.id == conversation_id
+            ).values({_unread_column(conversation, current_user.id): 0})
+        )
+        if conversation.status == ConversationStatus.ACTIVE:
+            await _add_unread_messages(db, {current_user.id: -marked})
+    await db.commit()
     
     return messages[::-1]  # Reverse to show oldest first
 
@@ -199,15 +230,17 @@ async def send_message(
     conversation_id: int,
     message: MessageCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Send a message in a conversation"""
     # Verify user has access to this conversation
-    conversation = db.query(Conversation).filter(
-        Conversation.id == conversation_id,
-        (Conversation.candidate_id == current_user.id) | 
-        (Conversation.recruiter_id == current_user.id)
-    ).first()
+    conversation = await db.scalar(
+        select(Conversation).where(
+            Conversation.id == conversation_id,
+            (Conversation.candidate_id == current_user.id) | 
+            (Conversation.recruiter_id == current_user.id)
+        )
+    )
     
     if not conversation:
         raise HTTPException(
@@ -227,11 +260,19 @@ async def send_message(
     )
     db.add(new_message)
     
-    # Update conversation last_message_at
+    # Update conversation last_message_at and the recipient's unread count
     conversation.last_message_at = datetime.utcnow()
+    if conversation.candidate_id == current_user.id:
+        recipient_id = conversation.recruiter_id
+        conversation.recruiter_unread_count = Conversation.recruiter_unread_count + 1
+    else:
+        recipient_id = conversation.candidate_id
+        conversation.candidate_unread_count = Conversation.candidate_unread_count + 1
+    if conversation.status == ConversationStatus.ACTIVE:
+        await _add_unread_messages(db, {recipient_id: 1})
     
-    db.commit()
-    db.refresh(new_message)
+    await db.commit()
+    await db.refresh(new_message)
     
     return new_message
 
@@ -241,14 +282,16 @@ async def update_conversation_status(
     conversation_id: int,
     status: ConversationStatus,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update conversation status"""
-    conversation = db.query(Conversation).filter(
-        Conversation.id == conversation_id,
-        (Conversation.candidate_id == current_user.id) | 
-        (Conversation.recruiter_id == current_user.id)
-    ).first()
+    conversation = await db.scalar(
+        select(Conversation).where(
+            Conversation.id == conversation_id,
+            (Conversation.candidate_id == current_user.id) | 
+            (Conversation.recruiter_id == current_user.id)
+        )
+    )
     
     if not conversation:
         raise HTTPException(
@@ -256,8 +299,18 @@ async def update_conversation_status(
             detail="Conversation not found"
         )
     
+    # Only active conversations count towards the users' unread totals
+    was_active = conversation.status == ConversationStatus.ACTIVE
+    is_active = status == ConversationStatus.ACTIVE
+    if was_active != is_active:
+        sign = 1 if is_active else -1
+        await _add_unread_messages(db, {
+            conversation.candidate_id: sign * conversation.candidate_unread_count,
+            conversation.recruiter_id: sign * conversation.recruiter_unread_count
+        })
+    
     conversation.status = status
-    db.commit()
+    await db.commit()
     
     return {"message": "Conversation status updated", "status": status}
 
@@ -265,24 +318,12 @@ async def update_conversation_status(
 @router.get("/unread-count")
 async def get_unread_count(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get total unread message count for current user"""
-    # Get all conversations for user
-    conversations = db.query(Conversation).filter(
-        (Conversation.candidate_id == current_user.id) | 
-        (Conversation.recruiter_id == current_user.id),
-        Conversation.status == ConversationStatus.ACTIVE
-    ).all()
-    
-    conversation_ids = [c.id for c in conversations]
-    
-    # Count unread messages
-    unread_count = db.query(Message).filter(
-        Message.conversation_id.in_(conversation_ids),
-        Message.sender_id != current_user.id,
-        Message.is_read == False
-    ).count()
+    counts = await db.run_sync(
+        lambda session: UnreadCounterService(session).get_counts(current_user.id)
+    )
     
-    return {"unread_count": unread_count}
+    return {"unread_count": counts['messages']}
 
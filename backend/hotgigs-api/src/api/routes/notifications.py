@@ -1,16 +1,24 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
 from pydantic import BaseModel
+import asyncio
 import uuid
 
-from db.session import get_db
+from db.session import get_async_db
 from models.user import User
-from core.security import get_current_user
+from core.config import settings
+from core.security import get_current_user, get_stream_user
+from services.email_digest import DEFAULT_DIGEST_FREQUENCY
+from services.notification_hub import notification_hub
 from services.notification_service import NotificationService
 
 router = APIRouter()
 
+# NotificationService is synchronous; AsyncSession.run_sync runs it against the
+# async connection, so its queries no longer block the event loop
+
 # Pydantic models
 class NotificationResponse(BaseModel):
     id: str
@@ -38,21 +46,23 @@ class PreferencesUpdate(BaseModel):
     app_new_job_match: Optional[bool] = None
     app_interview_scheduled: Optional[bool] = None
     app_message_received: Optional[bool] = None
+    email_digest_frequency: Optional[Literal['instant', 'hourly', 'daily']] = None
 
 @router.get("/", response_model=List[NotificationResponse])
 async def get_notifications(
     unread_only: bool = False,
     limit: int = 50,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user notifications"""
     
-    service = NotificationService(db)
-    notifications = service.get_user_notifications(
-        user_id=current_user.id,
-        unread_only=unread_only,
-        limit=limit
+    notifications = await db.run_sync(
+        lambda session: NotificationService(session).get_user_notifications(
+            user_id=current_user.id,
+            unread_only=unread_only,
+            limit=limit
+        )
     )
     
     return [notif.to_dict() for notif in notifications]
@@ -60,25 +70,60 @@ async def get_notifications(
 @router.get("/unread-count")
 async def get_unread_count(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get count of unread notifications"""
     
-    service = NotificationService(db)
-    count = service.get_unread_count(current_user.id)
+    count = await db.run_sync(
+        lambda session: NotificationService(session).get_unread_count(current_user.id)
+    )
     
     return {'count': count}
 
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    current_user: User = Depends(get_stream_user)
+):
+    """
+    Server-sent events for new notifications
+    
+    Emits a `notification` event (same shape as the list items) for each
+    notification created for the user, and `resync` if the client fell too
+    far behind and should refetch the list.
+    """
+    
+    async def events():
+        async with notification_hub.connect(current_user.id) as queue:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event_name, data = await asyncio.wait_for(
+                        queue.get(), settings.NOTIFICATION_STREAM_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # Comment line; keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event_name}\ndata: {data}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @router.put("/{notification_id}/read")
 async def mark_notification_read(
     notification_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Mark a notification as read"""
     
-    service = NotificationService(db)
-    success = service.mark_as_read(uuid.UUID(notification_id))
+    success = await db.run_sync(
+        lambda session: NotificationService(session).mark_as_read(uuid.UUID(notification_id))
+    )
     
     if not success:
         raise HTTPException(status_code=404, detail="Notification not found")
@@ -88,12 +133,13 @@ async def mark_notification_read(
 @router.put("/mark-all-read")
 async def mark_all_notifications_read(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Mark all notifications as read"""
     
-    service = NotificationService(db)
-    count = service.mark_all_as_read(current_user.id)
+    count = await db.run_sync(
+        lambda session: NotificationService(session).mark_all_as_read(current_user.id)
+    )
     
     return {'message': f'{count} notifications marked as read'}
 
@@ -101,12 +147,13 @@ async def mark_all_notifications_read(
 async def delete_notification(
     notification_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a notification"""
     
-    service = NotificationService(db)
-    success = service.delete_notification(uuid.UUID(notification_id))
+    success = await db.run_sync(
+        lambda session: NotificationService(session).delete_notification(uuid.UUID(notification_id))
+    )
     
     if not success:
         raise HTTPException(status_code=404, detail="Notification not found")
@@ -117,12 +164,13 @@ async def delete_notification(
 async def archive_notification(
     notification_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Archive a notification"""
     
-    service = NotificationService(db)
-    success = service.archive_notification(uuid.UUID(notification_id))
+    success = await db.run_sync(
+        lambda session: NotificationService(session).archive_notification(uuid.UUID(notification_id))
+    )
     
     if not success:
         raise HTTPException(status_code=404, detail="Notification not found")
@@ -132,12 +180,13 @@ async def archive_notification(
 @router.get("/preferences")
 async def get_notification_preferences(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user notification preferences"""
     
-    service = NotificationService(db)
-    prefs = service.get_user_preferences(current_user.id)
+    prefs = await db.run_sync(
+        lambda session: NotificationService(session).get_user_preferences(current_user.id)
+    )
     
     return {
         'email_application_received': prefs.email_application_received,
@@ -149,23 +198,24 @@ async def get_notification_preferences(
         'app_application_status': prefs.app_application_status,
         'app_new_job_match': prefs.app_new_job_match,
         'app_interview_scheduled': prefs.app_interview_scheduled,
-        'app_message_received': prefs.app_message_received
+        'app_message_received': prefs.app_message_received,
+        'email_digest_frequency': prefs.email_digest_frequency or DEFAULT_DIGEST_FREQUENCY
     }
 
 @router.put("/preferences")
 async def update_notification_preferences(
     preferences: PreferencesUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update user notification preferences"""
     
-    service = NotificationService(db)
-    
     # Convert to dict, excluding None values
     prefs_dict = {k: v for k, v in preferences.dict().items() if v is not None}
     
-    updated_prefs = service.update_preferences(current_user.id, prefs_dict)
+    updated_prefs = await db.run_sync(
+        lambda session: NotificationService(session).update_preferences(current_user.id, prefs_dict)
+    )
     
     return {'message': 'Preferences updated successfully'}
 
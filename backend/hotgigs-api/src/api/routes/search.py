@@ -0,0 +1,34 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from pydantic import BaseModel
+
+from db.session import get_async_db
+from services.typeahead import typeahead_index, SUGGESTION_TYPES
+
+router = APIRouter()
+
+# Pydantic models
+class SuggestionResponse(BaseModel):
+    text: str
+    type: str  # title, skill, location, company
+    count: int
+
+@router.get("/suggest", response_model=List[SuggestionResponse])
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    types: Optional[List[str]] = Query(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Autocomplete job titles, skills, locations and companies by prefix"""
+    if types:
+        unknown = set(types) - set(SUGGESTION_TYPES)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown suggestion types: {', '.join(sorted(unknown))}")
+    
+    # Only the first request per worker, or one after another worker's write, does any loading
+    if typeahead_index.needs_refresh():
+        await db.run_sync(typeahead_index.ensure_built)
+    
+    return typeahead_index.suggest(q, limit=limit, types=types)
@@ -0,0 +1,105 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+import threading
+import time
+
+from core.config import settings
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with optional per-entry TTL"""
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value, refreshing its LRU position"""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        """Store a value, evicting the least recently used entry when full"""
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove a value"""
+        with self._lock:
+            return self._entries.pop(key, _MISSING) is not _MISSING
+
+    def clear(self):
+        """Remove all values"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            'size': len(self._entries),
+            'max_entries': self.max_entries
+        }
+
+
+_redis_client = None
+_redis_checked = False
+_redis_lock = threading.Lock()
+
+
+def get_redis_client():
+    """
+    Shared Redis client for REDIS_URL, or None if Redis is unavailable
+
+    The connection is checked once per process; callers fall back to
+    in-process caching when this returns None.
+    """
+    global _redis_client, _redis_checked
+
+    if _redis_checked:
+        return _redis_client
+
+    with _redis_lock:
+        if not _redis_checked:
+            try:
+                import redis
+
+                client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=0.5)
+                client.ping()
+                _redis_client = client
+            except Exception:
+                _redis_client = None
+            _redis_checked = True
+
+    return _redis_client
@@ -0,0 +1,174 @@
+"""
+Principal Cache
+Caches the authenticated principal for a bearer token so authenticated
+requests skip the user lookup. Entries never outlive the token.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import threading
+import time
+import uuid
+
+from sqlalchemy import event, inspect
+
+from core.cache import LRUCache, get_redis_client
+from core.config import settings
+from models.user import User, UserRole
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Slim, immutable view of the authenticated user"""
+    id: uuid.UUID
+    email: str
+    role: UserRole
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, email=user.email, role=UserRole(user.role))
+
+    def to_json(self) -> str:
+        return json.dumps({'id': str(self.id), 'email': self.email, 'role': self.role.value})
+
+    @classmethod
+    def from_json(cls, raw: Any) -> "Principal":
+        data = json.loads(raw)
+        return cls(id=uuid.UUID(data['id']), email=data['email'], role=UserRole(data['role']))
+
+
+def is_user_active(user: User) -> bool:
+    """Interpret User.is_active (stored as a string column)"""
+    return str(user.is_active).lower() not in ('false', '0', 'none', '')
+
+
+class PrincipalCache:
+    """
+    Token -> Principal cache: in-process LRU in front of optional Redis
+
+    Local entries live for at most local_ttl_seconds (and never past token
+    expiry), which bounds how long another worker can serve a principal
+    after it was invalidated elsewhere. Redis entries live until token expiry
+    and are tracked per user so they can be deleted on invalidation.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+        local_ttl_seconds: int = settings.PRINCIPAL_CACHE_LOCAL_TTL_SECONDS,
+        use_redis: bool = settings.PRINCIPAL_CACHE_USE_REDIS
+    ):
+        self.local_ttl_seconds = local_ttl_seconds
+        self.use_redis = use_redis
+        self._memory = LRUCache(max_entries)
+        self._lock = threading.Lock()
+        # email -> generation; bumping it orphans every local entry for the user
+        self._generations: Dict[str, int] = {}
+
+    def get(self, token: str) -> Optional[Principal]:
+        """Cached principal for a token, or None"""
+        key = self._key(token)
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            principal, generation = entry
+            if generation == self._generations.get(principal.email, 0):
+                return principal
+            self._memory.delete(key)
+
+        redis_client = get_redis_client() if self.use_redis else None
+        if redis_client is None:
+            return None
+
+        try:
+            raw = redis_client.get(f"principal:{key}")
+            ttl = redis_client.ttl(f"principal:{key}")
+        except Exception:
+            return None
+
+        if raw is None:
+            return None
+
+        principal = Principal.from_json(raw)
+        self._set_local(key, principal, ttl if ttl and ttl > 0 else None)
+        return principal
+
+    def set(self, token: str, principal: Principal, expires_at: Optional[float]):
+        """Cache a principal until the token's exp (a UNIX timestamp)"""
+        ttl = expires_at - time.time() if expires_at else None
+        if ttl is not None and ttl <= 0:
+            return
+
+        key = self._key(token)
+        self._set_local(key, principal, ttl)
+
+        redis_client = get_redis_client() if self.use_redis else None
+        if redis_client is not None:
+            redis_ttl = int(ttl) if ttl is not None else settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+            try:
+                pipeline = redis_client.pipeline(transaction=False)
+                pipeline.setex(f"principal:{key}", max(1, redis_ttl), principal.to_json())
+                pipeline.sadd(f"principal_tokens:{principal.email}", key)
+                pipeline.expire(f"principal_tokens:{principal.email}", max(1, redis_ttl))
+                pipeline.execute()
+            except Exception:
+                pass
+
+    def invalidate_user(self, email: str):
+        """Drop every cached principal for a user"""
+        with self._lock:
+            self._generations[email] = self._generations.get(email, 0) + 1
+
+        redis_client = get_redis_client() if self.use_redis else None
+        if redis_client is not None:
+            try:
+                keys = redis_client.smembers(f"principal_tokens:{email}")
+                pipeline = redis_client.pipeline(transaction=False)
+                for key in keys:
+                    key = key.decode() if isinstance(key, bytes) else key
+                    pipeline.delete(f"principal:{key}")
+                pipeline.delete(f"principal_tokens:{email}")
+                pipeline.execute()
+            except Exception:
+                pass
+
+    def clear(self):
+        """Drop all in-process entries"""
+        self._memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters"""
+        return self._memory.stats()
+
+    def _set_local(self, key: str, principal: Principal, ttl: Optional[float]):
+        local_ttl = self.local_ttl_seconds if ttl is None else min(ttl, self.local_ttl_seconds)
+        generation = self._generations.get(principal.email, 0)
+        self._memory.set(key, (principal, generation), local_ttl)
+
+    def _key(self, token: str) -> str:
+        # Raw tokens are never stored
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+# Shared per-process cache
+principal_cache = PrincipalCache()
+
+
+@event.listens_for(User, 'after_update')
+def _invalidate_on_user_update(mapper, connection, target):
+    """Role, active-flag or email changes invalidate cached principals"""
+    state = inspect(target)
+    for attribute in ('role', 'is_active', 'email'):
+        history = state.attrs[attribute].history
+        if history.has_changes():
+            principal_cache.invalidate_user(target.email)
+            for old_email in history.deleted or ():
+                principal_cache.invalidate_user(old_email)
+            return
+
+
+@event.listens_for(User, 'after_delete')
+def _invalidate_on_user_delete(mapper, connection, target):
+    principal_cache.invalidate_user(target.email)
@@ -1,5 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
+import asyncio
+import threading
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from core.config import settings
@@ -14,6 +17,81 @@ def get_password_hash(password: str) -> str:
     """Hash a password"""
     return pwd_context.hash(password)
 
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing pool is saturated"""
+
+class PasswordHasherPool:
+    """
+    Bounded executor for bcrypt work
+    
+    bcrypt is CPU-bound (~100ms per call) and releases the GIL, so it runs on
+    a small dedicated thread pool instead of the event loop. At most
+    max_workers + max_queue calls are admitted; further calls are rejected
+    immediately rather than queueing without bound.
+    """
+    
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+    
+    async def run(self, fn, *args):
+        """Run fn(*args) on the pool, or raise PasswordHasherBusy if saturated"""
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise PasswordHasherBusy()
+            self._in_flight += 1
+        
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+    
+    def stats(self) -> dict:
+        """Queue depth and throughput counters"""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "in_flight": self._in_flight,
+                "queue_depth": max(0, self._in_flight - self.max_workers),
+                "max_queue": self.max_queue,
+                "completed": self._completed,
+                "rejected": self._rejected
+            }
+
+password_hasher = PasswordHasherPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the bcrypt pool (503 when saturated)"""
+    try:
+        return await password_hasher.run(verify_password, plain_password, hashed_password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the bcrypt pool (503 when saturated)"""
+    try:
+        return await password_hasher.run(get_password_hash, password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+
+def _hasher_busy():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server is busy, please retry",
+        headers={"Retry-After": "1"},
+    )
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -36,21 +114,32 @@ def decode_access_token(token: str) -> Optional[dict]:
 
 
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+
+from core.principal_cache import Principal, principal_cache, is_user_active
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(lambda: None)  # Will be properly injected
-):
-    """Get current user from JWT token"""
-    from ..db.session import get_db
-    from ..models.user import User
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Principal:
+    """
+    Get current user from JWT token
+    
+    Returns a cached, immutable Principal (id, email, role); the database is
+    only queried the first time a token is seen.
+    """
+    from db.session import SessionLocal
+    from models.user import User
     
     token = credentials.credentials
+    
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    
     payload = decode_access_token(token)
     
     if payload is None:
@@ -68,17 +157,38 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Get database session if not provided
-    if db is None:
-        db = next(get_db())
+    with SessionLocal() as db:
+        user = db.query(User).filter(User.email == email).first()
+        if user is None or not is_user_active(user):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        
+        principal = Principal.from_user(user)
     
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    principal_cache.set(token, principal, payload.get("exp"))
     
-    return user
+    return principal
 
+def get_stream_user(
+    token: Optional[str] = Query(None),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> Principal:
+    """
+    Get current user for a streaming endpoint
+    
+    Browsers' EventSource cannot set headers, so the token may also be
+    passed as the `token` query parameter.
+    """
+    if credentials is None:
+        if not token:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Not authenticated",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    
+    return get_current_user(credentials)
@@ -0,0 +1,42 @@
+import argparse
+
+from core.config import settings
+from db.notification_partitions import migrate_to_partitioned
+from db.session import SessionLocal, engine
+from services.notification_retention import NotificationRetentionService
+
+def archive_notifications(retention_days=None, batch_size=None):
+    """Move old read notifications to the archive and roll partitions forward"""
+    print("Archiving old notifications...")
+    
+    db = SessionLocal()
+    try:
+        stats = NotificationRetentionService(
+            db,
+            retention_days=retention_days or settings.NOTIFICATION_RETENTION_DAYS,
+            batch_size=batch_size or settings.NOTIFICATION_ARCHIVE_BATCH_SIZE
+        ).run()
+    finally:
+        db.close()
+    
+    print(
+        f"Archived {stats['archived']} notifications in {stats['batches']} batches "
+        f"({stats['rows_per_second']} rows/sec), dropped {len(stats['dropped_partitions'])} empty partitions"
+    )
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive old read notifications (run daily from cron)")
+    parser.add_argument("--retention-days", type=int, default=None, help="Keep read notifications this many days")
+    parser.add_argument("--batch-size", type=int, default=None, help="Rows moved per transaction")
+    parser.add_argument(
+        "--migrate", action="store_true",
+        help="First convert an unpartitioned notifications table (PostgreSQL, one-off)"
+    )
+    args = parser.parse_args()
+    
+    if args.migrate:
+        with engine.begin() as connection:
+            print(f"Copied {migrate_to_partitioned(connection, settings.NOTIFICATION_PARTITION_MONTHS_AHEAD)} notifications into partitions")
+    
+    archive_notifications(retention_days=args.retention_days, batch_size=args.batch_size)
@@ -1,13 +1,26 @@
+from core.config import settings
 from db.base import Base
 from db.session import engine
+from db.notification_partitions import ensure_notification_partitions
+from db.search_index import ensure_job_search_index, ensure_location_index
 from models.user import User, UserRole
-from models.candidate import CandidateProfile, CandidateSkill, WorkExperience, Education, Application
+from models.candidate import CandidateProfile, CandidateMatchFeatures, CandidateSkill, WorkExperience, Education, Application
 from models.job import Job, Company, CompanyTeamMember
+from models.match import CandidateJobMatch
+from models.notification import Notification, NotificationArchive, UnreadCounter
+from services.email_digest import ensure_email_digest_columns
+from services.unread_counters import ensure_conversation_counters
 
 def init_db():
     """Initialize database tables"""
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        ensure_job_search_index(connection)
+        ensure_location_index(connection)
+        ensure_conversation_counters(connection)
+        ensure_notification_partitions(connection, settings.NOTIFICATION_PARTITION_MONTHS_AHEAD)
+        ensure_email_digest_columns(connection)
     print("Database tables created successfully!")
 
 if __name__ == "__main__":
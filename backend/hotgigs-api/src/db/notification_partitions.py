@@ -0,0 +1,134 @@
+"""
+Notification Partition DDL
+Monthly range partitions of notifications on created_at. PostgreSQL only;
+elsewhere notifications is a plain table.
+"""
+
+from datetime import date, datetime
+from typing import List, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from models.notification import Notification
+
+DEFAULT_PARTITION = "notifications_default"
+
+
+def month_start(value: date, offset: int = 0) -> date:
+    """First day of the month `offset` months after `value`'s"""
+    month = value.month - 1 + offset
+    return date(value.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"notifications_p{month:%Y%m}"
+
+
+def is_partitioned(connection: Connection) -> bool:
+    return connection.execute(text(
+        "SELECT relkind = 'p' FROM pg_class WHERE relname = 'notifications'"
+    )).scalar() or False
+
+
+def ensure_notification_partitions(
+    connection: Connection,
+    months_ahead: int = 3,
+    start: Optional[date] = None
+) -> List[str]:
+    """
+    Create monthly partitions from `start` (default: this month) through
+    `months_ahead` months ahead, plus a default partition (idempotent)
+
+    Returns:
+        Names of the partitions ensured
+    """
+    if connection.dialect.name != "postgresql" or not is_partitioned(connection):
+        return []
+
+    today = datetime.utcnow().date()
+    month = month_start(start or today)
+    last = month_start(today, months_ahead)
+
+    names = []
+    while month <= last:
+        name = partition_name(month)
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF notifications "
+            f"FOR VALUES FROM ('{month}') TO ('{month_start(month, 1)}')"
+        ))
+        names.append(name)
+        month = month_start(month, 1)
+
+    # Catches rows outside every monthly range rather than failing the insert
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF notifications DEFAULT"
+    ))
+    return names
+
+
+def expired_partitions(connection: Connection, cutoff: datetime) -> List[str]:
+    """Monthly partitions whose whole range is older than `cutoff`"""
+    if connection.dialect.name != "postgresql" or not is_partitioned(connection):
+        return []
+
+    rows = connection.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = 'notifications' AND child.relname LIKE 'notifications_p%'"
+    )).scalars().all()
+
+    expired = []
+    for name in sorted(rows):
+        month = datetime.strptime(name[len("notifications_p"):], "%Y%m").date()
+        if month_start(month, 1) <= cutoff.date():
+            expired.append(name)
+    return expired
+
+
+def migrate_to_partitioned(connection: Connection, months_ahead: int = 3) -> int:
+    """
+    Convert an existing plain notifications table into the partitioned layout
+
+    The old table is renamed to notifications_unpartitioned, its rows are
+    copied into partitions covering their months, and it is then dropped.
+    Run once, during a maintenance window.
+
+    Returns:
+        Number of rows copied
+    """
+    if connection.dialect.name != "postgresql" or is_partitioned(connection):
+        return 0
+
+    oldest = connection.execute(text("SELECT min(created_at) FROM notifications")).scalar()
+
+    connection.execute(text("ALTER TABLE notifications RENAME TO notifications_unpartitioned"))
+    connection.execute(text(
+        "ALTER TABLE notifications_unpartitioned "
+        "RENAME CONSTRAINT notifications_pkey TO notifications_unpartitioned_pkey"
+    ))
+    connection.execute(text(
+        "ALTER INDEX IF EXISTS ix_notifications_user_archived_created "
+        "RENAME TO ix_notifications_unpartitioned_user_archived_created"
+    ))
+    # Present if ensure_email_digest_columns already ran; the new table recreates it
+    connection.execute(text("DROP INDEX IF EXISTS ix_notifications_email_pending"))
+    Notification.__table__.create(connection)
+
+    ensure_notification_partitions(connection, months_ahead, start=oldest.date() if oldest else None)
+
+    # Columns added to the model later (e.g. email_sent_at) may not exist on
+    # the old table yet; they take their defaults
+    existing = set(connection.execute(text(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = 'notifications_unpartitioned'"
+    )).scalars())
+    names = [column.name for column in Notification.__table__.columns if column.name in existing]
+    columns = ', '.join(names)
+    # created_at is part of the new primary key, so it cannot be null
+    values = ', '.join('coalesce(created_at, now())' if name == 'created_at' else name for name in names)
+    copied = connection.execute(text(
+        f"INSERT INTO notifications ({columns}) SELECT {values} FROM notifications_unpartitioned"
+    )).rowcount
+    connection.execute(text("DROP TABLE notifications_unpartitioned"))
+    return copied
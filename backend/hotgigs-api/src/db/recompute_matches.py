@@ -0,0 +1,55 @@
+import argparse
+
+from db.session import SessionLocal
+from services.batch_matching import BatchMatchingService
+from services.match_features import MatchFeatureService
+
+def recompute_matches(workers=None, chunk_size=500, top_k=50, min_score=0.0, refresh_features=False):
+    """Recompute all candidate-job matches"""
+    db = SessionLocal()
+    try:
+        if refresh_features:
+            print("Refreshing candidate match features...")
+            refreshed = MatchFeatureService(db).refresh_all()
+            print(f"Refreshed {refreshed} candidate snapshots")
+        
+        print("Recomputing candidate-job matches...")
+        stats = BatchMatchingService(
+            db,
+            workers=workers,
+            chunk_size=chunk_size,
+            top_k=top_k,
+            min_score=min_score
+        ).run()
+    finally:
+        db.close()
+    
+    print(
+        f"Scored {stats['pairs']} pairs ({stats['candidates']} candidates x {stats['jobs']} jobs) "
+        f"in {stats['elapsed_seconds']}s: {stats['pairs_per_second']} pairs/sec"
+    )
+    print(
+        f"Wrote {stats['matches_written']} matches, "
+        f"updated {stats['applications_updated']} application scores"
+    )
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute candidate-job matches")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Candidates per worker task")
+    parser.add_argument("--top-k", type=int, default=50, help="Matches stored per candidate")
+    parser.add_argument("--min-score", type=float, default=0.0, help="Minimum match score to store")
+    parser.add_argument(
+        "--refresh-features", action="store_true",
+        help="Recompute every candidate's match-feature snapshot first (after scoring rule changes)"
+    )
+    args = parser.parse_args()
+    
+    recompute_matches(
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        top_k=args.top_k,
+        min_score=args.min_score,
+        refresh_features=args.refresh_features
+    )
@@ -0,0 +1,22 @@
+from db.session import SessionLocal
+from services.unread_counters import UnreadCounterService
+
+def reconcile_unread_counts():
+    """Recompute unread counters and fix any that drifted"""
+    print("Reconciling unread counters...")
+    
+    db = SessionLocal()
+    try:
+        stats = UnreadCounterService(db).reconcile()
+    finally:
+        db.close()
+    
+    print(
+        f"Corrected {stats['notifications']} notification counters, {stats['messages']} message counters "
+        f"and {stats['conversations']} conversations in {stats['elapsed_seconds']}s"
+    )
+    return stats
+
+if __name__ == "__main__":
+    # Run periodically (e.g. hourly from cron); also backfills counters after upgrading
+    reconcile_unread_counts()
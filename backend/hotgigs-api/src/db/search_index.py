@@ -0,0 +1,83 @@
+"""
+Full-Text Search DDL
+Maintains jobs.search_vector (weighted title > skills > description) with a
+trigger and a GIN index, and pg_trgm indexes on normalized locations.
+PostgreSQL only; other databases use the in-memory fallbacks in
+services.text_index and services.location_index.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from services.location_index import normalize_location
+
+
+JOB_SEARCH_VECTOR_STATEMENTS = [
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    "CREATE INDEX IF NOT EXISTS ix_jobs_search_vector ON jobs USING gin (search_vector)",
+    """
+    CREATE OR REPLACE FUNCTION jobs_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(array_to_string(NEW.required_skills, ' '), '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS jobs_search_vector_trigger ON jobs",
+    """
+    CREATE TRIGGER jobs_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description, required_skills ON jobs
+    FOR EACH ROW EXECUTE FUNCTION jobs_search_vector_update()
+    """,
+    # Backfill rows written before the trigger existed
+    "UPDATE jobs SET title = title WHERE search_vector IS NULL",
+]
+
+
+LOCATION_TRIGRAM_STATEMENTS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS location_normalized varchar",
+    "ALTER TABLE candidate_profiles ADD COLUMN IF NOT EXISTS location_normalized varchar",
+    """
+    CREATE INDEX IF NOT EXISTS ix_jobs_location_normalized_trgm
+    ON jobs USING gin (location_normalized gin_trgm_ops)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_candidate_profiles_location_normalized_trgm
+    ON candidate_profiles USING gin (location_normalized gin_trgm_ops)
+    """,
+]
+
+
+def ensure_job_search_index(connection: Connection):
+    """Create or update the search vector column, trigger and index (idempotent)"""
+    if connection.dialect.name != "postgresql":
+        return
+
+    for statement in JOB_SEARCH_VECTOR_STATEMENTS:
+        connection.execute(text(statement))
+
+
+def ensure_location_index(connection: Connection, batch_size: int = 1000):
+    """Create the trigram indexes (PostgreSQL) and backfill location_normalized"""
+    if connection.dialect.name == "postgresql":
+        for statement in LOCATION_TRIGRAM_STATEMENTS:
+            connection.execute(text(statement))
+
+    # Normalization (aliases) happens in Python, so rows are backfilled here
+    for table in ("jobs", "candidate_profiles"):
+        rows = connection.execute(text(
+            f"SELECT id, location FROM {table} "
+            "WHERE location_normalized IS NULL AND location IS NOT NULL"
+        )).all()
+        for i in range(0, len(rows), batch_size):
+            connection.execute(
+                text(f"UPDATE {table} SET location_normalized = :normalized WHERE id = :id"),
+                [
+                    {'id': row_id, 'normalized': normalize_location(location) or None}
+                    for row_id, location in rows[i:i + batch_size]
+                ]
+            )
@@ -0,0 +1,38 @@
+import argparse
+
+from db.session import SessionLocal
+from services.email_digest import EmailDigestService
+from services.email_transport import get_transport
+
+def send_email_digests(transport=None, workers=None):
+    """Email a digest of pending notifications to every user whose window has elapsed"""
+    print("Sending notification email digests...")
+    
+    db = SessionLocal()
+    try:
+        service = EmailDigestService(db, transport=transport)
+        if workers:
+            service.workers = workers
+        stats = service.run()
+    finally:
+        db.close()
+    
+    print(
+        f"{stats['users_due']} users due: sent {stats['sent']}, skipped {stats['skipped']}, "
+        f"failed {stats['failed']} ({stats['retries']} retries) "
+        f"in {stats['elapsed_seconds']}s: {stats['users_per_second']} users/sec"
+    )
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send notification email digests (run every minute from cron)")
+    parser.add_argument("--transport", choices=["file", "smtp"], default=None, help="Override EMAIL_TRANSPORT")
+    parser.add_argument("--workers", type=int, default=None, help="Delivery threads")
+    args = parser.parse_args()
+    
+    transport = get_transport(args.transport) if args.transport else None
+    try:
+        send_email_digests(transport=transport, workers=args.workers)
+    finally:
+        if transport is not None:
+            transport.close()
@@ -0,0 +1,27 @@
+import argparse
+
+from db.session import SessionLocal
+from services.search_alerts import SavedSearchAlertService, ALERT_PERIODS
+
+def send_search_alerts(frequency):
+    """Send saved-search digests that are due for a frequency"""
+    print(f"Sending {frequency} saved search alerts...")
+    
+    db = SessionLocal()
+    try:
+        stats = SavedSearchAlertService(db).run_digest(frequency)
+    finally:
+        db.close()
+    
+    print(
+        f"Matched {stats['jobs']} new jobs to {stats['searches']} saved searches, "
+        f"sent {stats['notified']} alerts in {stats['elapsed_seconds']}s"
+    )
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send saved search alert digests (run from cron)")
+    parser.add_argument("frequency", choices=sorted(ALERT_PERIODS), help="Digest frequency to send")
+    args = parser.parse_args()
+    
+    send_search_alerts(args.frequency)
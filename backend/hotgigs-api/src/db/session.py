@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from core.config import settings
 
@@ -20,3 +21,31 @@ def get_db():
     finally:
         db.close()
 
+def get_async_database_url() -> str:
+    """Async driver URL, derived from DATABASE_URL unless set explicitly"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    return settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+# Create async database engine (asyncpg)
+async_engine = create_async_engine(
+    get_async_database_url(),
+    pool_pre_ping=True,
+    pool_size=settings.ASYNC_DB_POOL_SIZE,
+    max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+    echo=settings.DEBUG
+)
+
+# Create async session factory; objects stay usable after commit so routes
+# can serialize them without triggering lazy loads
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+async def get_async_db():
+    """Dependency for getting async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
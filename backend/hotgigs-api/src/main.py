@@ -1,7 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from api.routes import auth, jobs, candidates, companies, applications, ai_matching, ai_services, messages
+from api.routes import auth, jobs, candidates, companies, applications, ai_matching, ai_services, messages, notifications, search
 from core.config import settings
+from core.security import password_hasher
+from services.notification_hub import notification_hub
+from services.notification_writer import notification_writer
+from services.preference_cache import preference_cache
+from services.search_cache import search_result_cache
 
 app = FastAPI(
     title="HotGigs.ai API",
@@ -27,6 +32,13 @@ app.include_router(applications.router, prefix="/api/applications", tags=["Appli
 app.include_router(ai_matching.router, prefix="/api/ai-matching", tags=["AI Matching"])
 app.include_router(ai_services.router, prefix="/api/ai", tags=["AI Services"])
 app.include_router(messages.router, prefix="/api", tags=["Messages"])
+app.include_router(notifications.router, prefix="/api/notifications", tags=["Notifications"])
+app.include_router(search.router, prefix="/api/search", tags=["Search"])
+
+@app.on_event("shutdown")
+def flush_notifications():
+    notification_writer.close()
+    notification_hub.close()
 
 @app.get("/")
 async def root():
@@ -40,7 +52,12 @@ async def root():
 async def health_check():
     return {
         "status": "healthy",
-        "service": "HotGigs.ai API"
+        "service": "HotGigs.ai API",
+        "password_hasher": password_hasher.stats(),
+        "search_result_cache": search_result_cache.stats(),
+        "notification_writer": notification_writer.stats(),
+        "notification_hub": notification_hub.stats(),
+        "preference_cache": preference_cache.stats()
     }
 
 if __name__ == "__main__":
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, Text, Boolean, ForeignKey, DateTime, ARRAY, JSON
+from sqlalchemy import Column, String, Integer, Float, Text, Boolean, ForeignKey, DateTime, ARRAY, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -7,6 +7,9 @@ from db.base import Base
 
 class CandidateProfile(Base):
     __tablename__ = "candidate_profiles"
+    __table_args__ = (
+        Index("ix_candidate_profiles_updated_at_id", "updated_at", "id"),  # Keyset pagination
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), unique=True, nullable=False)
@@ -16,6 +19,7 @@ class CandidateProfile(Base):
     bio = Column(Text, nullable=True)
     phone = Column(String, nullable=True)
     location = Column(String, nullable=True)
+    location_normalized = Column(String, nullable=True, index=True)  # Set from location on write
     linkedin_url = Column(String, nullable=True)
     github_url = Column(String, nullable=True)
     portfolio_url = Column(String, nullable=True)
@@ -57,6 +61,35 @@ class CandidateProfile(Base):
     experiences = relationship("WorkExperience", back_populates="candidate", cascade="all, delete-orphan")
     educations = relationship("Education", back_populates="candidate", cascade="all, delete-orphan")
     applications = relationship("Application", back_populates="candidate", cascade="all, delete-orphan")
+    match_features = relationship("CandidateMatchFeatures", back_populates="candidate", uselist=False, cascade="all, delete-orphan")
+
+
+class CandidateMatchFeatures(Base):
+    """Precomputed matching features, refreshed when skills, experience or education change"""
+    __tablename__ = "candidate_match_features"
+    
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidate_profiles.id"), primary_key=True)
+    
+    skill_names = Column(ARRAY(String), nullable=False, default=list)  # Normalized (lowercase) skill names
+    experience_level = Column(Integer, nullable=False, default=0)  # Ordinal: entry=0 ... executive=4
+    location_tokens = Column(ARRAY(String), nullable=False, default=list)  # Normalized location parts
+    remote_preference = Column(Boolean, default=False)
+    highest_degree = Column(Integer, nullable=True)  # Ordinal; NULL if no education on file
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationships
+    candidate = relationship("CandidateProfile", back_populates="match_features")
+    
+    def to_features(self):
+        """Convert to the feature dict consumed by AIMatchingService"""
+        return {
+            'skill_names': list(self.skill_names or []),
+            'experience_level': self.experience_level or 0,
+            'location_tokens': list(self.location_tokens or []),
+            'remote_preference': bool(self.remote_preference),
+            'highest_degree': self.highest_degree
+        }
 
 
 class CandidateSkill(Base):
@@ -1,12 +1,16 @@
-from sqlalchemy import Column, String, Integer, Float, Text, Boolean, ForeignKey, DateTime, ARRAY, JSON
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, Float, Text, Boolean, ForeignKey, DateTime, ARRAY, JSON, Index
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 import uuid
 from db.base import Base
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_jobs_created_at_id", "created_at", "id"),  # Keyset pagination
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id"), nullable=False)
@@ -16,6 +20,7 @@ class Job(Base):
     title = Column(String, nullable=False)
     description = Column(Text, nullable=False)
     location = Column(String, nullable=False)
+    location_normalized = Column(String, nullable=True, index=True)  # Set from location on write
     job_type = Column(String, nullable=False)  # full-time, part-time, contract, remote
     experience_level = Column(String, nullable=False)  # entry, mid, senior, lead, executive
     
@@ -52,6 +57,9 @@ class Job(Base):
     ai_generated = Column(Boolean, default=False)
     ai_enhanced = Column(Boolean, default=False)
     
+    # Full-text search (maintained by a trigger, see db/search_index.py)
+    search_vector = deferred(Column(TSVECTOR().with_variant(Text(), "sqlite"), nullable=True))
+    
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,47 @@
+"""
+Match Models
+Database models for precomputed candidate-job match scores
+"""
+
+from sqlalchemy import Column, Float, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+
+from db.base import Base
+
+
+class CandidateJobMatch(Base):
+    """Top job matches per candidate, written by the batch matching runner"""
+    __tablename__ = "candidate_job_matches"
+    
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidate_profiles.id"), primary_key=True)
+    job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id"), primary_key=True)
+    
+    # Scores (0-100)
+    match_score = Column(Float, nullable=False)
+    skills_score = Column(Float, nullable=True)
+    experience_score = Column(Float, nullable=True)
+    location_score = Column(Float, nullable=True)
+    education_score = Column(Float, nullable=True)
+    
+    # Timestamps
+    computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        Index('ix_candidate_job_matches_job_score', 'job_id', 'match_score'),
+    )
+    
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'candidate_id': str(self.candidate_id),
+            'job_id': str(self.job_id),
+            'match_score': self.match_score,
+            'breakdown': {
+                'skills': self.skills_score,
+                'experience': self.experience_score,
+                'location': self.location_score,
+                'education': self.education_score
+            },
+            'computed_at': self.computed_at.isoformat() if self.computed_at else None
+        }
@@ -34,6 +34,10 @@ class Conversation(Base):
     subject = Column(String(255), nullable=True)
     status = Column(Enum(ConversationStatus), default=ConversationStatus.ACTIVE)
     
+    # Unread messages per participant (kept in step by the message routes)
+    candidate_unread_count = Column(Integer, nullable=False, default=0)
+    recruiter_unread_count = Column(Integer, nullable=False, default=0)
+    
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -3,7 +3,7 @@ Notification Models
 Database models for the notification system
 """
 
-from sqlalchemy import Column, String, Boolean, DateTime, Text, ForeignKey, Enum
+from sqlalchemy import Column, String, Boolean, DateTime, Text, ForeignKey, Enum, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -27,7 +27,13 @@ class NotificationType(str, enum.Enum):
 
 
 class Notification(Base):
-    """Notification model"""
+    """
+    Notification model
+    
+    On PostgreSQL the table is range-partitioned by month on created_at
+    (see db/notification_partitions.py), so created_at is part of the
+    primary key. Old read notifications are moved to notifications_archive.
+    """
     __tablename__ = "notifications"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -49,12 +55,24 @@ class Notification(Base):
     action_url = Column(String(500), nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
     read_at = Column(DateTime, nullable=True)
+    email_sent_at = Column(DateTime, nullable=True)  # Set once handled by the email digest
     
     # Relationships
     user = relationship("User", foreign_keys=[user_id])
     
+    __table_args__ = (
+        # Serves a user's newest unarchived notifications
+        Index('ix_notifications_user_archived_created', user_id, is_archived, created_at.desc()),
+        # Small: only notifications the email digest has not handled yet
+        Index(
+            'ix_notifications_email_pending', created_at,
+            postgresql_where=email_sent_at.is_(None)
+        ),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+    
     def to_dict(self):
         """Convert to dictionary"""
         return {
@@ -87,6 +105,7 @@ class NotificationPreference(Base):
     email_new_job_match = Column(Boolean, default=True)
     email_interview_scheduled = Column(Boolean, default=True)
     email_message_received = Column(Boolean, default=True)
+    email_digest_frequency = Column(String(20), nullable=True)  # instant, hourly or daily; null is hourly
     
     # In-app notifications
     app_application_received = Column(Boolean, default=True)
@@ -102,3 +121,46 @@ class NotificationPreference(Base):
     # Relationships
     user = relationship("User", back_populates="notification_preferences")
 
+
+class UnreadCounter(Base):
+    """
+    Denormalized per-user unread counts
+
+    Updated in the same transaction as the writes that change them, and
+    periodically reconciled against the source rows.
+    """
+    __tablename__ = "unread_counters"
+    
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    
+    # Unread, unarchived notifications
+    notifications = Column(Integer, nullable=False, default=0)
+    # Unread messages from others in active conversations
+    messages = Column(Integer, nullable=False, default=0)
+
+
+class NotificationArchive(Base):
+    """
+    Read notifications past the retention period
+    
+    Written in bulk by the retention job; no read/archived flags, since
+    every archived notification was read.
+    """
+    __tablename__ = "notifications_archive"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), nullable=False)
+    type = Column(Enum(NotificationType), nullable=False)
+    title = Column(String(255), nullable=False)
+    message = Column(Text, nullable=False)
+    related_job_id = Column(UUID(as_uuid=True), nullable=True)
+    related_application_id = Column(UUID(as_uuid=True), nullable=True)
+    related_user_id = Column(UUID(as_uuid=True), nullable=True)
+    action_url = Column(String(500), nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    read_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        Index('ix_notifications_archive_user_created', user_id, created_at.desc()),
+    )
@@ -1,18 +1,49 @@
 """
 AI Job Matching Service
-Implements intelligent candidate-job matching using skill-based scoring,
-experience level matching, and location preferences.
+Implements intelligent candidate-job matching using skill-based scoring
+(exact, related and partial skill matches), experience level matching,
+and location preferences.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
+import heapq
 import math
 
+import numpy as np
+
+from services.location_index import location_index
+from services.skill_dictionary import SkillDictionary, skill_dictionary as shared_skill_dictionary
+
+# Order of the per-pair score columns (matches services.match_cache.MatchScores)
+SCORE_FIELDS = ('match_score', 'skills', 'experience', 'location', 'education')
+
+# Minimum years of experience for each candidate level, highest first
+EXPERIENCE_LEVEL_YEARS = (('executive', 12), ('lead', 8), ('senior', 5), ('mid', 2), ('entry', 0))
+
+
+def experience_level_for_years(years: Optional[int]) -> str:
+    """Candidate experience level (entry ... executive) from years of experience"""
+    for level, min_years in EXPERIENCE_LEVEL_YEARS:
+        if (years or 0) >= min_years:
+            return level
+    return 'entry'
+
+
+def job_work_model(remote_policy: Optional[str]) -> str:
+    """Scorer work model (remote, hybrid, on-site) for a Job.remote_policy value"""
+    work_model = (remote_policy or 'on-site').strip().lower()
+    if work_model in ('onsite', 'on site'):
+        return 'on-site'
+    return work_model
+
 
 class AIMatchingService:
     """Service for AI-powered job-candidate matching"""
     
-    def __init__(self):
+    def __init__(self, skill_dictionary: Optional[SkillDictionary] = None):
+        self.skill_dictionary = skill_dictionary or shared_skill_dictionary
+        
         self.skill_weights = {
             'exact_match': 1.0,
             'related_match': 0.7,
@@ -26,51 +57,90 @@ class AIMatchingService:
             'lead': 3,
             'executive': 4
         }
+        
+        self.component_weights = {
+            'skills': 0.40,
+            'experience': 0.30,
+            'location': 0.15,
+            'education': 0.15
+        }
+        
+        self.education_keywords = ['degree', 'bachelor', 'master', 'phd', 'doctorate', 'bs', 'ms', 'mba']
+        
+        self.degree_levels = {
+            'high school': 1,
+            'associate': 2,
+            'bachelor': 3,
+            'master': 4,
+            'phd': 5,
+            'doctorate': 5
+        }
+        
+        # Work model codes used by the batch scorer
+        self.work_model_codes = {
+            'remote': 0,
+            'hybrid': 1,
+            'on-site': 2
+        }
     
     def calculate_match_score(
         self,
         candidate_profile: Dict[str, Any],
-        job: Dict[str, Any]
+        job: Dict[str, Any],
+        cache: Optional[Any] = None
     ) -> Dict[str, Any]:
         """
         Calculate comprehensive match score between candidate and job
         
+        Args:
+            cache: Optional MatchScoreCache; a hit skips scoring entirely
+        
         Returns:
             Dict with match_score (0-100), breakdown, and recommendations
         """
         
+        cache_key = cache.make_key(candidate_profile, job) if cache is not None else None
+        if cache_key is not None:
+            cached = cache.get_many([cache_key])[0]
+            if cached is not None:
+                overall_score, skill_score, experience_score, location_score, education_score = cached
+                return self._build_match_result(
+                    overall_score,
+                    skill_score,
+                    experience_score,
+                    location_score,
+                    education_score,
+                    candidate_profile,
+                    job
+                )
+        
+        features = self._candidate_features(candidate_profile)
+        
         # Calculate individual component scores
         skill_score = self._calculate_skill_match(
-            candidate_profile.get('skills', []),
+            features['skill_names'],
             job.get('required_skills', []),
             job.get('preferred_skills', [])
         )
         
-        experience_score = self._calculate_experience_match(
-            candidate_profile.get('years_of_experience', 0),
-            candidate_profile.get('experience_level', 'entry'),
-            job.get('experience_level', 'mid')
+        experience_score = self._experience_score_for_levels(
+            features['experience_level'],
+            self.experience_levels.get(job.get('experience_level', 'mid').lower(), 1)
         )
         
-        location_score = self._calculate_location_match(
-            candidate_profile.get('location', ''),
-            candidate_profile.get('remote_preference', False),
-            job.get('location', ''),
+        location_score = self._location_score(
+            bool(self._location_tokens(job.get('location', '')) & self._feature_location_tokens(features)),
+            features['remote_preference'],
             job.get('work_model', 'on-site')
         )
         
-        education_score = self._calculate_education_match(
-            candidate_profile.get('education', []),
-            job.get('requirements', [])
-        )
+        if self._requires_education(job.get('requirements', [])):
+            education_score = self._education_score_for_degree(features['highest_degree'])
+        else:
+            education_score = 100.0
         
         # Weighted combination
-        weights = {
-            'skills': 0.40,
-            'experience': 0.30,
-            'location': 0.15,
-            'education': 0.15
-        }
+        weights = self.component_weights
         
         overall_score = (
             skill_score * weights['skills'] +
@@ -79,6 +149,34 @@ class AIMatchingService:
             education_score * weights['education']
         )
         
+        if cache_key is not None:
+            cache.set_many([(
+                cache_key,
+                (overall_score, skill_score, experience_score, location_score, education_score)
+            )])
+        
+        return self._build_match_result(
+            overall_score,
+            skill_score,
+            experience_score,
+            location_score,
+            education_score,
+            candidate_profile,
+            job
+        )
+    
+    def _build_match_result(
+        self,
+        overall_score: float,
+        skill_score: float,
+        experience_score: float,
+        location_score: float,
+        education_score: float,
+        candidate_profile: Dict[str, Any],
+        job: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Round component scores and attach recommendations and quality label"""
+        
         # Generate recommendations
         recommendations = self._generate_recommendations(
             skill_score,
@@ -112,27 +210,22 @@ class AIMatchingService:
         if not required_skills:
             return 100.0
         
-        candidate_skill_names = [
-            skill.get('name', '').lower() if isinstance(skill, dict) else skill.lower()
-            for skill in candidate_skills
-        ]
+        # Intern the job's skills first so partial matches against them are visible
+        required_ids = self.skill_dictionary.intern_many(required_skills)
+        preferred_ids = self.skill_dictionary.intern_many(preferred_skills)
         
-        required_lower = [s.lower() for s in required_skills]
-        preferred_lower = [s.lower() for s in preferred_skills]
+        # Best credit (exact, related or partial) per skill ID the candidate covers
+        credits = self._skill_credits(
+            self.skill_dictionary.intern_free_text_many(self._candidate_skill_names(candidate_skills))
+        )
         
         # Calculate required skills match
-        required_matches = sum(
-            1 for skill in required_lower
-            if skill in candidate_skill_names
-        )
+        required_matches = sum(credits.get(skill_id, 0.0) for skill_id in required_ids)
         
         required_score = (required_matches / len(required_skills)) * 100 if required_skills else 100
         
         # Calculate preferred skills match (bonus)
-        preferred_matches = sum(
-            1 for skill in preferred_lower
-            if skill in candidate_skill_names
-        )
+        preferred_matches = sum(credits.get(skill_id, 0.0) for skill_id in preferred_ids)
         
         preferred_bonus = (preferred_matches / len(preferred_skills)) * 20 if preferred_skills else 0
         
@@ -141,6 +234,32 @@ class AIMatchingService:
         
         return total_score
     
+    def _skill_credits(self, skill_ids: List[int]) -> Dict[int, float]:
+        """
+        Match credit for every skill ID reachable from the given skills
+        
+        Held skills earn exact_match, curated related skills related_match
+        and word-subset variants (e.g. "react" / "react native") partial_match.
+        """
+        
+        exact = self.skill_weights['exact_match']
+        related = self.skill_weights['related_match']
+        partial = self.skill_weights['partial_match']
+        
+        credits: Dict[int, float] = {}
+        for skill_id in skill_ids:
+            for other in self.skill_dictionary.partial_ids(skill_id):
+                if credits.get(other, 0.0) < partial:
+                    credits[other] = partial
+            for other in self.skill_dictionary.related_ids(skill_id):
+                if credits.get(other, 0.0) < related:
+                    credits[other] = related
+        
+        for skill_id in skill_ids:
+            credits[skill_id] = exact
+        
+        return credits
+    
     def _calculate_experience_match(
         self,
         candidate_years: int,
@@ -152,6 +271,15 @@ class AIMatchingService:
         candidate_level_num = self.experience_levels.get(candidate_level.lower(), 0)
         required_level_num = self.experience_levels.get(required_level.lower(), 1)
         
+        return self._experience_score_for_levels(candidate_level_num, required_level_num)
+    
+    def _experience_score_for_levels(
+        self,
+        candidate_level_num: int,
+        required_level_num: int
+    ) -> float:
+        """Experience match score (0-100) from level ordinals"""
+        
         # Perfect match
         if candidate_level_num == required_level_num:
             return 100.0
@@ -177,6 +305,20 @@ class AIMatchingService:
     ) -> float:
         """Calculate location match score (0-100)"""
         
+        return self._location_score(
+            self._locations_match(candidate_location, job_location),
+            candidate_remote_pref,
+            job_work_model
+        )
+    
+    def _location_score(
+        self,
+        locations_match: bool,
+        candidate_remote_pref: bool,
+        job_work_model: str
+    ) -> float:
+        """Location match score (0-100) from a precomputed location match"""
+        
         # Remote jobs are always a match if candidate prefers remote
         if job_work_model.lower() == 'remote':
             return 100.0
@@ -189,7 +331,7 @@ class AIMatchingService:
         
         # On-site requires location match
         if job_work_model.lower() == 'on-site':
-            if self._locations_match(candidate_location, job_location):
+            if locations_match:
                 return 100.0
             elif candidate_remote_pref:
                 return 40.0  # Mismatch if candidate wants remote
@@ -205,40 +347,49 @@ class AIMatchingService:
     ) -> float:
         """Calculate education match score (0-100)"""
         
-        if not job_requirements:
+        # Check for degree requirements in job requirements
+        if not self._requires_education(job_requirements):
             return 100.0
         
-        # Check for degree requirements in job requirements
-        education_keywords = ['degree', 'bachelor', 'master', 'phd', 'doctorate', 'bs', 'ms', 'mba']
+        return self._education_score_if_required(candidate_education)
+    
+    def _requires_education(self, job_requirements: List[str]) -> bool:
+        """Check whether any job requirement mentions a degree"""
+        
+        if not job_requirements:
+            return False
         
-        has_education_requirement = any(
-            any(keyword in req.lower() for keyword in education_keywords)
+        return any(
+            any(keyword in req.lower() for keyword in self.education_keywords)
             for req in job_requirements
         )
+    
+    def _education_score_if_required(self, candidate_education: List[Dict]) -> float:
+        """Education score for a job that has a degree requirement"""
         
-        if not has_education_requirement:
-            return 100.0
+        return self._education_score_for_degree(self._highest_degree(candidate_education))
+    
+    def _highest_degree(self, candidate_education: List[Dict]) -> Optional[int]:
+        """Highest degree ordinal, or None if there is no education info"""
         
         if not candidate_education:
-            return 60.0  # No education info, moderate penalty
-        
-        # Check highest degree
-        degree_levels = {
-            'high school': 1,
-            'associate': 2,
-            'bachelor': 3,
-            'master': 4,
-            'phd': 5,
-            'doctorate': 5
-        }
+            return None
         
         highest_degree = 0
         for edu in candidate_education:
             degree = edu.get('degree', '').lower()
-            for level_name, level_value in degree_levels.items():
+            for level_name, level_value in self.degree_levels.items():
                 if level_name in degree:
                     highest_degree = max(highest_degree, level_value)
         
+        return highest_degree
+    
+    def _education_score_for_degree(self, highest_degree: Optional[int]) -> float:
+        """Education score for a job that has a degree requirement"""
+        
+        if highest_degree is None:
+            return 60.0  # No education info, moderate penalty
+        
         # Score based on degree level
         if highest_degree >= 3:  # Bachelor's or higher
             return 100.0
@@ -254,16 +405,65 @@ class AIMatchingService:
         if not loc1 or not loc2:
             return False
         
-        loc1_parts = loc1.lower().split(',')
-        loc2_parts = loc2.lower().split(',')
-        
         # Check if city or state matches
-        for part1 in loc1_parts:
-            for part2 in loc2_parts:
-                if part1.strip() == part2.strip():
-                    return True
+        return bool(self._location_tokens(loc1) & self._location_tokens(loc2))
+    
+    def _location_tokens(self, location: str) -> set:
+        """
+        Canonical location parts (city/region/country)
+        
+        Aliases are expanded and abbreviated or misspelt parts snap to known
+        places, so "SF, CA" and "San Fran" share tokens with "San Francisco, CA".
+        """
+        if not location:
+            return set()
         
-        return False
+        return location_index.tokens(location)
+    
+    def _feature_location_tokens(self, features: Dict[str, Any]) -> set:
+        """Location tokens of stored features, re-canonicalized for snapshots built by older normalization"""
+        return {location_index.canonical_part(token) for token in features['location_tokens']}
+    
+    def build_match_features(self, candidate_profile: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Compact match features for a candidate
+        
+        This is everything the scorer reads from a candidate, so it can be
+        precomputed and stored instead of rebuilding profiles per request.
+        """
+        
+        return {
+            'skill_names': sorted({
+                self.skill_dictionary.canonicalize(name)
+                for name in self._candidate_skill_names(candidate_profile.get('skills', []))
+            } - {''}),
+            'experience_level': self.experience_levels.get(
+                (
+                    candidate_profile.get('experience_level')
+                    or experience_level_for_years(candidate_profile.get('years_of_experience'))
+                ).lower(),
+                0
+            ),
+            'location_tokens': sorted(self._location_tokens(candidate_profile.get('location', ''))),
+            'remote_preference': bool(candidate_profile.get('remote_preference', False)),
+            'highest_degree': self._highest_degree(candidate_profile.get('education', []))
+        }
+    
+    def _candidate_features(self, candidate_profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Precomputed match features if present, otherwise built from the profile"""
+        
+        features = candidate_profile.get('match_features')
+        if features is not None:
+            return features
+        
+        return self.build_match_features(candidate_profile)
+    
+    def _candidate_skill_names(self, candidate_skills: List[Any]) -> List[str]:
+        """Lowercased skill names from a candidate's skill list"""
+        return [
+            skill.get('name', '').lower() if isinstance(skill, dict) else skill.lower()
+            for skill in candidate_skills
+        ]
     
     def _generate_recommendations(
         self,
@@ -279,13 +479,17 @@ class AIMatchingService:
         recommendations = []
         
         if skill_score < 70:
-            missing_skills = set(job.get('required_skills', [])) - set(
-                skill.get('name', '') if isinstance(skill, dict) else skill
-                for skill in candidate_profile.get('skills', [])
-            )
+            candidate_skill_names = set(self._candidate_features(candidate_profile)['skill_names'])
+            missing_skills = []
+            for skill in job.get('required_skills', []):
+                if (
+                    self.skill_dictionary.canonicalize(skill) not in candidate_skill_names
+                    and skill not in missing_skills
+                ):
+                    missing_skills.append(skill)
             if missing_skills:
                 recommendations.append(
-                    f"Consider developing skills in: {', '.join(list(missing_skills)[:3])}"
+                    f"Consider developing skills in: {', '.join(missing_skills[:3])}"
                 )
         
         if experience_score < 70:
@@ -319,6 +523,410 @@ class AIMatchingService:
         else:
             return "Low Match"
     
+    # Batch scoring
+    
+    def encode_jobs(self, jobs: List[Dict]) -> Dict[str, Any]:
+        """
+        Encode jobs into NumPy feature arrays for batch scoring
+        
+        Skills are interned through the skill dictionary and location parts
+        into a local vocabulary; both are stored as flattened (row, id) pairs
+        so overlaps can be summed with bincount.
+        """
+        
+        location_vocab: Dict[str, int] = {}
+        
+        required_rows, required_ids = [], []
+        preferred_rows, preferred_ids = [], []
+        location_rows, location_ids = [], []
+        required_counts, preferred_counts = [], []
+        experience_levels, work_models, requires_education = [], [], []
+        
+        for row, job in enumerate(jobs):
+            required = job.get('required_skills', [])
+            preferred = job.get('preferred_skills', [])
+            
+            required_rows.extend([row] * len(required))
+            required_ids.extend(self.skill_dictionary.intern_many(required))
+            preferred_rows.extend([row] * len(preferred))
+            preferred_ids.extend(self.skill_dictionary.intern_many(preferred))
+            
+            for token in self._location_tokens(job.get('location', '')):
+                location_rows.append(row)
+                location_ids.append(location_vocab.setdefault(token, len(location_vocab)))
+            
+            required_counts.append(len(required))
+            preferred_counts.append(len(preferred))
+            experience_levels.append(
+                self.experience_levels.get(job.get('experience_level', 'mid').lower(), 1)
+            )
+            work_models.append(
+                self.work_model_codes.get(job.get('work_model', 'on-site').lower(), -1)
+            )
+            requires_education.append(self._requires_education(job.get('requirements', [])))
+        
+        return {
+            'size': len(jobs),
+            'location_vocab': location_vocab,
+            'required_rows': np.array(required_rows, dtype=np.int64),
+            'required_ids': np.array(required_ids, dtype=np.int64),
+            'preferred_rows': np.array(preferred_rows, dtype=np.int64),
+            'preferred_ids': np.array(preferred_ids, dtype=np.int64),
+            'location_rows': np.array(location_rows, dtype=np.int64),
+            'location_ids': np.array(location_ids, dtype=np.int64),
+            'required_counts': np.array(required_counts, dtype=np.int64),
+            'preferred_counts': np.array(preferred_counts, dtype=np.int64),
+            'experience_levels': np.array(experience_levels, dtype=np.int64),
+            'work_models': np.array(work_models, dtype=np.int64),
+            'requires_education': np.array(requires_education, dtype=bool)
+        }
+    
+    def encode_candidates(self, candidates: List[Dict]) -> Dict[str, Any]:
+        """
+        Encode candidates into NumPy feature arrays for batch scoring
+        
+        Candidate skills and location parts are read from the candidates'
+        match features and stored as unique (row, id) pairs.
+        """
+        
+        location_vocab: Dict[str, int] = {}
+        
+        skill_rows, skill_ids = [], []
+        location_rows, location_ids = [], []
+        experience_levels, remote_preferences, education_scores = [], [], []
+        
+        for row, candidate in enumerate(candidates):
+            features = self._candidate_features(candidate)
+            
+            for skill_id in set(self.skill_dictionary.intern_free_text_many(features['skill_names'])):
+                skill_rows.append(row)
+                skill_ids.append(skill_id)
+            
+            for token in self._feature_location_tokens(features):
+                location_rows.append(row)
+                location_ids.append(location_vocab.setdefault(token, len(location_vocab)))
+            
+            experience_levels.append(features['experience_level'])
+            remote_preferences.append(features['remote_preference'])
+            education_scores.append(self._education_score_for_degree(features['highest_degree']))
+        
+        return {
+            'size': len(candidates),
+            'location_vocab': location_vocab,
+            'skill_rows': np.array(skill_rows, dtype=np.int64),
+            'skill_ids': np.array(skill_ids, dtype=np.int64),
+            'location_rows': np.array(location_rows, dtype=np.int64),
+            'location_ids': np.array(location_ids, dtype=np.int64),
+            'experience_levels': np.array(experience_levels, dtype=np.int64),
+            'remote_preferences': np.array(remote_preferences, dtype=bool),
+            'education_scores': np.array(education_scores, dtype=np.float64)
+        }
+    
+    def score_jobs_for_candidate(
+        self,
+        candidate_profile: Dict[str, Any],
+        encoded_jobs: Dict[str, Any]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Score one candidate against every job in an encoded job batch
+        
+        Returns:
+            Dict of unrounded score arrays: match_score, skills,
+            experience, location, education
+        """
+        
+        size = encoded_jobs['size']
+        features = self._candidate_features(candidate_profile)
+        
+        # Candidate skill credits as a dense vector over skill IDs
+        credit_vector = self._credit_vector(
+            self._skill_credits(self.skill_dictionary.intern_free_text_many(features['skill_names']))
+        )
+        
+        required_matches = np.bincount(
+            encoded_jobs['required_rows'],
+            weights=credit_vector[encoded_jobs['required_ids']],
+            minlength=size
+        )
+        preferred_matches = np.bincount(
+            encoded_jobs['preferred_rows'],
+            weights=credit_vector[encoded_jobs['preferred_ids']],
+            minlength=size
+        )
+        
+        location_vocab = encoded_jobs['location_vocab']
+        has_token = np.zeros(len(location_vocab), dtype=np.float64)
+        for token in self._feature_location_tokens(features):
+            token_id = location_vocab.get(token)
+            if token_id is not None:
+                has_token[token_id] = 1.0
+        
+        location_matches = np.bincount(
+            encoded_jobs['location_rows'],
+            weights=has_token[encoded_jobs['location_ids']],
+            minlength=size
+        ) > 0
+        
+        candidate_level = features['experience_level']
+        education_if_required = self._education_score_for_degree(features['highest_degree'])
+        
+        return self._combine_batch_scores(
+            skill_scores=self._batch_skill_scores(
+                required_matches,
+                encoded_jobs['required_counts'],
+                preferred_matches,
+                encoded_jobs['preferred_counts']
+            ),
+            experience_scores=self._batch_experience_scores(
+                np.full(size, candidate_level, dtype=np.int64),
+                encoded_jobs['experience_levels']
+            ),
+            location_scores=self._batch_location_scores(
+                location_matches,
+                np.full(size, features['remote_preference']),
+                encoded_jobs['work_models']
+            ),
+            education_scores=np.where(
+                encoded_jobs['requires_education'], education_if_required, 100.0
+            )
+        )
+    
+    def score_candidates_for_job(
+        self,
+        encoded_candidates: Dict[str, Any],
+        job: Dict[str, Any]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Score every candidate in an encoded candidate batch against one job
+        
+        Returns:
+            Dict of unrounded score arrays: match_score, skills,
+            experience, location, education
+        """
+        
+        size = encoded_candidates['size']
+        
+        required = job.get('required_skills', [])
+        preferred = job.get('preferred_skills', [])
+        
+        # Per job skill, each candidate's best credit over their own skills;
+        # summed in list order so results match the scalar path exactly
+        best_credits: Dict[int, np.ndarray] = {}
+        
+        def skill_matches(skill_ids: List[int]) -> np.ndarray:
+            total = np.zeros(size, dtype=np.float64)
+            for skill_id in skill_ids:
+                best = best_credits.get(skill_id)
+                if best is None:
+                    credit_vector = self._credit_vector(self._skill_credits([skill_id]))
+                    best = np.zeros(size, dtype=np.float64)
+                    np.maximum.at(
+                        best,
+                        encoded_candidates['skill_rows'],
+                        credit_vector[encoded_candidates['skill_ids']]
+                    )
+                    best_credits[skill_id] = best
+                total = total + best
+            return total
+        
+        required_matches = skill_matches(self.skill_dictionary.intern_many(required))
+        preferred_matches = skill_matches(self.skill_dictionary.intern_many(preferred))
+        
+        location_vocab = encoded_candidates['location_vocab']
+        has_token = np.zeros(len(location_vocab), dtype=np.float64)
+        for token in self._location_tokens(job.get('location', '')):
+            token_id = location_vocab.get(token)
+            if token_id is not None:
+                has_token[token_id] = 1.0
+        
+        location_matches = np.bincount(
+            encoded_candidates['location_rows'],
+            weights=has_token[encoded_candidates['location_ids']],
+            minlength=size
+        ) > 0
+        
+        required_level = self.experience_levels.get(job.get('experience_level', 'mid').lower(), 1)
+        work_model = self.work_model_codes.get(job.get('work_model', 'on-site').lower(), -1)
+        
+        if self._requires_education(job.get('requirements', [])):
+            education_scores = encoded_candidates['education_scores']
+        else:
+            education_scores = np.full(size, 100.0)
+        
+        return self._combine_batch_scores(
+            skill_scores=self._batch_skill_scores(
+                required_matches,
+                np.full(size, len(required), dtype=np.int64),
+                preferred_matches,
+                np.full(size, len(preferred), dtype=np.int64)
+            ),
+            experience_scores=self._batch_experience_scores(
+                encoded_candidates['experience_levels'],
+                np.full(size, required_level, dtype=np.int64)
+            ),
+            location_scores=self._batch_location_scores(
+                location_matches,
+                encoded_candidates['remote_preferences'],
+                np.full(size, work_model, dtype=np.int64)
+            ),
+            education_scores=education_scores
+        )
+    
+    def _credit_vector(self, credits: Dict[int, float]) -> np.ndarray:
+        """Dense credit vector indexed by skill ID"""
+        
+        vector = np.zeros(self.skill_dictionary.size, dtype=np.float64)
+        if credits:
+            vector[list(credits.keys())] = list(credits.values())
+        return vector
+    
+    def _batch_skill_scores(
+        self,
+        required_matches: np.ndarray,
+        required_counts: np.ndarray,
+        preferred_matches: np.ndarray,
+        preferred_counts: np.ndarray
+    ) -> np.ndarray:
+        """Vectorized equivalent of _calculate_skill_match"""
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            required_score = (required_matches / required_counts) * 100
+            preferred_bonus = np.where(
+                preferred_counts > 0, (preferred_matches / preferred_counts) * 20, 0.0
+            )
+        
+        total_score = np.minimum(required_score + preferred_bonus, 100.0)
+        
+        return np.where(required_counts > 0, total_score, 100.0)
+    
+    def _batch_experience_scores(
+        self,
+        candidate_levels: np.ndarray,
+        required_levels: np.ndarray
+    ) -> np.ndarray:
+        """Vectorized equivalent of _calculate_experience_match"""
+        
+        diff = candidate_levels - required_levels
+        
+        overqualified = np.maximum(85 - (diff * 10), 60)
+        underqualified = np.maximum(70 + (diff * 20), 30)
+        
+        return np.where(
+            diff == 0,
+            100.0,
+            np.where(diff > 0, overqualified, underqualified)
+        ).astype(np.float64)
+    
+    def _batch_location_scores(
+        self,
+        location_matches: np.ndarray,
+        remote_preferences: np.ndarray,
+        work_models: np.ndarray
+    ) -> np.ndarray:
+        """Vectorized equivalent of _calculate_location_match"""
+        
+        hybrid = np.where(remote_preferences, 90.0, 85.0)
+        on_site = np.where(
+            location_matches,
+            100.0,
+            np.where(remote_preferences, 40.0, 60.0)
+        )
+        
+        return np.select(
+            [
+                work_models == self.work_model_codes['remote'],
+                work_models == self.work_model_codes['hybrid'],
+                work_models == self.work_model_codes['on-site']
+            ],
+            [100.0, hybrid, on_site],
+            default=70.0
+        )
+    
+    def _combine_batch_scores(
+        self,
+        skill_scores: np.ndarray,
+        experience_scores: np.ndarray,
+        location_scores: np.ndarray,
+        education_scores: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """Weighted combination of component score arrays"""
+        
+        weights = self.component_weights
+        
+        overall_scores = (
+            skill_scores * weights['skills'] +
+            experience_scores * weights['experience'] +
+            location_scores * weights['location'] +
+            education_scores * weights['education']
+        )
+        
+        return {
+            'match_score': overall_scores,
+            'skills': skill_scores,
+            'experience': experience_scores,
+            'location': location_scores,
+            'education': education_scores
+        }
+    
+    def _batch_result(
+        self,
+        scores: Dict[str, np.ndarray],
+        index: int,
+        candidate_profile: Dict,
+        job: Dict
+    ) -> Dict[str, Any]:
+        """Build the scalar-path result dict for one row of a batch"""
+        
+        return self._build_match_result(
+            float(scores['match_score'][index]),
+            float(scores['skills'][index]),
+            float(scores['experience'][index]),
+            float(scores['location'][index]),
+            float(scores['education'][index]),
+            candidate_profile,
+            job
+        )
+    
+    def _cached_batch_scores(
+        self,
+        keys: List[Optional[str]],
+        cache: Optional[Any],
+        score_rows
+    ) -> Dict[str, np.ndarray]:
+        """
+        Assemble batch score arrays, scoring only rows missing from the cache
+        
+        Args:
+            keys: Cache key per row (None disables caching for that row)
+            cache: Optional MatchScoreCache
+            score_rows: Callable taking a list of row indices and returning
+                batch score arrays for those rows
+        """
+        
+        if cache is None:
+            return score_rows(list(range(len(keys))))
+        
+        cached = cache.get_many(keys)
+        columns = np.empty((len(SCORE_FIELDS), len(keys)), dtype=np.float64)
+        
+        missing = []
+        for index, value in enumerate(cached):
+            if value is None:
+                missing.append(index)
+            else:
+                columns[:, index] = value
+        
+        if missing:
+            fresh = score_rows(missing)
+            fresh_columns = np.vstack([fresh[field] for field in SCORE_FIELDS]).astype(np.float64)
+            columns[:, missing] = fresh_columns
+            cache.set_many([
+                (keys[index], tuple(fresh_columns[:, position].tolist()))
+                for position, index in enumerate(missing)
+            ])
+        
+        return dict(zip(SCORE_FIELDS, columns))
+    
     def rank_candidates_for_job(
         self,
         candidates: List[Dict],
@@ -331,10 +939,12 @@ class AIMatchingService:
             List of candidates with match scores, sorted by score (descending)
         """
         
+        scores = self.score_candidates_for_job(self.encode_candidates(candidates), job)
+        
         ranked_candidates = []
         
-        for candidate in candidates:
-            match_result = self.calculate_match_score(candidate, job)
+        for index, candidate in enumerate(candidates):
+            match_result = self._batch_result(scores, index, candidate, job)
             
             ranked_candidates.append({
                 **candidate,
@@ -361,10 +971,12 @@ class AIMatchingService:
             List of jobs with match scores, sorted by score (descending)
         """
         
+        scores = self.score_jobs_for_candidate(candidate_profile, self.encode_jobs(jobs))
+        
         ranked_jobs = []
         
-        for job in jobs:
-            match_result = self.calculate_match_score(candidate_profile, job)
+        for index, job in enumerate(jobs):
+            match_result = self._batch_result(scores, index, candidate_profile, job)
             
             ranked_jobs.append({
                 **job,
@@ -378,4 +990,112 @@ class AIMatchingService:
         ranked_jobs.sort(key=lambda x: x['match_score'], reverse=True)
         
         return ranked_jobs
-
+    
+    def top_candidates_for_job(
+        self,
+        candidates: List[Dict],
+        job: Dict,
+        k: int,
+        cache: Optional[Any] = None
+    ) -> List[Dict]:
+        """
+        Return the k best-matching candidates for a job
+        
+        Same results as rank_candidates_for_job(candidates, job)[:k], but
+        recommendations and quality labels are only built for the winners.
+        Pairs found in the optional MatchScoreCache are not rescored.
+        """
+        
+        keys = [
+            cache.make_key(candidate, job) if cache is not None else None
+            for candidate in candidates
+        ]
+        scores = self._cached_batch_scores(
+            keys,
+            cache,
+            lambda rows: self.score_candidates_for_job(
+                self.encode_candidates([candidates[row] for row in rows]), job
+            )
+        )
+        
+        top_candidates = []
+        
+        for index in self._top_k_indices(scores['match_score'], k):
+            candidate = candidates[index]
+            match_result = self._batch_result(scores, index, candidate, job)
+            
+            top_candidates.append({
+                **candidate,
+                'match_score': match_result['match_score'],
+                'match_breakdown': match_result['breakdown'],
+                'match_quality': match_result['match_quality'],
+                'recommendations': match_result['recommendations']
+            })
+        
+        return top_candidates
+    
+    def top_jobs_for_candidate(
+        self,
+        candidate_profile: Dict,
+        jobs: List[Dict],
+        k: int,
+        cache: Optional[Any] = None
+    ) -> List[Dict]:
+        """
+        Return the k best-matching jobs for a candidate
+        
+        Same results as rank_jobs_for_candidate(candidate_profile, jobs)[:k],
+        but recommendations and quality labels are only built for the winners.
+        Pairs found in the optional MatchScoreCache are not rescored.
+        """
+        
+        keys = [
+            cache.make_key(candidate_profile, job) if cache is not None else None
+            for job in jobs
+        ]
+        scores = self._cached_batch_scores(
+            keys,
+            cache,
+            lambda rows: self.score_jobs_for_candidate(
+                candidate_profile, self.encode_jobs([jobs[row] for row in rows])
+            )
+        )
+        
+        top_jobs = []
+        
+        for index in self._top_k_indices(scores['match_score'], k):
+            job = jobs[index]
+            match_result = self._batch_result(scores, index, candidate_profile, job)
+            
+            top_jobs.append({
+                **job,
+                'match_score': match_result['match_score'],
+                'match_breakdown': match_result['breakdown'],
+                'match_quality': match_result['match_quality'],
+                'recommendations': match_result['recommendations']
+            })
+        
+        return top_jobs
+    
+    def _top_k_indices(self, match_scores: np.ndarray, k: int) -> List[int]:
+        """
+        Indices of the k highest scores using a bounded heap
+        
+        Ties are broken by original position, matching the stable
+        descending sort used by the rank_* methods.
+        """
+        
+        if k <= 0:
+            return []
+        
+        rounded_scores = [round(score, 1) for score in match_scores.tolist()]
+        
+        heap = []
+        for index, score in enumerate(rounded_scores):
+            entry = (score, -index)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+        
+        return [-neg_index for _, neg_index in sorted(heap, reverse=True)]
@@ -0,0 +1,259 @@
+"""
+Batch Matching Service
+Recomputes candidate-job matches for all candidates against all active jobs,
+spreading candidates across a process pool.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from datetime import datetime
+import os
+import time
+import uuid
+
+from models.candidate import CandidateProfile, Application
+from models.job import Job
+from models.match import CandidateJobMatch
+from services.ai_matching import AIMatchingService, job_work_model
+from services.match_features import MatchFeatureService
+
+
+# Per-worker state, set up once by _init_worker
+_worker_service: Optional[AIMatchingService] = None
+_worker_encoded_jobs: Optional[Dict[str, Any]] = None
+
+
+def _init_worker(job_payloads: List[Dict[str, Any]]):
+    """Encode the job table once per worker process"""
+    global _worker_service, _worker_encoded_jobs
+
+    # Skill IDs are process-local, so jobs are encoded inside each worker
+    _worker_service = AIMatchingService()
+    _worker_encoded_jobs = _worker_service.encode_jobs(job_payloads)
+
+
+def _score_chunk(
+    chunk: List[Tuple[str, Dict[str, Any], List[Tuple[str, int]]]],
+    top_k: int,
+    min_score: float
+) -> Dict[str, Any]:
+    """
+    Score a chunk of candidates against all jobs
+
+    Args:
+        chunk: (candidate_id, match_features, [(application_id, job_index)])
+
+    Returns:
+        Dict with top-k match tuples, application scores and pair count
+    """
+
+    matches = []
+    application_scores = []
+
+    for candidate_id, features, applications in chunk:
+        scores = _worker_service.score_jobs_for_candidate(
+            {'match_features': features}, _worker_encoded_jobs
+        )
+        overall = scores['match_score']
+
+        for index in _worker_service._top_k_indices(overall, top_k):
+            match_score = round(float(overall[index]), 1)
+            if match_score < min_score:
+                break
+            matches.append((
+                candidate_id,
+                index,
+                match_score,
+                round(float(scores['skills'][index]), 1),
+                round(float(scores['experience'][index]), 1),
+                round(float(scores['location'][index]), 1),
+                round(float(scores['education'][index]), 1)
+            ))
+
+        for application_id, index in applications:
+            application_scores.append((application_id, round(float(overall[index]), 1)))
+
+    return {
+        'matches': matches,
+        'application_scores': application_scores,
+        'pairs': len(chunk) * _worker_encoded_jobs['size']
+    }
+
+
+class BatchMatchingService:
+    """Service for recomputing all candidate-job matches"""
+
+    def __init__(
+        self,
+        db: Session,
+        workers: Optional[int] = None,
+        chunk_size: int = 500,
+        top_k: int = 50,
+        min_score: float = 0.0,
+        write_batch_size: int = 5000
+    ):
+        self.db = db
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.top_k = top_k
+        self.min_score = min_score
+        self.write_batch_size = write_batch_size
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Recompute matches and write them back to the database
+
+        Returns:
+            Dict with candidate/job/pair counts, elapsed time and pairs/sec
+        """
+
+        started_at = datetime.utcnow()
+        start = time.perf_counter()
+
+        jobs = self.db.query(Job).filter(Job.is_active.is_(True)).all()
+        job_ids = [job.id for job in jobs]
+        job_payloads = [self._job_payload(job) for job in jobs]
+        job_index = {job_id: index for index, job_id in enumerate(job_ids)}
+
+        candidates = self.db.query(CandidateProfile).all()
+        features_by_id = MatchFeatureService(self.db).get_features(candidates)
+
+        applications_by_candidate: Dict[uuid.UUID, List[Tuple[str, int]]] = {}
+        if job_ids:
+            for application_id, candidate_id, job_id in self.db.query(
+                Application.id, Application.candidate_id, Application.job_id
+            ).filter(Application.job_id.in_(job_ids)).all():
+                applications_by_candidate.setdefault(candidate_id, []).append(
+                    (str(application_id), job_index[job_id])
+                )
+
+        work = [
+            (
+                str(candidate.id),
+                features_by_id[candidate.id],
+                applications_by_candidate.get(candidate.id, [])
+            )
+            for candidate in candidates
+        ]
+        chunks = [
+            work[i:i + self.chunk_size]
+            for i in range(0, len(work), self.chunk_size)
+        ]
+
+        pairs = 0
+        matches_written = 0
+        applications_updated = 0
+        score_seconds = 0.0
+
+        if jobs and chunks:
+            score_start = time.perf_counter()
+
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(job_payloads,)
+            ) as executor:
+                futures = [
+                    executor.submit(_score_chunk, chunk, self.top_k, self.min_score)
+                    for chunk in chunks
+                ]
+
+                for future in as_completed(futures):
+                    result = future.result()
+                    pairs += result['pairs']
+                    matches_written += self._write_matches(
+                        result['matches'], job_ids, started_at
+                    )
+                    applications_updated += self._write_application_scores(
+                        result['application_scores']
+                    )
+
+            score_seconds = time.perf_counter() - score_start
+
+            # Drop matches that were not refreshed by this run; skipped when
+            # nothing was scored, so an empty run keeps the existing matches
+            self.db.query(CandidateJobMatch).filter(
+                CandidateJobMatch.computed_at < started_at
+            ).delete(synchronize_session=False)
+            self.db.commit()
+
+        elapsed = time.perf_counter() - start
+
+        return {
+            'candidates': len(candidates),
+            'jobs': len(jobs),
+            'pairs': pairs,
+            'matches_written': matches_written,
+            'applications_updated': applications_updated,
+            'elapsed_seconds': round(elapsed, 3),
+            'pairs_per_second': round(pairs / score_seconds, 1) if score_seconds else 0.0
+        }
+
+    def _job_payload(self, job: Job) -> Dict[str, Any]:
+        """Compact, picklable job dict with only the fields the scorer reads"""
+        return {
+            'required_skills': job.required_skills or [],
+            'preferred_skills': job.preferred_skills or [],
+            'experience_level': job.experience_level,
+            'location': job.location,
+            'work_model': job_work_model(job.remote_policy),
+            'requirements': [job.education_requirement] if job.education_requirement else []
+        }
+
+    def _write_matches(
+        self,
+        matches: List[Tuple],
+        job_ids: List[uuid.UUID],
+        computed_at: datetime
+    ) -> int:
+        """Bulk upsert match rows"""
+
+        for i in range(0, len(matches), self.write_batch_size):
+            rows = [
+                {
+                    'candidate_id': uuid.UUID(candidate_id),
+                    'job_id': job_ids[index],
+                    'match_score': match_score,
+                    'skills_score': skills_score,
+                    'experience_score': experience_score,
+                    'location_score': location_score,
+                    'education_score': education_score,
+                    'computed_at': computed_at
+                }
+                for (
+                    candidate_id, index, match_score, skills_score,
+                    experience_score, location_score, education_score
+                ) in matches[i:i + self.write_batch_size]
+            ]
+
+            stmt = insert(CandidateJobMatch).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['candidate_id', 'job_id'],
+                set_={
+                    'match_score': stmt.excluded.match_score,
+                    'skills_score': stmt.excluded.skills_score,
+                    'experience_score': stmt.excluded.experience_score,
+                    'location_score': stmt.excluded.location_score,
+                    'education_score': stmt.excluded.education_score,
+                    'computed_at': stmt.excluded.computed_at
+                }
+            )
+            self.db.execute(stmt)
+
+        self.db.commit()
+        return len(matches)
+
+    def _write_application_scores(self, application_scores: List[Tuple[str, float]]) -> int:
+        """Bulk update Application.ai_match_score"""
+
+        if not application_scores:
+            return 0
+
+        self.db.bulk_update_mappings(Application, [
+            {'id': uuid.UUID(application_id), 'ai_match_score': score}
+            for application_id, score in application_scores
+        ])
+        self.db.commit()
+        return len(application_scores)
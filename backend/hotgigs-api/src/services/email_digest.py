@@ -0,0 +1,309 @@
+"""
+Email Digest Service
+Groups a user's pending notifications into one email per digest window
+(instant, hourly or daily) and delivers the digests through a pluggable
+transport with a bounded worker pool, retries and a rate limit.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from email.charset import Charset, QP
+from email.message import Message
+from email.mime.text import MIMEText
+from sqlalchemy import func, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+import logging
+import threading
+import time
+import uuid
+
+from core.config import settings
+from models.notification import Notification, NotificationType
+from models.user import User
+from services.email_transport import EmailTransport, TransientEmailError, get_transport
+from services.preference_cache import NotificationPreferences, preference_cache
+
+logger = logging.getLogger(__name__)
+
+# A user's digest goes out once their oldest pending notification has waited this long
+DIGEST_WINDOWS = {
+    'instant': timedelta(0),
+    'hourly': timedelta(hours=1),
+    'daily': timedelta(days=1)
+}
+DEFAULT_DIGEST_FREQUENCY = 'hourly'
+
+# Email preference flag per notification type; types not listed are always emailed
+EMAIL_PREFERENCE_FIELDS = {
+    NotificationType.APPLICATION_RECEIVED: 'email_application_received',
+    NotificationType.APPLICATION_STATUS_CHANGED: 'email_application_status',
+    NotificationType.NEW_JOB_MATCH: 'email_new_job_match',
+    NotificationType.JOB_POSTED: 'email_new_job_match',
+    NotificationType.INTERVIEW_SCHEDULED: 'email_interview_scheduled',
+    NotificationType.MESSAGE_RECEIVED: 'email_message_received'
+}
+
+# Quoted-printable keeps the plain-text body readable in the raw message
+_UTF8_QP = Charset('utf-8')
+_UTF8_QP.body_encoding = QP
+
+# Serializes digest chunks across overlapping runs (PostgreSQL advisory lock key)
+EMAIL_DIGEST_LOCK_KEY = 0x656D6C64
+
+# Columns for tables created before digests existed
+EMAIL_DIGEST_STATEMENTS = [
+    "ALTER TABLE notifications ADD COLUMN IF NOT EXISTS email_sent_at timestamp",
+    """
+    CREATE INDEX IF NOT EXISTS ix_notifications_email_pending
+    ON notifications (created_at) WHERE email_sent_at IS NULL
+    """,
+    "ALTER TABLE notification_preferences ADD COLUMN IF NOT EXISTS email_digest_frequency varchar(20)",
+]
+
+
+class RateLimiter:
+    """Token bucket shared by the delivery threads"""
+
+    def __init__(self, rate_per_second: float, burst: Optional[int] = None):
+        self.rate = rate_per_second
+        self.capacity = burst or max(1, int(rate_per_second))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a send is allowed"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def render_digest(email: str, full_name: str, notifications: Sequence[Any]) -> Message:
+    """One plain-text email listing a user's notifications, newest first"""
+    count = len(notifications)
+    shown = notifications[:settings.EMAIL_DIGEST_MAX_ITEMS]
+
+    lines = [f"Hi {full_name or 'there'},", "", f"You have {count} new notification{'s' if count != 1 else ''}:", ""]
+    for notification in shown:
+        lines.append(f"- {notification.title}")
+        lines.append(f"  {notification.message}")
+        if notification.action_url:
+            lines.append(f"  {settings.EMAIL_LINK_BASE_URL}{notification.action_url}")
+        lines.append("")
+    if count > len(shown):
+        lines.append(f"...and {count - len(shown)} more.")
+        lines.append("")
+    lines.append(f"Manage email notifications: {settings.EMAIL_LINK_BASE_URL}/settings/notifications")
+
+    # MIMEText (compat32) renders several times faster than EmailMessage
+    message = MIMEText('\n'.join(lines), 'plain', _UTF8_QP)
+    message['From'] = settings.EMAIL_FROM
+    message['To'] = email
+    message['Subject'] = (
+        notifications[0].title if count == 1
+        else f"{count} new notifications on {settings.APP_NAME}"
+    )
+    return message
+
+
+class EmailDigestService:
+    """Service for sending notification digests by email"""
+
+    def __init__(
+        self,
+        db: Session,
+        transport: Optional[EmailTransport] = None,
+        workers: int = settings.EMAIL_DIGEST_WORKERS,
+        rate_per_second: float = settings.EMAIL_DIGEST_RATE_PER_SECOND,
+        max_attempts: int = settings.EMAIL_DIGEST_MAX_ATTEMPTS,
+        chunk_size: int = 500
+    ):
+        self.db = db
+        self.transport = transport
+        self.workers = workers
+        self.rate_limiter = RateLimiter(rate_per_second)
+        self.max_attempts = max_attempts
+        self.chunk_size = chunk_size
+
+    def run(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Send a digest to every user whose window has elapsed
+
+        Users are processed in chunks: pending notifications are loaded and
+        rendered for a chunk, delivered in parallel, then marked sent in one
+        update. Notifications that were read in the app or are switched off
+        in preferences are marked without being emailed. A failed delivery
+        leaves the user's notifications pending for the next run.
+
+        Each chunk is claimed with a transaction-level advisory lock before
+        its pending rows are read, and the lock is held until they are
+        marked sent. An overlapping run (cron overlap, a retry after a
+        timeout) waits for the chunk in progress and then sees its rows as
+        sent, so no user is emailed the same notifications twice.
+
+        Returns:
+            Dict with user counts, retries and users/sec throughput
+        """
+
+        start = time.perf_counter()
+        now = now or datetime.utcnow()
+        transport = self.transport or get_transport()
+
+        stats = {'users_due': 0, 'sent': 0, 'skipped': 0, 'failed': 0, 'retries': 0}
+        try:
+            due = self._due_users(now)
+            stats['users_due'] = len(due)
+
+            # At most one chunk of digests is queued for the workers at a time
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="email-digest") as pool:
+                for i in range(0, len(due), self.chunk_size):
+                    self._claim()
+                    digests = self._build_digests(due[i:i + self.chunk_size], now)
+                    results = self.deliver(pool, transport, [message for _, message, _ in digests])
+
+                    processed = []
+                    for (user_id, message, notification_ids), (sent, retries) in zip(digests, results):
+                        stats['retries'] += retries
+                        if not sent:
+                            stats['failed'] += 1
+                            continue
+                        stats['sent' if message else 'skipped'] += 1
+                        processed.extend(notification_ids)
+
+                    self._mark_sent(processed, now)
+                    self.db.commit()
+        finally:
+            if self.transport is None:
+                transport.close()
+
+        elapsed = time.perf_counter() - start
+        stats['elapsed_seconds'] = round(elapsed, 3)
+        stats['users_per_second'] = round(stats['users_due'] / elapsed, 1) if elapsed else 0.0
+        return stats
+
+    def deliver(
+        self,
+        pool: ThreadPoolExecutor,
+        transport: EmailTransport,
+        messages: Sequence[Optional[Message]]
+    ) -> List[Tuple[bool, int]]:
+        """Send messages on the pool; (delivered, retries) per message, None counts as delivered"""
+        return list(pool.map(
+            lambda message: self._send(transport, message) if message is not None else (True, 0),
+            messages
+        ))
+
+    def _claim(self):
+        """Take the digest lock for the current transaction (PostgreSQL; released on commit)"""
+        if self.db.get_bind().dialect.name == "postgresql":
+            self.db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': EMAIL_DIGEST_LOCK_KEY})
+
+    def _lookback(self, now: datetime) -> datetime:
+        # Bounds every scan to recent partitions; older pending rows are never emailed
+        return now - timedelta(hours=settings.EMAIL_DIGEST_LOOKBACK_HOURS)
+
+    def _due_users(self, now: datetime) -> List[uuid.UUID]:
+        oldest_pending = dict(self.db.query(
+            Notification.user_id,
+            func.min(Notification.created_at)
+        ).filter(
+            Notification.email_sent_at.is_(None),
+            Notification.created_at > self._lookback(now),
+            Notification.created_at <= now
+        ).group_by(Notification.user_id).all())
+
+        preferences = preference_cache.get_many(self.db, list(oldest_pending))
+        default_window = DIGEST_WINDOWS[DEFAULT_DIGEST_FREQUENCY]
+        return [
+            user_id for user_id, oldest in oldest_pending.items()
+            if oldest <= now - DIGEST_WINDOWS.get(preferences[user_id].email_digest_frequency, default_window)
+        ]
+
+    def _build_digests(
+        self,
+        user_ids: Sequence[uuid.UUID],
+        now: datetime
+    ) -> List[Tuple[uuid.UUID, Optional[Message], List[uuid.UUID]]]:
+        """(user_id, rendered message or None, pending notification ids) per user"""
+
+        users = {
+            user_id: (email, full_name)
+            for user_id, email, full_name in self.db.query(
+                User.id, User.email, User.full_name
+            ).filter(User.id.in_(user_ids)).all()
+        }
+        preferences = preference_cache.get_many(self.db, user_ids)
+
+        pending: Dict[uuid.UUID, list] = {user_id: [] for user_id in user_ids}
+        for row in self.db.query(
+            Notification.id, Notification.user_id, Notification.type, Notification.title,
+            Notification.message, Notification.action_url, Notification.is_read, Notification.is_archived
+        ).filter(
+            Notification.user_id.in_(user_ids),
+            Notification.email_sent_at.is_(None),
+            Notification.created_at > self._lookback(now),
+            Notification.created_at <= now
+        ).order_by(Notification.created_at.desc()).all():
+            pending[row.user_id].append(row)
+
+        digests = []
+        for user_id, rows in pending.items():
+            emailed = [
+                row for row in rows
+                if not row.is_read and not row.is_archived and self._email_enabled(preferences[user_id], row.type)
+            ]
+            user = users.get(user_id)
+            message = render_digest(user[0], user[1], emailed) if emailed and user else None
+            digests.append((user_id, message, [row.id for row in rows]))
+
+        return digests
+
+    def _email_enabled(self, preferences: NotificationPreferences, notification_type) -> bool:
+        field = EMAIL_PREFERENCE_FIELDS.get(notification_type)
+        return field is None or getattr(preferences, field)
+
+    def _send(self, transport: EmailTransport, message: Message) -> Tuple[bool, int]:
+        """Deliver with exponential backoff; returns (delivered, retries)"""
+        for attempt in range(self.max_attempts):
+            self.rate_limiter.acquire()
+            try:
+                transport.send(message)
+                return True, attempt
+            except TransientEmailError:
+                if attempt + 1 < self.max_attempts:
+                    time.sleep(settings.EMAIL_DIGEST_RETRY_BACKOFF_SECONDS * 2 ** attempt)
+            except Exception:
+                logger.exception("Email digest to %s failed", message['To'])
+                return False, attempt
+
+        logger.warning("Email digest to %s failed after %d attempts", message['To'], self.max_attempts)
+        return False, self.max_attempts - 1
+
+    def _mark_sent(self, notification_ids: List[uuid.UUID], now: datetime):
+        if not notification_ids:
+            return
+
+        self.db.execute(
+            update(Notification).where(
+                Notification.id.in_(notification_ids),
+                Notification.created_at > self._lookback(now)
+            ).values(email_sent_at=now).execution_options(synchronize_session=False)
+        )
+
+
+def ensure_email_digest_columns(connection: Connection):
+    """Add the digest columns and pending index (PostgreSQL; idempotent)"""
+    if connection.dialect.name != "postgresql":
+        return
+
+    for statement in EMAIL_DIGEST_STATEMENTS:
+        connection.execute(text(statement))
@@ -0,0 +1,114 @@
+"""
+Email Transports
+Pluggable delivery for outgoing email: a file outbox for development and
+tests, and SMTP for production. Selected by EMAIL_TRANSPORT.
+"""
+
+from email.message import Message
+import os
+import smtplib
+import threading
+import uuid
+
+from core.config import settings
+
+
+class TransientEmailError(Exception):
+    """Delivery failed in a way that is worth retrying"""
+
+
+class EmailTransport:
+    """Base transport; send() must be safe to call from several threads"""
+
+    def send(self, message: Message):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class FileTransport(EmailTransport):
+    """Writes each message to `directory` as an .eml file"""
+
+    def __init__(self, directory: str = settings.EMAIL_FILE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def send(self, message: Message):
+        path = os.path.join(self.directory, f"{uuid.uuid4()}.eml")
+        try:
+            with open(path + '.tmp', 'wb') as f:
+                f.write(message.as_bytes())
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            raise TransientEmailError(str(e)) from e
+
+
+class SMTPTransport(EmailTransport):
+    """
+    Sends through an SMTP relay
+
+    Each worker thread keeps its own connection, reopened after errors.
+    """
+
+    def __init__(
+        self,
+        host: str = settings.SMTP_HOST,
+        port: int = settings.SMTP_PORT,
+        username: str = settings.SMTP_USERNAME,
+        password: str = settings.SMTP_PASSWORD,
+        use_tls: bool = settings.SMTP_USE_TLS,
+        timeout: float = 10.0
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def send(self, message: Message):
+        try:
+            self._connection().send_message(message)
+        except smtplib.SMTPResponseException as e:
+            # 4xx replies (rate limited, mailbox busy) are temporary
+            if 400 <= e.smtp_code < 500:
+                raise TransientEmailError(str(e)) from e
+            raise
+        except OSError as e:
+            # Dropped or refused connection (SMTPException is an OSError too)
+            self._local.connection = None
+            raise TransientEmailError(str(e)) from e
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            try:
+                connection.quit()
+            except Exception:
+                pass
+
+    def _connection(self) -> smtplib.SMTP:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.use_tls:
+                connection.starttls()
+            if self.username:
+                connection.login(self.username, self.password)
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+
+def get_transport(name: str = settings.EMAIL_TRANSPORT) -> EmailTransport:
+    """Transport for a name from EMAIL_TRANSPORT ('file' or 'smtp')"""
+    transports = {'file': FileTransport, 'smtp': SMTPTransport}
+    if name not in transports:
+        raise ValueError(f"Email transport must be one of: {', '.join(transports)}")
+    return transports[name]()
@@ -0,0 +1,277 @@
+"""
+Embedding Service
+Pluggable text embedders and an IVF approximate nearest neighbour index over
+NumPy, persisted to disk and memory-mapped on load.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+import json
+import math
+import os
+import re
+import zlib
+
+import numpy as np
+
+from core.config import settings
+
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+class HashingEmbedder:
+    """
+    Deterministic offline embedder
+
+    Hashes unigrams and bigrams into a fixed number of signed buckets with
+    sublinear term frequency, then L2-normalizes. Needs no model or network.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.name = f"hashing-v1-{dim}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts into an (n, dim) float32 array of unit vectors"""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            words = [w.rstrip('.') for w in _TOKEN_PATTERN.findall((text or '').lower())]
+            words = [w for w in words if w]
+            terms = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+            counts: Dict[str, int] = {}
+            for term in terms:
+                counts[term] = counts.get(term, 0) + 1
+
+            for term, count in counts.items():
+                digest = zlib.crc32(term.encode('utf-8'))
+                bucket = digest % self.dim
+                sign = 1.0 if (digest >> 31) & 1 else -1.0
+                vectors[row, bucket] += sign * (1.0 + math.log(count))
+
+        return _normalize(vectors)
+
+
+class OpenAIEmbedder:
+    """Embedder backed by the OpenAI embeddings API"""
+
+    def __init__(self, model: str = settings.EMBEDDING_MODEL, batch_size: int = 256):
+        from openai import OpenAI
+
+        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.model = model
+        self.batch_size = batch_size
+        self.name = f"openai-{model}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts into an (n, dim) float32 array of unit vectors"""
+        rows: List[List[float]] = []
+        for i in range(0, len(texts), self.batch_size):
+            response = self.client.embeddings.create(
+                model=self.model,
+                input=[text or ' ' for text in texts[i:i + self.batch_size]]
+            )
+            rows.extend(item.embedding for item in response.data)
+
+        return _normalize(np.array(rows, dtype=np.float32))
+
+
+def get_embedder():
+    """Configured embedder, falling back to the local hashing embedder"""
+    if settings.EMBEDDING_PROVIDER == 'openai' and settings.OPENAI_API_KEY:
+        try:
+            return OpenAIEmbedder()
+        except Exception:
+            pass
+
+    return HashingEmbedder()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+class IVFIndex:
+    """
+    Inverted-file ANN index for cosine similarity on unit vectors
+
+    Vectors are clustered with spherical k-means and stored contiguously per
+    cluster; a search scans only the nprobe closest clusters. Vectors added
+    after the last build are kept in a small in-memory buffer and searched
+    exhaustively until the next rebuild.
+    """
+
+    def __init__(self, nprobe: int = 16):
+        self.nprobe = nprobe
+        self.ids: List[str] = []
+        self.vectors: Optional[np.ndarray] = None
+        self.centroids: Optional[np.ndarray] = None
+        self.offsets: Optional[np.ndarray] = None
+        self.alive: Optional[np.ndarray] = None
+        self._positions: Dict[str, int] = {}
+        self._pending: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return int(self.alive.sum() if self.alive is not None else 0) + len(self._pending)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def build(self, ids: Sequence[str], vectors: np.ndarray, seed: int = 0):
+        """Cluster vectors and lay them out contiguously per cluster"""
+        count = len(ids)
+        vectors = np.asarray(vectors, dtype=np.float32)
+
+        if count == 0:
+            self.ids = []
+            self.vectors = np.zeros((0, vectors.shape[1] if vectors.ndim == 2 else 0), dtype=np.float32)
+            self.centroids = np.zeros((0, self.vectors.shape[1]), dtype=np.float32)
+            self.offsets = np.zeros(1, dtype=np.int64)
+        else:
+            nlist = max(1, int(math.sqrt(count)))
+            centroids = self._train(vectors, nlist, seed)
+            assignments = np.argmax(vectors @ centroids.T, axis=1)
+            order = np.argsort(assignments, kind='stable')
+
+            self.ids = [ids[i] for i in order]
+            self.vectors = vectors[order]
+            self.centroids = centroids
+            self.offsets = np.searchsorted(
+                assignments[order], np.arange(nlist + 1)
+            ).astype(np.int64)
+
+        self.alive = np.ones(len(self.ids), dtype=bool)
+        self._positions = {item_id: i for i, item_id in enumerate(self.ids)}
+        self._pending = {}
+
+    def add(self, item_id: str, vector: np.ndarray):
+        """Insert or replace a vector"""
+        self.remove(item_id)
+        self._pending[item_id] = np.asarray(vector, dtype=np.float32)
+
+    def remove(self, item_id: str):
+        """Delete a vector"""
+        self._pending.pop(item_id, None)
+        position = self._positions.get(item_id)
+        if position is not None:
+            self.alive[position] = False
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """Approximate top-k (id, cosine similarity), best first"""
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        result_ids: List[str] = []
+        result_scores: List[np.ndarray] = []
+
+        if self.centroids is not None and len(self.centroids):
+            nprobe = min(self.nprobe, len(self.centroids))
+            probes = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+
+            for cluster in probes:
+                start, end = int(self.offsets[cluster]), int(self.offsets[cluster + 1])
+                if start == end:
+                    continue
+                alive = np.flatnonzero(self.alive[start:end]) + start
+                if not len(alive):
+                    continue
+                result_scores.append(np.asarray(self.vectors[alive]) @ query)
+                result_ids.extend(self.ids[i] for i in alive)
+
+        if self._pending:
+            pending_ids = list(self._pending)
+            result_scores.append(np.vstack([self._pending[i] for i in pending_ids]) @ query)
+            result_ids.extend(pending_ids)
+
+        if not result_ids:
+            return []
+
+        scores = np.concatenate(result_scores)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        return [(result_ids[i], float(scores[i])) for i in top]
+
+    def save(self, path: str, embedder_name: str):
+        """Persist a built index (pending vectors are folded in first)"""
+        if self._pending:
+            self.compact()
+
+        os.makedirs(path, exist_ok=True)
+
+        # Write to temp files and rename, so readers holding a memory map of
+        # the previous vectors file keep a valid mapping. meta.json goes last.
+        for filename, array in (
+            ('vectors.npy', np.asarray(self.vectors)),
+            ('centroids.npy', self.centroids),
+            ('offsets.npy', self.offsets),
+            ('alive.npy', self.alive)
+        ):
+            with open(os.path.join(path, filename + '.tmp'), 'wb') as f:
+                np.save(f, array)
+            os.replace(os.path.join(path, filename + '.tmp'), os.path.join(path, filename))
+
+        for filename, payload in (
+            ('ids.json', self.ids),
+            ('meta.json', {'embedder': embedder_name, 'nprobe': self.nprobe})
+        ):
+            with open(os.path.join(path, filename + '.tmp'), 'w') as f:
+                json.dump(payload, f)
+            os.replace(os.path.join(path, filename + '.tmp'), os.path.join(path, filename))
+
+    @classmethod
+    def load(cls, path: str, embedder_name: str) -> Optional["IVFIndex"]:
+        """Load a saved index with memory-mapped vectors, or None if missing/stale"""
+        try:
+            with open(os.path.join(path, 'meta.json')) as f:
+                meta = json.load(f)
+            if meta.get('embedder') != embedder_name:
+                return None
+
+            index = cls(nprobe=meta.get('nprobe', 16))
+            index.vectors = np.load(os.path.join(path, 'vectors.npy'), mmap_mode='r')
+            index.centroids = np.load(os.path.join(path, 'centroids.npy'))
+            index.offsets = np.load(os.path.join(path, 'offsets.npy'))
+            index.alive = np.load(os.path.join(path, 'alive.npy')).copy()
+            with open(os.path.join(path, 'ids.json')) as f:
+                index.ids = json.load(f)
+            index._positions = {item_id: i for i, item_id in enumerate(index.ids)}
+            return index
+        except (OSError, ValueError):
+            return None
+
+    def compact(self):
+        """Rebuild clusters including pending vectors and dropping deleted ones"""
+        ids = [item_id for item_id, alive in zip(self.ids, self.alive) if alive]
+        parts = []
+        if ids:
+            parts.append(np.asarray(self.vectors)[self.alive])
+        if self._pending:
+            ids.extend(self._pending)
+            parts.append(np.vstack(list(self._pending.values())))
+
+        if parts:
+            self.build(ids, np.vstack(parts))
+        else:
+            self.build([], np.zeros((0, self.vectors.shape[1] if self.vectors is not None else 0)))
+
+    def _train(self, vectors: np.ndarray, nlist: int, seed: int, iterations: int = 10) -> np.ndarray:
+        """Spherical k-means on a sample of the vectors"""
+        rng = np.random.default_rng(seed)
+        sample_size = min(len(vectors), nlist * 256)
+        sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            for cluster in range(nlist):
+                members = sample[assignments == cluster]
+                if len(members):
+                    centroids[cluster] = members.sum(axis=0)
+
+            centroids = _normalize(centroids)
+
+        return centroids
@@ -0,0 +1,141 @@
+"""
+Job Match Fan-out Service
+Finds candidates matching a newly posted job and sends them NEW_JOB_MATCH
+notifications. Runs as a background task, off the job-creation request path.
+"""
+
+from typing import Any, Dict, List, Optional
+from sqlalchemy.orm import Session
+import logging
+import time
+import uuid
+
+from core.config import settings
+from db.session import SessionLocal
+from models.candidate import CandidateProfile
+from models.job import Job, Company
+from services.ai_matching import AIMatchingService, job_work_model
+from services.match_features import MatchFeatureService
+from services.notification_service import NotificationService
+from services.skill_dictionary import skill_dictionary
+from services.skill_index import skill_index
+
+logger = logging.getLogger(__name__)
+
+
+class JobMatchFanoutService:
+    """Service for notifying candidates about a new matching job"""
+
+    def __init__(
+        self,
+        db: Session,
+        threshold: float = settings.JOB_MATCH_NOTIFY_THRESHOLD,
+        batch_size: int = settings.JOB_MATCH_FANOUT_BATCH_SIZE,
+        matching_service: Optional[AIMatchingService] = None
+    ):
+        self.db = db
+        self.threshold = threshold
+        self.batch_size = batch_size
+        self.matching_service = matching_service or AIMatchingService()
+
+    def run(self, job_id: uuid.UUID) -> Dict[str, Any]:
+        """
+        Score candidates for a job and notify those above the threshold
+
+        Candidates are narrowed with the skill index, then scored in batches
+        with the vectorized scorer; notifications are bulk-inserted per batch.
+
+        Returns:
+            Dict with candidate, match and notification counts
+        """
+
+        start = time.perf_counter()
+
+        job = self.db.query(Job).filter(Job.id == job_id).first()
+        if not job or not job.is_active:
+            return {'candidates': 0, 'matches': 0, 'notified': 0, 'elapsed_seconds': 0.0}
+
+        company = self.db.query(Company).filter(Company.id == job.company_id).first()
+        company_name = company.name if company else ''
+
+        job_dict = {
+            'id': str(job.id),
+            'title': job.title,
+            'required_skills': job.required_skills or [],
+            'preferred_skills': job.preferred_skills or [],
+            'experience_level': job.experience_level,
+            'location': job.location,
+            'work_model': job_work_model(job.remote_policy),
+            'requirements': [job.education_requirement] if job.education_requirement else []
+        }
+
+        candidate_ids = self._candidate_ids(job)
+
+        feature_service = MatchFeatureService(self.db, self.matching_service)
+        notification_service = NotificationService(self.db)
+
+        matches = 0
+        notified = 0
+
+        for i in range(0, len(candidate_ids), self.batch_size):
+            profiles = self.db.query(CandidateProfile).filter(
+                CandidateProfile.id.in_(candidate_ids[i:i + self.batch_size]),
+                CandidateProfile.is_active == True,
+                CandidateProfile.looking_for_job == True
+            ).all()
+            if not profiles:
+                continue
+
+            features_by_id = feature_service.get_features(profiles)
+            encoded = self.matching_service.encode_candidates([
+                {'match_features': features_by_id[profile.id]} for profile in profiles
+            ])
+            scores = self.matching_service.score_candidates_for_job(encoded, job_dict)
+
+            batch_matches = []
+            for profile, score in zip(profiles, scores['match_score'].tolist()):
+                match_score = round(score, 1)
+                if match_score >= self.threshold:
+                    batch_matches.append((profile.user_id, match_score))
+
+            matches += len(batch_matches)
+            notified += notification_service.notify_new_job_matches(
+                batch_matches, job.title, company_name, job.id
+            )
+
+        return {
+            'candidates': len(candidate_ids),
+            'matches': matches,
+            'notified': notified,
+            'elapsed_seconds': round(time.perf_counter() - start, 3)
+        }
+
+    def _candidate_ids(self, job: Job) -> List[uuid.UUID]:
+        """Candidates sharing a required skill (or a related/partial variant)"""
+
+        if job.required_skills:
+            skill_index.ensure_built(self.db)
+            return sorted(
+                skill_index.find_candidates(skill_dictionary.expand(job.required_skills)),
+                key=str
+            )
+
+        # No required skills: every candidate gets a full skill score
+        return [
+            candidate_id for (candidate_id,) in self.db.query(CandidateProfile.id).order_by(
+                CandidateProfile.id
+            ).all()
+        ]
+
+
+def run_new_job_match_fanout(job_id: uuid.UUID):
+    """Background task entry point; uses its own database session"""
+    db = SessionLocal()
+    try:
+        stats = JobMatchFanoutService(db).run(job_id)
+        logger.info("New job match fan-out for %s: %s", job_id, stats)
+    except Exception:
+        db.rollback()
+        logger.exception("New job match fan-out failed for %s", job_id)
+    finally:
+        db.close()
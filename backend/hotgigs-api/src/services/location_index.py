@@ -0,0 +1,271 @@
+"""
+Location Index Service
+Normalized location dimension: locations are lowercased and alias-expanded
+("SF, CA" -> "san francisco, california") and compared by trigram
+similarity, so abbreviations, prefixes and typos resolve consistently in
+search filters and in matching.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set
+from sqlalchemy import and_, event, literal
+from sqlalchemy.orm import Session
+import re
+import threading
+
+from core.config import settings
+from models.candidate import CandidateProfile
+from models.job import Job
+
+
+US_STATES = {
+    'al': 'alabama', 'ak': 'alaska', 'az': 'arizona', 'ar': 'arkansas', 'ca': 'california',
+    'co': 'colorado', 'ct': 'connecticut', 'de': 'delaware', 'fl': 'florida', 'ga': 'georgia',
+    'hi': 'hawaii', 'id': 'idaho', 'il': 'illinois', 'in': 'indiana', 'ia': 'iowa',
+    'ks': 'kansas', 'ky': 'kentucky', 'la': 'louisiana', 'me': 'maine', 'md': 'maryland',
+    'ma': 'massachusetts', 'mi': 'michigan', 'mn': 'minnesota', 'ms': 'mississippi',
+    'mo': 'missouri', 'mt': 'montana', 'ne': 'nebraska', 'nv': 'nevada', 'nh': 'new hampshire',
+    'nj': 'new jersey', 'nm': 'new mexico', 'ny': 'new york', 'nc': 'north carolina',
+    'nd': 'north dakota', 'oh': 'ohio', 'ok': 'oklahoma', 'or': 'oregon', 'pa': 'pennsylvania',
+    'ri': 'rhode island', 'sc': 'south carolina', 'sd': 'south dakota', 'tn': 'tennessee',
+    'tx': 'texas', 'ut': 'utah', 'vt': 'vermont', 'va': 'virginia', 'wa': 'washington',
+    'wv': 'west virginia', 'wi': 'wisconsin', 'wy': 'wyoming'
+}
+
+# Only in the city position: "LA" is Los Angeles, "Baton Rouge, LA" is Louisiana
+CITY_ALIASES = {
+    'sf': 'san francisco', 'nyc': 'new york', 'la': 'los angeles', 'philly': 'philadelphia',
+    'vegas': 'las vegas', 'bay area': 'san francisco'
+}
+
+# In any position; DC is its own place, not Washington state
+PLACE_ALIASES = {
+    'dc': 'washington dc', 'd c': 'washington dc', 'washington d c': 'washington dc',
+    'district of columbia': 'washington dc',
+    'us': 'united states', 'usa': 'united states', 'united states of america': 'united states',
+    'uk': 'united kingdom', 'great britain': 'united kingdom', 'uae': 'united arab emirates'
+}
+
+# Fixed gazetteer that misspelt or abbreviated parts snap onto. It never
+# changes at runtime, so a location resolves the same way on every worker.
+KNOWN_PLACES = frozenset([
+    *US_STATES.values(), *CITY_ALIASES.values(), *PLACE_ALIASES.values(),
+    'atlanta', 'austin', 'baltimore', 'boston', 'charlotte', 'chicago', 'cincinnati',
+    'cleveland', 'columbus', 'dallas', 'denver', 'detroit', 'fort worth', 'houston',
+    'indianapolis', 'jacksonville', 'kansas city', 'las vegas', 'los angeles', 'miami',
+    'milwaukee', 'minneapolis', 'nashville', 'new orleans', 'oakland', 'orlando',
+    'philadelphia', 'phoenix', 'pittsburgh', 'portland', 'raleigh', 'sacramento',
+    'salt lake city', 'san antonio', 'san diego', 'san francisco', 'san jose', 'seattle',
+    'st louis', 'tampa',
+    'canada', 'toronto', 'vancouver', 'montreal', 'mexico', 'brazil', 'united kingdom',
+    'london', 'ireland', 'dublin', 'france', 'paris', 'germany', 'berlin', 'munich',
+    'netherlands', 'amsterdam', 'spain', 'madrid', 'barcelona', 'italy', 'switzerland',
+    'zurich', 'sweden', 'stockholm', 'poland', 'india', 'bangalore', 'bengaluru', 'hyderabad',
+    'mumbai', 'pune', 'chennai', 'new delhi', 'singapore', 'japan', 'tokyo', 'china',
+    'australia', 'sydney', 'melbourne', 'israel', 'tel aviv', 'dubai',
+    'remote'
+])
+
+_NON_WORD = re.compile(r"[^\w\s,]+")
+
+
+def normalize_location(location: Optional[str]) -> str:
+    """Canonical form: lowercase comma-separated parts with aliases expanded"""
+    raw_parts = [
+        ' '.join(part.split())
+        for part in _NON_WORD.sub(' ', (location or '').lower()).split(',')
+    ]
+    raw_parts = [part for part in raw_parts if part]
+
+    parts = []
+    for position, part in enumerate(raw_parts):
+        expanded = PLACE_ALIASES.get(part)
+        if expanded is None and position == 0:
+            expanded = CITY_ALIASES.get(part)
+        if expanded is None and (position > 0 or len(raw_parts) == 1):
+            # State codes only after the city, or on their own ("TX")
+            expanded = US_STATES.get(part)
+        parts.append(expanded or part)
+
+    # "Washington, DC" is one place, not a city plus a region
+    return ', '.join(
+        part for part, following in zip(parts, parts[1:] + [''])
+        if following != part and not following.startswith(part + ' ')
+    )
+
+
+def location_parts(location: Optional[str]) -> List[str]:
+    """City/region/country parts of a normalized location"""
+    normalized = normalize_location(location)
+    return normalized.split(', ') if normalized else []
+
+
+def trigrams(text: str) -> Set[str]:
+    """pg_trgm-style trigrams: each word padded with two leading spaces and one trailing"""
+    grams = set()
+    for word in re.findall(r"\w+", text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def word_similarity(query: str, target: str) -> float:
+    """Share of the query's trigrams found in the target (approximates pg_trgm word_similarity)"""
+    query_grams = trigrams(query)
+    if not query_grams:
+        return 0.0
+    return len(query_grams & trigrams(target)) / len(query_grams)
+
+
+_PLACES_BY_GRAM: Dict[str, Set[str]] = {}
+for _place in KNOWN_PLACES:
+    for _gram in trigrams(_place):
+        _PLACES_BY_GRAM.setdefault(_gram, set()).add(_place)
+
+
+class LocationIndex:
+    """
+    Trigram index over distinct normalized locations and their parts
+
+    Used where pg_trgm is unavailable to resolve a location filter to the
+    normalized values it matches. Built lazily from jobs and candidate
+    profiles, then extended by the write routes. Matching snaps misspelt or
+    abbreviated parts onto KNOWN_PLACES only, never onto indexed values, so
+    match scores do not depend on which locations have been written.
+    """
+
+    def __init__(self, threshold: float = settings.LOCATION_MATCH_THRESHOLD):
+        self.threshold = threshold
+        self._lock = threading.RLock()
+        self._built = False
+        self._values: Set[str] = set()
+        self._values_by_gram: Dict[str, Set[str]] = {}
+        self._canonical_parts: Dict[str, str] = {}
+
+    @property
+    def is_built(self) -> bool:
+        return self._built
+
+    def ensure_built(self, db: Session):
+        """Build the index from the database if it has not been built yet"""
+        if self._built:
+            return
+
+        with self._lock:
+            if not self._built:
+                self.rebuild(db)
+
+    def rebuild(self, db: Session):
+        """Load every distinct job and candidate location"""
+        with self._lock:
+            rows = db.query(Job.location).distinct().all()
+            rows += db.query(CandidateProfile.location).distinct().all()
+
+            for (location,) in rows:
+                self.add_location(location)
+
+            self._built = True
+
+    def add_location(self, location: Optional[str]):
+        """Index a location (idempotent)"""
+        normalized = normalize_location(location)
+        if not normalized:
+            return
+
+        with self._lock:
+            if normalized not in self._values:
+                self._values.add(normalized)
+                for gram in trigrams(normalized):
+                    self._values_by_gram.setdefault(gram, set()).add(normalized)
+
+    def matching_values(self, query: Optional[str]) -> List[str]:
+        """Normalized locations matching every part of `query` by trigram word similarity"""
+        parts = location_parts(query)
+        if not parts:
+            return []
+
+        with self._lock:
+            return sorted(
+                value for value in self._candidates(', '.join(parts), self._values_by_gram)
+                if all(word_similarity(part, value) >= self.threshold for part in parts)
+            )
+
+    def canonical_part(self, part: str) -> str:
+        """The known place closest to `part`, or `part` itself when none is close"""
+        with self._lock:
+            cached = self._canonical_parts.get(part)
+            if cached is not None:
+                return cached
+
+            best = part
+            if part not in KNOWN_PLACES:
+                candidates = self._candidates(part, _PLACES_BY_GRAM)
+                completions = [candidate for candidate in candidates if self._completes(part, candidate)]
+                if len(completions) == 1:
+                    # Unambiguous prefix ("san fran"); "san" alone is left as is
+                    best = completions[0]
+                elif not completions:
+                    # Misspelling: closest part by trigram similarity
+                    part_grams = trigrams(part)
+                    best_score = self.threshold
+                    for candidate in sorted(candidates):
+                        candidate_grams = trigrams(candidate)
+                        score = len(part_grams & candidate_grams) / len(part_grams | candidate_grams)
+                        if score >= best_score:
+                            best, best_score = candidate, score
+
+            if len(self._canonical_parts) >= settings.LOCATION_PART_CACHE_MAX_ENTRIES:
+                self._canonical_parts.clear()
+            self._canonical_parts[part] = best
+            return best
+
+    def tokens(self, location: Optional[str]) -> Set[str]:
+        """Canonical parts of a location, for exact-token matching"""
+        return {self.canonical_part(part) for part in location_parts(location)}
+
+    def _completes(self, prefix: str, candidate: str) -> bool:
+        """Whether `candidate` starts with `prefix` word by word, the last word partially"""
+        prefix_words, candidate_words = prefix.split(), candidate.split()
+        if not prefix_words or len(prefix_words) > len(candidate_words):
+            return False
+        last = len(prefix_words) - 1
+        return (
+            prefix_words[:last] == candidate_words[:last]
+            and candidate_words[last].startswith(prefix_words[last])
+        )
+
+    def _candidates(self, text: str, postings: Dict[str, Set[str]]) -> Iterable[str]:
+        candidates = set()
+        for gram in trigrams(text):
+            candidates |= postings.get(gram, set())
+        return candidates
+
+
+# Shared per-process index
+location_index = LocationIndex()
+
+
+def location_filter(normalized_column, location: str, dialect_name: str):
+    """
+    SQL filter for rows whose normalized location matches `location`
+
+    Every part of the location must match. On PostgreSQL this is the pg_trgm
+    word similarity operator, served by the GIN trigram index; elsewhere the
+    in-memory index resolves the matching values first (callers ensure it is
+    built).
+    """
+    if dialect_name == "postgresql":
+        return and_(*[
+            literal(part).op('<%')(normalized_column) for part in location_parts(location)
+        ])
+
+    return normalized_column.in_(location_index.matching_values(location))
+
+
+@event.listens_for(Job, 'before_insert')
+@event.listens_for(Job, 'before_update')
+@event.listens_for(CandidateProfile, 'before_insert')
+@event.listens_for(CandidateProfile, 'before_update')
+def _set_location_normalized(mapper, connection, target):
+    """Keep location_normalized in step with location"""
+    target.location_normalized = normalize_location(target.location) or None
+    location_index.add_location(target.location)
@@ -0,0 +1,124 @@
+"""
+Match Score Cache
+Caches numeric candidate-job match scores keyed by entity IDs and their
+updated_at timestamps, so entries self-invalidate when a profile or job changes.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import json
+
+from core.cache import LRUCache, get_redis_client
+from core.config import settings
+
+# (match_score, skills, experience, location, education), unrounded
+MatchScores = Tuple[float, float, float, float, float]
+
+# Bump when the scoring algorithm changes so stale entries are ignored
+SCORE_VERSION = 6
+
+
+class MatchScoreCache:
+    """Two-tier match score cache: in-process LRU in front of optional Redis"""
+
+    def __init__(
+        self,
+        max_entries: int = settings.MATCH_CACHE_MAX_ENTRIES,
+        ttl_seconds: int = settings.MATCH_CACHE_TTL_SECONDS,
+        use_redis: bool = settings.MATCH_CACHE_USE_REDIS
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.use_redis = use_redis
+        self._memory = LRUCache(max_entries, ttl_seconds)
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, candidate: Dict[str, Any], job: Dict[str, Any]) -> Optional[str]:
+        """Cache key for a candidate/job pair, or None if either lacks an ID"""
+        candidate_id = candidate.get('id')
+        job_id = job.get('id')
+
+        if not candidate_id or not job_id:
+            return None
+
+        return 'match:v{}:{}:{}:{}:{}'.format(
+            SCORE_VERSION,
+            candidate_id,
+            self._version_token(candidate.get('updated_at')),
+            job_id,
+            self._version_token(job.get('updated_at'))
+        )
+
+    def get_many(self, keys: Sequence[Optional[str]]) -> List[Optional[MatchScores]]:
+        """Look up several keys; missing entries are returned as None"""
+        results: List[Optional[MatchScores]] = [
+            self._memory.get(key) if key is not None else None
+            for key in keys
+        ]
+
+        redis_client = get_redis_client() if self.use_redis else None
+        missing = [i for i, value in enumerate(results) if value is None and keys[i] is not None]
+
+        if redis_client is not None and missing:
+            try:
+                raw_values = redis_client.mget([keys[i] for i in missing])
+            except Exception:
+                raw_values = [None] * len(missing)
+
+            for i, raw in zip(missing, raw_values):
+                if raw is not None:
+                    value = tuple(json.loads(raw))
+                    results[i] = value
+                    self._memory.set(keys[i], value)
+
+        for key, value in zip(keys, results):
+            if key is None:
+                continue
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return results
+
+    def set_many(self, items: Sequence[Tuple[Optional[str], MatchScores]]):
+        """Store several entries"""
+        items = [(key, tuple(value)) for key, value in items if key is not None]
+
+        for key, value in items:
+            self._memory.set(key, value)
+
+        redis_client = get_redis_client() if self.use_redis else None
+        if redis_client is not None and items:
+            try:
+                pipeline = redis_client.pipeline(transaction=False)
+                for key, value in items:
+                    pipeline.setex(key, self.ttl_seconds, json.dumps(value))
+                pipeline.execute()
+            except Exception:
+                pass
+
+    def clear(self):
+        """Drop all in-process entries"""
+        self._memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            'size': len(self._memory),
+            'backend': 'memory+redis' if self.use_redis and get_redis_client() is not None else 'memory'
+        }
+
+    def _version_token(self, updated_at: Any) -> str:
+        if updated_at is None:
+            return '0'
+        if hasattr(updated_at, 'isoformat'):
+            return updated_at.isoformat()
+        return str(updated_at)
+
+
+# Shared per-process cache
+match_cache = MatchScoreCache()
@@ -0,0 +1,182 @@
+"""
+Match Feature Service
+Maintains precomputed candidate match-feature snapshots so matching reads one
+row per candidate instead of joining skills and education at request time.
+"""
+
+from typing import Any, Dict, List, Optional
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from datetime import datetime
+import uuid
+
+from models.candidate import CandidateProfile, CandidateMatchFeatures, CandidateSkill, Education
+from services.ai_matching import AIMatchingService
+
+
+class MatchFeatureService:
+    """Service for building and reading candidate match features"""
+
+    def __init__(
+        self,
+        db: Session,
+        matching_service: Optional[AIMatchingService] = None,
+        write_batch_size: int = 1000
+    ):
+        self.db = db
+        self.matching_service = matching_service or AIMatchingService()
+        self.write_batch_size = write_batch_size
+
+    def refresh_candidate(self, profile: CandidateProfile) -> CandidateMatchFeatures:
+        """
+        Recompute and stage the feature row for one candidate
+
+        Pending skill/education rows are flushed first, so this can be called
+        in the same transaction as the change that triggered it.
+        """
+
+        self.db.flush()
+
+        skill_names = [
+            name for (name,) in self.db.query(CandidateSkill.skill_name).filter(
+                CandidateSkill.candidate_id == profile.id
+            ).all()
+        ]
+        degrees = [
+            degree for (degree,) in self.db.query(Education.degree).filter(
+                Education.candidate_id == profile.id
+            ).all()
+        ]
+
+        return self._store(profile, skill_names, degrees)
+
+    def get_for_candidate(self, profile: CandidateProfile) -> Dict[str, Any]:
+        """Feature dict for one candidate, building it if missing"""
+
+        return self.get_features([profile])[profile.id]
+
+    def get_features(self, profiles: List[CandidateProfile]) -> Dict[uuid.UUID, Dict[str, Any]]:
+        """
+        Feature dicts for several candidates in one query
+
+        Candidates without a stored snapshot (e.g. created before snapshots
+        existed) are built in bulk and upserted in the caller's transaction,
+        without committing it; they persist once the caller commits, as
+        db/recompute_matches.py does for every candidate.
+        """
+
+        if not profiles:
+            return {}
+
+        profile_ids = [profile.id for profile in profiles]
+
+        rows = self.db.query(CandidateMatchFeatures).filter(
+            CandidateMatchFeatures.candidate_id.in_(profile_ids)
+        ).all()
+
+        features = {row.candidate_id: row.to_features() for row in rows}
+
+        missing = [profile for profile in profiles if profile.id not in features]
+        if missing:
+            features.update(self._backfill(missing))
+
+        return features
+
+    def refresh_all(self, batch_size: int = 1000) -> int:
+        """
+        Recompute every candidate's snapshot, e.g. after the feature rules
+        change; commits once per batch
+
+        Returns:
+            Number of snapshots written
+        """
+
+        profile_ids = [profile_id for (profile_id,) in self.db.query(CandidateProfile.id).all()]
+        for i in range(0, len(profile_ids), batch_size):
+            profiles = self.db.query(CandidateProfile).filter(
+                CandidateProfile.id.in_(profile_ids[i:i + batch_size])
+            ).all()
+            self._backfill(profiles)
+            self.db.commit()
+
+        return len(profile_ids)
+
+    def _backfill(self, profiles: List[CandidateProfile]) -> Dict[uuid.UUID, Dict[str, Any]]:
+        """Build and upsert feature rows for candidates that have none"""
+
+        profile_ids = [profile.id for profile in profiles]
+
+        skills_by_candidate: Dict[uuid.UUID, List[str]] = {}
+        for candidate_id, skill_name in self.db.query(
+            CandidateSkill.candidate_id, CandidateSkill.skill_name
+        ).filter(CandidateSkill.candidate_id.in_(profile_ids)).all():
+            skills_by_candidate.setdefault(candidate_id, []).append(skill_name)
+
+        degrees_by_candidate: Dict[uuid.UUID, List[str]] = {}
+        for candidate_id, degree in self.db.query(
+            Education.candidate_id, Education.degree
+        ).filter(Education.candidate_id.in_(profile_ids)).all():
+            degrees_by_candidate.setdefault(candidate_id, []).append(degree)
+
+        features = {
+            profile.id: self._compute(
+                profile,
+                skills_by_candidate.get(profile.id, []),
+                degrees_by_candidate.get(profile.id, [])
+            )
+            for profile in profiles
+        }
+
+        # Concurrent first reads of the same candidate both succeed; the later one wins
+        now = datetime.utcnow()
+        rows = [
+            {'candidate_id': candidate_id, 'updated_at': now, **values}
+            for candidate_id, values in features.items()
+        ]
+        for i in range(0, len(rows), self.write_batch_size):
+            stmt = insert(CandidateMatchFeatures).values(rows[i:i + self.write_batch_size])
+            self.db.execute(stmt.on_conflict_do_update(
+                index_elements=[CandidateMatchFeatures.candidate_id],
+                set_={column: stmt.excluded[column] for column in rows[0] if column != 'candidate_id'}
+            ))
+
+        return features
+
+    def _store(
+        self,
+        profile: CandidateProfile,
+        skill_names: List[str],
+        degrees: List[str]
+    ) -> CandidateMatchFeatures:
+        """Compute features and add or update the snapshot row"""
+
+        features = self._compute(profile, skill_names, degrees)
+
+        row = self.db.get(CandidateMatchFeatures, profile.id)
+        if row is None:
+            row = CandidateMatchFeatures(candidate_id=profile.id)
+            self.db.add(row)
+
+        row.skill_names = features['skill_names']
+        row.experience_level = features['experience_level']
+        row.location_tokens = features['location_tokens']
+        row.remote_preference = features['remote_preference']
+        row.highest_degree = features['highest_degree']
+
+        return row
+
+    def _compute(
+        self,
+        profile: CandidateProfile,
+        skill_names: List[str],
+        degrees: List[str]
+    ) -> Dict[str, Any]:
+        """Feature dict for a candidate from their skills and degrees"""
+
+        return self.matching_service.build_match_features({
+            'skills': skill_names,
+            'years_of_experience': profile.years_of_experience,
+            'location': profile.location or '',
+            'remote_preference': True,  # TODO: Add to model
+            'education': [{'degree': degree or ''} for degree in degrees]
+        })
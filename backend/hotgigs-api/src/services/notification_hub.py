@@ -0,0 +1,203 @@
+"""
+Notification Hub
+Per-user publish/subscribe for pushing notifications to connected clients
+as they are created, instead of clients polling for them.
+"""
+
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from contextlib import asynccontextmanager
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+
+from core.cache import get_redis_client
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PUSH_CHANNEL = "notifications:push"
+
+# Sent in place of events a slow client missed; it should refetch its list
+RESYNC_EVENT = ('resync', '{}')
+
+_PENDING_KEY = 'pending_notification_events'
+
+
+class NotificationHub:
+    """
+    In-process fan-out hub keyed by user_id
+
+    Each open stream owns a bounded asyncio queue. publish() is thread-safe,
+    so the synchronous services can call it from worker threads; events are
+    handed to each subscriber's event loop. With use_redis, events are also
+    relayed over Redis pub/sub so streams held by other workers receive them.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = settings.NOTIFICATION_STREAM_QUEUE_SIZE,
+        use_redis: bool = settings.NOTIFICATION_PUSH_USE_REDIS
+    ):
+        self.queue_size = queue_size
+        self.use_redis = use_redis
+        self._origin = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._subscribers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._listener: Optional[threading.Thread] = None
+        self._closed = False
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def subscribe(self, user_id: uuid.UUID) -> asyncio.Queue:
+        """Open a queue of (event, json data) pairs for a user; call from the event loop"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(str(user_id), set()).add((asyncio.get_running_loop(), queue))
+            self._ensure_listener()
+        return queue
+
+    def unsubscribe(self, user_id: uuid.UUID, queue: asyncio.Queue):
+        with self._lock:
+            subscribers = self._subscribers.get(str(user_id))
+            if not subscribers:
+                return
+            subscribers.discard((asyncio.get_running_loop(), queue))
+            if not subscribers:
+                del self._subscribers[str(user_id)]
+
+    @asynccontextmanager
+    async def connect(self, user_id: uuid.UUID):
+        """Subscription for the lifetime of one stream"""
+        queue = self.subscribe(user_id)
+        try:
+            yield queue
+        finally:
+            self.unsubscribe(user_id, queue)
+
+    def is_listening(self, user_id: uuid.UUID) -> bool:
+        """Whether an event for the user could reach a stream (always, when relaying)"""
+        return self.use_redis or str(user_id) in self._subscribers
+
+    def publish(self, user_id: uuid.UUID, event_name: str, data: Dict[str, Any]):
+        """Push an event to every stream the user has open"""
+        self.publish_many([(user_id, event_name, data)])
+
+    def publish_many(self, events: Iterable[Tuple[uuid.UUID, str, Dict[str, Any]]]):
+        """Push (user_id, event, data) triples; remote workers get them in one pipeline"""
+        relay = []
+        for user_id, event_name, data in events:
+            if not self.is_listening(user_id):
+                continue
+            encoded = json.dumps(data, default=str)
+            self._deliver(str(user_id), event_name, encoded)
+            self.published += 1
+            if self.use_redis:
+                relay.append(json.dumps({
+                    'origin': self._origin,
+                    'user_id': str(user_id),
+                    'event': event_name,
+                    'data': encoded
+                }))
+
+        redis_client = get_redis_client() if relay else None
+        if redis_client is not None:
+            try:
+                pipeline = redis_client.pipeline(transaction=False)
+                for message in relay:
+                    pipeline.publish(PUSH_CHANNEL, message)
+                pipeline.execute()
+            except Exception:
+                logger.exception("Failed to relay %d notification events", len(relay))
+
+    def close(self):
+        """Stop relaying from Redis"""
+        self._closed = True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            users = len(self._subscribers)
+            streams = sum(len(subscribers) for subscribers in self._subscribers.values())
+        return {
+            'users': users,
+            'streams': streams,
+            'published': self.published,
+            'delivered': self.delivered,
+            'dropped': self.dropped
+        }
+
+    def _deliver(self, user_id: str, event_name: str, encoded: str):
+        with self._lock:
+            targets = list(self._subscribers.get(user_id, ()))
+
+        for loop, queue in targets:
+            try:
+                loop.call_soon_threadsafe(self._put, queue, (event_name, encoded))
+            except RuntimeError:
+                # The stream's loop has shut down
+                pass
+
+    def _put(self, queue: asyncio.Queue, message: Tuple[str, str]):
+        # Runs on the subscriber's loop
+        try:
+            queue.put_nowait(message)
+            self.delivered += 1
+        except asyncio.QueueFull:
+            # The client fell behind: replace its backlog with one resync
+            self.dropped += queue.qsize()
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC_EVENT)
+
+    def _ensure_listener(self):
+        # Called with the lock held
+        if self.use_redis and self._listener is None and get_redis_client() is not None:
+            self._listener = threading.Thread(target=self._listen, name="notification-hub", daemon=True)
+            self._listener.start()
+
+    def _listen(self):
+        import redis
+
+        while not self._closed:
+            try:
+                # Dedicated connection: the shared client's short socket timeout
+                # would break a blocking subscription
+                pubsub = redis.Redis.from_url(settings.REDIS_URL).pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(PUSH_CHANNEL)
+                while not self._closed:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is None:
+                        continue
+                    relayed = json.loads(message['data'])
+                    if relayed['origin'] != self._origin:
+                        self._deliver(relayed['user_id'], relayed['event'], relayed['data'])
+                pubsub.close()
+            except Exception:
+                logger.exception("Notification relay disconnected; reconnecting")
+                time.sleep(1)
+
+
+# Shared per-process hub
+notification_hub = NotificationHub()
+
+
+def publish_on_commit(db: Session, events: Iterable[Tuple[uuid.UUID, str, Dict[str, Any]]]):
+    """Publish events once the session's transaction commits; dropped on rollback"""
+    db.info.setdefault(_PENDING_KEY, []).extend(events)
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_pending(session):
+    events = session.info.pop(_PENDING_KEY, None)
+    if events:
+        notification_hub.publish_many(events)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,99 @@
+"""
+Notification Retention Service
+Moves read notifications past the retention period from notifications to
+notifications_archive in bulk, then drops monthly partitions left empty.
+"""
+
+from typing import Any, Dict, Optional
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+import time
+
+from core.config import settings
+from db.notification_partitions import ensure_notification_partitions, expired_partitions
+from models.notification import Notification, NotificationArchive
+
+ARCHIVED_COLUMNS = [
+    'id', 'user_id', 'type', 'title', 'message', 'related_job_id', 'related_application_id',
+    'related_user_id', 'action_url', 'created_at', 'read_at'
+]
+
+
+class NotificationRetentionService:
+    """Service for archiving old notifications"""
+
+    def __init__(
+        self,
+        db: Session,
+        retention_days: int = settings.NOTIFICATION_RETENTION_DAYS,
+        batch_size: int = settings.NOTIFICATION_ARCHIVE_BATCH_SIZE
+    ):
+        self.db = db
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+
+    def run(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Archive read notifications older than the retention period
+
+        Each batch is copied and deleted in its own transaction, so the job
+        can be interrupted and rerun. Unread notifications are kept, which
+        leaves the unread counters untouched. Monthly partitions entirely
+        before the cutoff are dropped once empty, and partitions for the
+        coming months are created.
+
+        Returns:
+            Dict with archived row, batch and dropped partition counts
+        """
+
+        start = time.perf_counter()
+        cutoff = (now or datetime.utcnow()) - timedelta(days=self.retention_days)
+
+        archived = batches = 0
+        while True:
+            moved = self._archive_batch(cutoff)
+            if not moved:
+                break
+            archived += moved
+            batches += 1
+
+        dropped = []
+        connection = self.db.connection()
+        for name in expired_partitions(connection, cutoff):
+            if not connection.execute(text(f"SELECT EXISTS (SELECT 1 FROM {name})")).scalar():
+                connection.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+        ensure_notification_partitions(connection, settings.NOTIFICATION_PARTITION_MONTHS_AHEAD)
+        self.db.commit()
+
+        elapsed = time.perf_counter() - start
+        return {
+            'archived': archived,
+            'batches': batches,
+            'dropped_partitions': dropped,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_second': round(archived / elapsed) if elapsed else 0
+        }
+
+    def _archive_batch(self, cutoff: datetime) -> int:
+        # created_at bounds every statement, so PostgreSQL only touches old partitions
+        ids = self.db.execute(
+            select(Notification.id).where(
+                Notification.created_at < cutoff,
+                Notification.is_read == True
+            ).limit(self.batch_size)
+        ).scalars().all()
+        if not ids:
+            return 0
+
+        batch = (Notification.created_at < cutoff, Notification.id.in_(ids))
+        self.db.execute(
+            insert(NotificationArchive).from_select(
+                ARCHIVED_COLUMNS,
+                select(*[getattr(Notification, column) for column in ARCHIVED_COLUMNS]).where(*batch)
+            )
+        )
+        self.db.execute(delete(Notification).where(*batch).execution_options(synchronize_session=False))
+        self.db.commit()
+        return len(ids)
@@ -3,13 +3,19 @@ Notification Service
 Handles creation, management, and delivery of notifications
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from collections import Counter
+from sqlalchemy import insert, func
 from sqlalchemy.orm import Session
 from datetime import datetime
 import uuid
 
 from models.notification import Notification, NotificationType, NotificationPreference
 from models.user import User
+from services.notification_hub import notification_hub, publish_on_commit
+from services.notification_writer import notification_writer
+from services.preference_cache import NotificationPreferences, preference_cache
+from services.unread_counters import UnreadCounterService
 
 
 class NotificationService:
@@ -17,6 +23,7 @@ class NotificationService:
     
     def __init__(self, db: Session):
         self.db = db
+        self.counters = UnreadCounterService(db)
     
     def create_notification(
         self,
@@ -43,11 +50,125 @@ class NotificationService:
         )
         
         self.db.add(notification)
+        self.counters.add('notifications', {user_id: 1})
         self.db.commit()
         self.db.refresh(notification)
         
+        if notification_hub.is_listening(user_id):
+            notification_hub.publish(user_id, 'notification', notification.to_dict())
+        
         return notification
     
+    def create_notifications_bulk(
+        self,
+        notifications: Sequence[Dict[str, Any]],
+        commit: bool = True
+    ) -> List[uuid.UUID]:
+        """
+        Create many notifications with multi-row INSERT ... RETURNING
+        
+        Args:
+            notifications: Dicts with the create_notification arguments
+            commit: Commit here; pass False to join the caller's transaction
+        
+        Returns:
+            IDs of the inserted notifications
+        """
+        
+        if not notifications:
+            return []
+        
+        created_at = datetime.utcnow()
+        rows = [
+            {
+                'id': uuid.uuid4(),
+                'user_id': notification['user_id'],
+                'type': notification['notification_type'],
+                'title': notification['title'],
+                'message': notification['message'],
+                'related_job_id': notification.get('related_job_id'),
+                'related_application_id': notification.get('related_application_id'),
+                'related_user_id': notification.get('related_user_id'),
+                'action_url': notification.get('action_url'),
+                'is_read': False,
+                'is_archived': False,
+                'created_at': created_at
+            }
+            for notification in notifications
+        ]
+        
+        # SQLAlchemy batches executemany inserts into multi-row VALUES statements
+        ids = self.db.execute(insert(Notification).returning(Notification.id), rows).scalars().all()
+        self.counters.add('notifications', Counter(row['user_id'] for row in rows))
+        
+        # Pushed to connected clients once the rows are committed
+        publish_on_commit(self.db, [
+            (row['user_id'], 'notification', self._event_data(row))
+            for row in rows if notification_hub.is_listening(row['user_id'])
+        ])
+        if commit:
+            self.db.commit()
+        
+        return list(ids)
+    
+    def _event_data(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Notification.to_dict() shape for a bulk-inserted row"""
+        return {
+            'id': str(row['id']),
+            'user_id': str(row['user_id']),
+            'type': row['type'].value,
+            'title': row['title'],
+            'message': row['message'],
+            'related_job_id': str(row['related_job_id']) if row['related_job_id'] else None,
+            'related_application_id': str(row['related_application_id']) if row['related_application_id'] else None,
+            'related_user_id': str(row['related_user_id']) if row['related_user_id'] else None,
+            'is_read': False,
+            'is_archived': False,
+            'action_url': row['action_url'],
+            'created_at': row['created_at'].isoformat(),
+            'read_at': None
+        }
+    
+    def notify_system_announcement(
+        self,
+        title: str,
+        message: str,
+        user_ids: Optional[Sequence[uuid.UUID]] = None,
+        action_url: Optional[str] = None,
+        batch_size: int = 5000
+    ) -> int:
+        """
+        Send a system announcement to the given users, or to every active user
+        
+        Rows are inserted in batches of batch_size and committed once.
+        
+        Returns:
+            Number of notifications inserted
+        """
+        
+        if user_ids is None:
+            user_ids = [
+                user_id for (user_id,) in self.db.query(User.id).filter(
+                    func.lower(User.is_active).notin_(['false', '0', 'none', ''])
+                ).all()
+            ]
+        
+        created = 0
+        for i in range(0, len(user_ids), batch_size):
+            created += len(self.create_notifications_bulk([
+                {
+                    'user_id': user_id,
+                    'notification_type': NotificationType.SYSTEM_ANNOUNCEMENT,
+                    'title': title,
+                    'message': message,
+                    'action_url': action_url
+                }
+                for user_id in user_ids[i:i + batch_size]
+            ], commit=False))
+        
+        self.db.commit()
+        return created
+    
     def get_user_notifications(
         self,
         user_id: uuid.UUID,
@@ -78,8 +199,16 @@ class NotificationService:
         ).first()
         
         if notification:
-            notification.is_read = True
-            notification.read_at = datetime.utcnow()
+            # Conditional, so concurrent calls decrement the counter once
+            updated = self.db.query(Notification).filter(
+                Notification.id == notification_id,
+                Notification.is_read == False
+            ).update({
+                'is_read': True,
+                'read_at': datetime.utcnow()
+            }, synchronize_session='fetch')
+            if updated and not notification.is_archived:
+                self.counters.add('notifications', {notification.user_id: -1})
             self.db.commit()
             return True
         
@@ -96,6 +225,7 @@ class NotificationService:
             'read_at': datetime.utcnow()
         })
         
+        self.counters.reset('notifications', user_id)
         self.db.commit()
         return count
     
@@ -107,7 +237,12 @@ class NotificationService:
         ).first()
         
         if notification:
-            notification.is_archived = True
+            updated = self.db.query(Notification).filter(
+                Notification.id == notification_id,
+                Notification.is_archived == False
+            ).update({'is_archived': True}, synchronize_session='fetch')
+            if updated and not notification.is_read:
+                self.counters.add('notifications', {notification.user_id: -1})
             self.db.commit()
             return True
         
@@ -121,6 +256,8 @@ class NotificationService:
         ).first()
         
         if notification:
+            if not notification.is_read and not notification.is_archived:
+                self.counters.add('notifications', {notification.user_id: -1})
             self.db.delete(notification)
             self.db.commit()
             return True
@@ -128,17 +265,12 @@ class NotificationService:
         return False
     
     def get_unread_count(self, user_id: uuid.UUID) -> int:
-        """Get count of unread notifications"""
-        
-        count = self.db.query(Notification).filter(
-            Notification.user_id == user_id,
-            Notification.is_read == False,
-            Notification.is_archived == False
-        ).count()
+        """Get count of unread notifications (from the maintained counter)"""
         
-        return count
+        return self.counters.get_counts(user_id)['notifications']
     
-    # Specific notification creators
+    # Specific notification creators; single notifications are queued on the
+    # buffered writer, which deduplicates them and inserts them in bulk
     
     def notify_application_received(
         self,
@@ -150,7 +282,7 @@ class NotificationService:
     ):
         """Notify employer of new application"""
         
-        return self.create_notification(
+        return notification_writer.submit(
             user_id=employer_id,
             notification_type=NotificationType.APPLICATION_RECEIVED,
             title="New Application Received",
@@ -181,7 +313,7 @@ class NotificationService:
         
         message = status_messages.get(new_status, 'Your application status has been updated')
         
-        return self.create_notification(
+        return notification_writer.submit(
             user_id=candidate_id,
             notification_type=NotificationType.APPLICATION_STATUS_CHANGED,
             title=f"Application Status Update: {job_title}",
@@ -201,15 +333,130 @@ class NotificationService:
     ):
         """Notify candidate of new job match"""
         
-        return self.create_notification(
+        return notification_writer.submit(
             user_id=candidate_id,
             notification_type=NotificationType.NEW_JOB_MATCH,
-            title="New Job Match Found!",
-            message=f"We found a {match_score}% match: {job_title} at {company_name}",
             related_job_id=job_id,
-            action_url=f"/jobs/{job_id}"
+            **self._new_job_match_content(job_title, company_name, match_score, job_id)
         )
     
+    def notify_new_job_matches(
+        self,
+        matches: Sequence[Tuple[uuid.UUID, float]],
+        job_title: str,
+        company_name: str,
+        job_id: uuid.UUID
+    ) -> int:
+        """
+        Bulk-notify candidates of a new job match
+        
+        Users who turned off app_new_job_match, or who were already notified
+        about this job, are skipped. Users without a preferences row get the
+        default (enabled).
+        
+        Args:
+            matches: (user_id, match_score) pairs
+        
+        Returns:
+            Number of notifications inserted
+        """
+        
+        if not matches:
+            return 0
+        
+        user_ids = [user_id for user_id, _ in matches]
+        
+        opted_out = {
+            user_id for user_id, preferences in self.get_preferences_for_users(user_ids).items()
+            if not preferences.app_new_job_match
+        }
+        already_notified = {
+            user_id for (user_id,) in self.db.query(Notification.user_id).filter(
+                Notification.user_id.in_(user_ids),
+                Notification.type == NotificationType.NEW_JOB_MATCH,
+                Notification.related_job_id == job_id
+            ).all()
+        }
+        
+        return len(self.create_notifications_bulk([
+            {
+                'user_id': user_id,
+                'notification_type': NotificationType.NEW_JOB_MATCH,
+                'related_job_id': job_id,
+                **self._new_job_match_content(job_title, company_name, match_score, job_id)
+            }
+            for user_id, match_score in matches
+            if user_id not in opted_out and user_id not in already_notified
+        ]))
+    
+    def notify_saved_search_alerts(
+        self,
+        alerts: Sequence[Dict[str, Any]],
+        commit: bool = True
+    ) -> int:
+        """
+        Bulk-notify users of new jobs matching their saved searches
+        
+        Users who turned off app_new_job_match are skipped.
+        
+        Args:
+            alerts: Dicts with user_id, saved_search_id, search_name and
+                jobs, a list of (job_id, job_title) newest first
+        
+        Returns:
+            Number of notifications inserted
+        """
+        
+        if not alerts:
+            return 0
+        
+        opted_out = {
+            user_id for user_id, preferences in self.get_preferences_for_users(
+                [alert['user_id'] for alert in alerts]
+            ).items()
+            if not preferences.app_new_job_match
+        }
+        
+        notifications = []
+        for alert in alerts:
+            if alert['user_id'] in opted_out or not alert['jobs']:
+                continue
+            
+            job_id, job_title = alert['jobs'][0]
+            if len(alert['jobs']) == 1:
+                message = f"New job for \"{alert['search_name']}\": {job_title}"
+                action_url = f"/jobs/{job_id}"
+            else:
+                message = (
+                    f"{len(alert['jobs'])} new jobs for \"{alert['search_name']}\", "
+                    f"including {job_title}"
+                )
+                action_url = f"/search?saved_search_id={alert['saved_search_id']}"
+            
+            notifications.append({
+                'user_id': alert['user_id'],
+                'notification_type': NotificationType.JOB_POSTED,
+                'title': "New jobs match your saved search",
+                'message': message,
+                'related_job_id': job_id,
+                'action_url': action_url
+            })
+        
+        return len(self.create_notifications_bulk(notifications, commit=commit))
+    
+    def _new_job_match_content(
+        self,
+        job_title: str,
+        company_name: str,
+        match_score: float,
+        job_id: uuid.UUID
+    ) -> Dict[str, str]:
+        return {
+            'title': "New Job Match Found!",
+            'message': f"We found a {match_score}% match: {job_title} at {company_name}",
+            'action_url': f"/jobs/{job_id}"
+        }
+    
     def notify_interview_scheduled(
         self,
         candidate_id: uuid.UUID,
@@ -220,7 +467,7 @@ class NotificationService:
     ):
         """Notify candidate of scheduled interview"""
         
-        return self.create_notification(
+        return notification_writer.submit(
             user_id=candidate_id,
             notification_type=NotificationType.INTERVIEW_SCHEDULED,
             title="Interview Scheduled",
@@ -239,7 +486,7 @@ class NotificationService:
     ):
         """Notify user of new message"""
         
-        return self.create_notification(
+        return notification_writer.submit(
             user_id=recipient_id,
             notification_type=NotificationType.MESSAGE_RECEIVED,
             title=f"New message from {sender_name}",
@@ -256,7 +503,7 @@ class NotificationService:
     ):
         """Notify candidate that their profile was viewed"""
         
-        return self.create_notification(
+        return notification_writer.submit(
             user_id=candidate_id,
             notification_type=NotificationType.PROFILE_VIEWED,
             title="Profile Viewed",
@@ -273,7 +520,7 @@ class NotificationService:
     ):
         """Notify user of team invitation"""
         
-        return self.create_notification(
+        return notification_writer.submit(
             user_id=user_id,
             notification_type=NotificationType.TEAM_INVITATION,
             title="Team Invitation",
@@ -283,30 +530,41 @@ class NotificationService:
     
     # Notification preferences
     
-    def get_user_preferences(self, user_id: uuid.UUID) -> Optional[NotificationPreference]:
-        """Get user notification preferences"""
+    def get_user_preferences(self, user_id: uuid.UUID) -> NotificationPreferences:
+        """Get user notification preferences (the defaults if never changed; nothing is written)"""
         
-        prefs = self.db.query(NotificationPreference).filter(
-            NotificationPreference.user_id == user_id
-        ).first()
+        return preference_cache.get(self.db, user_id)
+    
+    def get_preferences_for_users(
+        self,
+        user_ids: Sequence[uuid.UUID]
+    ) -> Dict[uuid.UUID, NotificationPreferences]:
+        """
+        Get preferences for many users at once, for fan-outs
         
-        if not prefs:
-            # Create default preferences
-            prefs = NotificationPreference(user_id=user_id)
-            self.db.add(prefs)
-            self.db.commit()
-            self.db.refresh(prefs)
+        Served from the preference cache; users not cached are loaded with
+        one query per 10,000.
+        
+        Returns:
+            Preferences keyed by user_id (every requested user is present)
+        """
         
-        return prefs
+        return preference_cache.get_many(self.db, user_ids)
     
     def update_preferences(
         self,
         user_id: uuid.UUID,
-        preferences: Dict[str, bool]
-    ) -> NotificationPreference:
-        """Update user notification preferences"""
+        preferences: Dict[str, Any]
+    ) -> NotificationPreferences:
+        """Update user notification preferences, creating the row on first change"""
         
-        prefs = self.get_user_preferences(user_id)
+        prefs = self.db.query(NotificationPreference).filter(
+            NotificationPreference.user_id == user_id
+        ).first()
+        
+        if not prefs:
+            prefs = NotificationPreference(user_id=user_id)
+            self.db.add(prefs)
         
         for key, value in preferences.items():
             if hasattr(prefs, key):
@@ -314,7 +572,7 @@ class NotificationService:
         
         prefs.updated_at = datetime.utcnow()
         self.db.commit()
-        self.db.refresh(prefs)
+        preference_cache.invalidate(user_id)
         
-        return prefs
+        return NotificationPreferences.from_row(prefs)
 
@@ -0,0 +1,214 @@
+"""
+Notification Writer
+Buffers notifications in process and writes them in bulk, so request paths
+that emit notifications do not pay a transaction each.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Set
+from sqlalchemy.orm import Session
+import hashlib
+import logging
+import threading
+import time
+import uuid
+
+from core.cache import LRUCache
+from core.config import settings
+from db.session import SessionLocal
+from models.notification import NotificationType
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationWriter:
+    """
+    Buffered, deduplicating notification writer
+
+    submit() only appends to a buffer. A background thread writes the buffer
+    with one multi-row insert every flush_interval_ms, or as soon as max_rows
+    are waiting. A notification with the same (user, type, related ids) and
+    the same title and message as one still buffered, or written within
+    dedup_window_seconds, is dropped. Keys are remembered only once their
+    batch is written.
+
+    A batch whose insert fails goes back to the front of the buffer and is
+    retried on the next flush, up to max_attempts writes; after that its rows
+    are counted as failed and dropped.
+    """
+
+    def __init__(
+        self,
+        flush_interval_ms: int = settings.NOTIFICATION_WRITER_FLUSH_MS,
+        max_rows: int = settings.NOTIFICATION_WRITER_MAX_ROWS,
+        dedup_window_seconds: int = settings.NOTIFICATION_DEDUP_WINDOW_SECONDS,
+        max_attempts: int = settings.NOTIFICATION_WRITER_MAX_ATTEMPTS,
+        session_factory: Callable[[], Session] = SessionLocal
+    ):
+        self.flush_interval_ms = flush_interval_ms
+        self.max_rows = max_rows
+        self.max_attempts = max_attempts
+        self.session_factory = session_factory
+        self._seen = LRUCache(settings.NOTIFICATION_DEDUP_MAX_ENTRIES, dedup_window_seconds)
+        self._buffer: List[Dict[str, Any]] = []
+        self._pending: Set[tuple] = set()  # Keys buffered or being written
+        self._attempts: Dict[tuple, int] = {}  # Failed writes per pending key
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.written = 0
+        self.deduplicated = 0
+        self.retried = 0
+        self.failed = 0
+
+    def submit(
+        self,
+        user_id: uuid.UUID,
+        notification_type: NotificationType,
+        title: str,
+        message: str,
+        related_job_id: Optional[uuid.UUID] = None,
+        related_application_id: Optional[uuid.UUID] = None,
+        related_user_id: Optional[uuid.UUID] = None,
+        action_url: Optional[str] = None
+    ) -> bool:
+        """Queue a notification; returns False if it was a duplicate"""
+        row = {
+            'user_id': user_id,
+            'notification_type': notification_type,
+            'title': title,
+            'message': message,
+            'related_job_id': related_job_id,
+            'related_application_id': related_application_id,
+            'related_user_id': related_user_id,
+            'action_url': action_url
+        }
+        key = self._key(row)
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Notification writer is closed")
+
+            if key in self._pending or self._seen.get(key) is not None:
+                self.deduplicated += 1
+                return False
+            self._pending.add(key)
+
+            self._buffer.append(row)
+            self._ensure_thread()
+            if len(self._buffer) == 1 or len(self._buffer) >= self.max_rows:
+                self._condition.notify()
+
+        return True
+
+    def flush(self) -> int:
+        """Write everything buffered now; returns the number of rows written"""
+        with self._condition:
+            batch, self._buffer = self._buffer, []
+
+        if not batch:
+            return 0
+
+        # Imported here: NotificationService routes its emitters through this writer
+        from services.notification_service import NotificationService
+
+        keys = [self._key(row) for row in batch]
+
+        # One writer at a time keeps batches in submission order
+        with self._flush_lock:
+            db = self.session_factory()
+            try:
+                written = len(NotificationService(db).create_notifications_bulk(batch))
+            except Exception:
+                db.rollback()
+                logger.exception("Failed to write %d buffered notifications", len(batch))
+                self._requeue(batch, keys)
+                return 0
+            finally:
+                db.close()
+
+        with self._condition:
+            for key in keys:
+                self._seen.set(key, True)
+                self._attempts.pop(key, None)
+            self._pending.difference_update(keys)
+            self.written += written
+        return written
+
+    def close(self):
+        """Flush remaining notifications and stop the background thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+            thread = self._thread
+
+        if thread is not None:
+            thread.join()
+
+        # Failed rows are re-queued until they run out of attempts
+        while self._buffer:
+            self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'buffered': len(self._buffer),
+            'written': self.written,
+            'deduplicated': self.deduplicated,
+            'retried': self.retried,
+            'failed': self.failed
+        }
+
+    def _key(self, row: Dict[str, Any]) -> tuple:
+        # The content digest keeps distinct notifications about the same
+        # entities apart (a second status change, a second message)
+        content = hashlib.sha1(f"{row['title']}\0{row['message']}".encode()).hexdigest()
+        return (
+            row['user_id'], row['notification_type'], row['related_job_id'],
+            row['related_application_id'], row['related_user_id'], content
+        )
+
+    def _requeue(self, batch: List[Dict[str, Any]], keys: List[tuple]):
+        """Put a failed batch back in front of the buffer, dropping rows out of attempts"""
+        retry = []
+        with self._condition:
+            for row, key in zip(batch, keys):
+                attempts = self._attempts.get(key, 0) + 1
+                if attempts < self.max_attempts:
+                    self._attempts[key] = attempts
+                    retry.append(row)
+                else:
+                    self._attempts.pop(key, None)
+                    self._pending.discard(key)
+                    self.failed += 1
+            self._buffer[:0] = retry
+            self.retried += len(retry)
+
+    def _ensure_thread(self):
+        # Called with the condition held
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="notification-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        interval = self.flush_interval_ms / 1000
+        while True:
+            with self._condition:
+                while not self._closed and not self._buffer:
+                    self._condition.wait()
+
+                # The first buffered notification waits at most one interval
+                deadline = time.monotonic() + interval
+                while not self._closed and len(self._buffer) < self.max_rows:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                closed = self._closed
+
+            if closed:
+                return
+            self.flush()
+
+
+# Shared per-process writer
+notification_writer = NotificationWriter()
@@ -0,0 +1,221 @@
+"""
+Notification Preference Cache
+Caches users' notification preferences, in process and optionally in Redis,
+with bulk lookups for fan-outs. Users who never changed a preference have no
+row; they get the defaults, which are not written until the user changes one.
+"""
+
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, Iterable, Optional, Tuple
+from sqlalchemy.orm import Session
+import json
+import threading
+import uuid
+
+from core.cache import LRUCache, get_redis_client
+from core.config import settings
+from models.notification import NotificationPreference
+
+
+@dataclass(frozen=True)
+class NotificationPreferences:
+    """Immutable view of a user's notification preferences"""
+    email_application_received: bool = True
+    email_application_status: bool = True
+    email_new_job_match: bool = True
+    email_interview_scheduled: bool = True
+    email_message_received: bool = True
+    app_application_received: bool = True
+    app_application_status: bool = True
+    app_new_job_match: bool = True
+    app_interview_scheduled: bool = True
+    app_message_received: bool = True
+    email_digest_frequency: Optional[str] = None
+    # False once the user has a stored preferences row
+    is_default: bool = True
+
+    @classmethod
+    def from_row(cls, row: NotificationPreference) -> "NotificationPreferences":
+        # A NULL column means the default
+        values = {
+            field.name: getattr(row, field.name) if getattr(row, field.name) is not None else field.default
+            for field in fields(cls) if field.name != 'is_default'
+        }
+        return cls(**values, is_default=False)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, raw: Any) -> "NotificationPreferences":
+        return cls(**json.loads(raw))
+
+
+DEFAULT_PREFERENCES = NotificationPreferences()
+
+PREFERENCE_FIELDS = tuple(field.name for field in fields(NotificationPreferences) if field.name != 'is_default')
+
+
+class PreferenceCache:
+    """
+    user_id -> NotificationPreferences: in-process LRU in front of optional Redis
+
+    Users without a row are cached as the defaults too, so repeated
+    fan-outs to the same users do not query at all. Local entries live for
+    at most ttl_seconds, which bounds how long another worker can serve
+    preferences after they changed; Redis entries are deleted on change.
+
+    A load that races with a change must not cache what it read before the
+    change. Locally, users invalidated while a load ran are not written
+    back. In Redis, each user has a generation counter that invalidate()
+    increments; entries carry the generation they were loaded under and are
+    ignored once it is out of date.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.PREFERENCE_CACHE_MAX_ENTRIES,
+        ttl_seconds: int = settings.PREFERENCE_CACHE_TTL_SECONDS,
+        use_redis: bool = settings.PREFERENCE_CACHE_USE_REDIS,
+        batch_size: int = 10000
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.use_redis = use_redis
+        self.batch_size = batch_size
+        self._memory = LRUCache(max_entries, ttl_seconds)
+        self._lock = threading.Lock()
+        self._invalidations = 0
+        # user_id -> value of _invalidations when the user was last invalidated
+        self._invalidated = LRUCache(max_entries, ttl_seconds)
+
+    def get(self, db: Session, user_id: uuid.UUID) -> NotificationPreferences:
+        """Preferences for one user"""
+        return self.get_many(db, [user_id])[user_id]
+
+    def get_many(self, db: Session, user_ids: Iterable[uuid.UUID]) -> Dict[uuid.UUID, NotificationPreferences]:
+        """
+        Preferences for many users: local hits, then one Redis MGET, then
+        one query per batch_size users for the rest
+        """
+        result: Dict[uuid.UUID, NotificationPreferences] = {}
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            preferences = self._memory.get(user_id)
+            if preferences is None:
+                missing.append(user_id)
+            else:
+                result[user_id] = preferences
+
+        if not missing:
+            return result
+
+        with self._lock:
+            started = self._invalidations
+
+        fetched: Dict[uuid.UUID, NotificationPreferences] = {}
+        missing, generations = self._get_from_redis(missing, fetched)
+
+        if missing:
+            loaded = {user_id: DEFAULT_PREFERENCES for user_id in missing}
+            for i in range(0, len(missing), self.batch_size):
+                for row in db.query(NotificationPreference).filter(
+                    NotificationPreference.user_id.in_(missing[i:i + self.batch_size])
+                ).all():
+                    loaded[row.user_id] = NotificationPreferences.from_row(row)
+
+            self._set_in_redis(loaded, generations)
+            fetched.update(loaded)
+
+        with self._lock:
+            for user_id, preferences in fetched.items():
+                if (self._invalidated.get(user_id) or 0) <= started:
+                    self._memory.set(user_id, preferences)
+
+        result.update(fetched)
+        return result
+
+    def invalidate(self, user_id: uuid.UUID):
+        """Drop a user's cached preferences; call after they change"""
+        with self._lock:
+            self._invalidations += 1
+            self._invalidated.set(user_id, self._invalidations)
+            self._memory.delete(user_id)
+
+        redis_client = get_redis_client() if self.use_redis else None
+        if redis_client is not None:
+            try:
+                pipeline = redis_client.pipeline(transaction=False)
+                pipeline.incr(f"notification_prefs_gen:{user_id}")
+                # Outlives any entry written under an older generation
+                pipeline.expire(
+                    f"notification_prefs_gen:{user_id}", 2 * settings.PREFERENCE_CACHE_REDIS_TTL_SECONDS
+                )
+                pipeline.delete(f"notification_prefs:{user_id}")
+                pipeline.execute()
+            except Exception:
+                pass
+
+    def clear(self):
+        """Drop all in-process entries"""
+        self._memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters"""
+        return self._memory.stats()
+
+    def _get_from_redis(self, user_ids, result) -> Tuple[list, Dict[uuid.UUID, int]]:
+        """
+        Fill `result` from Redis entries of the current generation
+
+        Returns:
+            (user ids still missing, current generation per user id; empty
+            when Redis is unavailable)
+        """
+        redis_client = get_redis_client() if self.use_redis else None
+        if redis_client is None:
+            return user_ids, {}
+
+        try:
+            values = redis_client.mget(
+                [f"notification_prefs:{user_id}" for user_id in user_ids]
+                + [f"notification_prefs_gen:{user_id}" for user_id in user_ids]
+            )
+        except Exception:
+            return user_ids, {}
+
+        missing = []
+        generations = {}
+        for user_id, raw, generation in zip(user_ids, values, values[len(user_ids):]):
+            generations[user_id] = int(generation or 0)
+            if raw is not None:
+                stored_generation, _, payload = (raw.decode() if isinstance(raw, bytes) else raw).partition(':')
+                if int(stored_generation) == generations[user_id]:
+                    result[user_id] = NotificationPreferences.from_json(payload)
+                    continue
+            missing.append(user_id)
+        return missing, generations
+
+    def _set_in_redis(
+        self,
+        loaded: Dict[uuid.UUID, NotificationPreferences],
+        generations: Dict[uuid.UUID, int]
+    ):
+        """Store loaded preferences under the generation read before loading them"""
+        redis_client = get_redis_client() if self.use_redis and generations else None
+        if redis_client is None:
+            return
+
+        try:
+            pipeline = redis_client.pipeline(transaction=False)
+            for user_id, preferences in loaded.items():
+                pipeline.setex(
+                    f"notification_prefs:{user_id}", settings.PREFERENCE_CACHE_REDIS_TTL_SECONDS,
+                    f"{generations[user_id]}:{preferences.to_json()}"
+                )
+            pipeline.execute()
+        except Exception:
+            pass
+
+
+# Shared per-process cache
+preference_cache = PreferenceCache()
@@ -0,0 +1,260 @@
+"""
+Saved Search Index
+Percolator-style reverse index: saved job searches are indexed by their
+criteria so each posted job is checked against only the searches that could
+match it.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Set
+from sqlalchemy.orm import Session
+import threading
+import uuid
+
+from models.job import Job
+from models.saved_search import SavedSearch
+from services.text_index import tokenize
+
+
+def _terms(values: Optional[Iterable[str]]) -> List[str]:
+    return sorted({value.strip().lower() for value in values or [] if value and value.strip()})
+
+
+class _Percolator:
+    """Indexed criteria for one saved search"""
+
+    __slots__ = ('search_id', 'user_id', 'name', 'frequency', 'criteria', 'query_terms', 'skills')
+
+    def __init__(self, saved_search: SavedSearch):
+        criteria = saved_search.criteria or {}
+        self.search_id = saved_search.id
+        self.user_id = saved_search.user_id
+        self.name = saved_search.name
+        self.frequency = saved_search.alert_frequency or 'daily'
+        self.criteria = criteria
+        self.query_terms = set(tokenize(criteria.get('query')))
+        self.skills = _terms(criteria.get('skills'))
+
+    def matches(self, job: Dict[str, Any]) -> bool:
+        """Whether the job satisfies every criterion, as search_jobs would filter it"""
+        criteria = self.criteria
+
+        if self.query_terms and not self.query_terms <= job['terms']:
+            return False
+
+        location = (criteria.get('location') or '').strip().lower()
+        if location and location not in job['location']:
+            return False
+
+        for field in ('work_model', 'employment_type', 'experience_level'):
+            allowed = criteria.get(field)
+            if allowed and job[field] not in allowed:
+                return False
+
+        salary_min = criteria.get('salary_min')
+        if salary_min is not None and (job['salary_max'] is None or job['salary_max'] < salary_min):
+            return False
+
+        salary_max = criteria.get('salary_max')
+        if salary_max is not None and (job['salary_min'] is None or job['salary_min'] > salary_max):
+            return False
+
+        for skill in self.skills:
+            if skill not in job['required_skills'] and skill not in job['preferred_skills']:
+                return False
+
+        company_id = criteria.get('company_id')
+        if company_id and str(job['company_id']) != str(company_id):
+            return False
+
+        is_remote = criteria.get('is_remote')
+        if is_remote is not None and (job['work_model'] == 'remote') != bool(is_remote):
+            return False
+
+        return True
+
+
+class SavedSearchIndex:
+    """
+    Reverse index over alert-enabled saved job searches
+
+    Each search is filed under one anchor: a skill, else its location, else
+    its work models, else the unanchored list that every job is checked
+    against. A job only has to be verified against the searches whose anchor
+    it hits. Skill and location anchors use substring matching, mirroring
+    the ilike filters in search_jobs, so lookups scan the distinct anchor
+    terms rather than the searches.
+
+    Built lazily from the database and kept up to date by SearchService.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._searches: Dict[uuid.UUID, _Percolator] = {}
+        self._anchors: Dict[uuid.UUID, tuple] = {}
+        self._by_skill: Dict[str, Set[uuid.UUID]] = {}
+        self._by_location: Dict[str, Set[uuid.UUID]] = {}
+        self._by_work_model: Dict[str, Set[uuid.UUID]] = {}
+        self._unanchored: Set[uuid.UUID] = set()
+
+    @property
+    def is_built(self) -> bool:
+        return self._built
+
+    def ensure_built(self, db: Session):
+        """Build the index from the database if it has not been built yet"""
+        if self._built:
+            return
+
+        with self._lock:
+            if not self._built:
+                self.rebuild(db)
+
+    def rebuild(self, db: Session):
+        """Rebuild the index from all alert-enabled job searches"""
+        with self._lock:
+            searches = db.query(SavedSearch).filter(
+                SavedSearch.search_type == 'jobs',
+                SavedSearch.is_active == True,
+                SavedSearch.is_alert_enabled == True
+            ).all()
+
+            self._searches.clear()
+            self._anchors.clear()
+            self._by_skill.clear()
+            self._by_location.clear()
+            self._by_work_model.clear()
+            self._unanchored.clear()
+
+            for saved_search in searches:
+                self._add(_Percolator(saved_search))
+
+            self._built = True
+
+    def set_search(self, saved_search: SavedSearch):
+        """Index (or re-index) a saved search, dropping it if alerts are off"""
+        with self._lock:
+            if not self._built:
+                return
+
+            self._remove(saved_search.id)
+            if (
+                saved_search.search_type == 'jobs'
+                and saved_search.is_active
+                and saved_search.is_alert_enabled
+            ):
+                self._add(_Percolator(saved_search))
+
+    def remove_search(self, search_id: uuid.UUID):
+        """Drop a saved search from the index"""
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(search_id)
+
+    def percolate(self, job: Dict[str, Any], frequency: Optional[str] = None) -> List[_Percolator]:
+        """Saved searches matching a job (see job_document), optionally for one frequency"""
+        with self._lock:
+            candidate_ids = set(self._unanchored)
+
+            skill_text = job['required_skills'] + ',' + job['preferred_skills']
+            for skill, search_ids in self._by_skill.items():
+                if skill in skill_text:
+                    candidate_ids |= search_ids
+
+            for location, search_ids in self._by_location.items():
+                if location in job['location']:
+                    candidate_ids |= search_ids
+
+            candidate_ids |= self._by_work_model.get(job['work_model'], set())
+
+            percolators = [self._searches[search_id] for search_id in candidate_ids]
+
+        return [
+            percolator for percolator in percolators
+            if (frequency is None or percolator.frequency == frequency) and percolator.matches(job)
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'searches': len(self._searches),
+                'skill_anchors': len(self._by_skill),
+                'location_anchors': len(self._by_location),
+                'work_model_anchors': len(self._by_work_model),
+                'unanchored': len(self._unanchored)
+            }
+
+    def _add(self, percolator: _Percolator):
+        search_id = percolator.search_id
+        self._searches[search_id] = percolator
+
+        location = (percolator.criteria.get('location') or '').strip().lower()
+        work_models = percolator.criteria.get('work_model') or []
+
+        if percolator.skills:
+            # Every skill must match, so any one of them is a sufficient anchor
+            anchor = ('skill', [percolator.skills[0]])
+        elif location:
+            anchor = ('location', [location])
+        elif work_models:
+            anchor = ('work_model', list(work_models))
+        else:
+            anchor = ('none', [])
+
+        self._anchors[search_id] = anchor
+        kind, keys = anchor
+        postings = self._postings(kind)
+        if postings is None:
+            self._unanchored.add(search_id)
+        for key in keys:
+            postings.setdefault(key, set()).add(search_id)
+
+    def _remove(self, search_id: uuid.UUID):
+        self._searches.pop(search_id, None)
+        anchor = self._anchors.pop(search_id, None)
+        if anchor is None:
+            return
+
+        kind, keys = anchor
+        postings = self._postings(kind)
+        if postings is None:
+            self._unanchored.discard(search_id)
+        for key in keys:
+            search_ids = postings.get(key)
+            if search_ids is not None:
+                search_ids.discard(search_id)
+                if not search_ids:
+                    del postings[key]
+
+    def _postings(self, kind: str) -> Optional[Dict[str, Set[uuid.UUID]]]:
+        return {
+            'skill': self._by_skill,
+            'location': self._by_location,
+            'work_model': self._by_work_model
+        }.get(kind)
+
+
+def job_document(job: Job) -> Dict[str, Any]:
+    """Normalized view of a job for percolation"""
+    return {
+        'id': job.id,
+        'title': job.title,
+        'created_at': job.created_at,
+        'company_id': job.company_id,
+        'location': (job.location or '').lower(),
+        'work_model': job.remote_policy,
+        'employment_type': job.job_type,
+        'experience_level': job.experience_level,
+        'salary_min': job.salary_min,
+        'salary_max': job.salary_max,
+        'required_skills': ','.join(job.required_skills or []).lower(),
+        'preferred_skills': ','.join(job.preferred_skills or []).lower(),
+        'terms': set(tokenize(' '.join([
+            job.title or '', ' '.join(job.required_skills or []), job.description or ''
+        ])))
+    }
+
+
+# Shared per-process index
+saved_search_index = SavedSearchIndex()
@@ -0,0 +1,167 @@
+"""
+Saved Search Alert Service
+Sends alerts for saved job searches: instantly when a job is posted, or as
+daily/weekly digests. Jobs are matched through the saved search index.
+"""
+
+from typing import Any, Dict, Optional
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+import logging
+import time
+import uuid
+
+from db.session import SessionLocal
+from models.job import Job
+from models.saved_search import SavedSearch
+from services.notification_service import NotificationService
+from services.saved_search_index import SavedSearchIndex, job_document, saved_search_index
+
+logger = logging.getLogger(__name__)
+
+# Digest windows; a search that never sent an alert looks back one period
+ALERT_PERIODS = {
+    'daily': timedelta(days=1),
+    'weekly': timedelta(days=7)
+}
+
+
+class SavedSearchAlertService:
+    """Service for sending saved-search alerts"""
+
+    def __init__(self, db: Session, index: Optional[SavedSearchIndex] = None):
+        self.db = db
+        self.index = index or saved_search_index
+
+    def process_new_job(self, job_id: uuid.UUID) -> Dict[str, Any]:
+        """
+        Send instant alerts for a newly posted job
+
+        Returns:
+            Dict with matched search and notification counts
+        """
+
+        start = time.perf_counter()
+
+        job = self.db.query(Job).filter(Job.id == job_id).first()
+        if not job or not job.is_active:
+            return {'searches': 0, 'notified': 0, 'elapsed_seconds': 0.0}
+
+        self.index.ensure_built(self.db)
+        document = job_document(job)
+        matches = {
+            percolator.search_id: (percolator, [document])
+            for percolator in self.index.percolate(document, frequency='instant')
+        }
+
+        notified = self._send(matches, datetime.utcnow())
+
+        return {
+            'searches': len(matches),
+            'notified': notified,
+            'elapsed_seconds': round(time.perf_counter() - start, 3)
+        }
+
+    def run_digest(self, frequency: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Send one alert per due saved search for jobs posted since its last alert
+
+        Jobs posted in the window are percolated once each, so the cost is
+        proportional to new jobs times the searches they can match.
+
+        Returns:
+            Dict with job, matched search and notification counts
+        """
+
+        if frequency not in ALERT_PERIODS:
+            raise ValueError(f"Digest frequency must be one of: {', '.join(ALERT_PERIODS)}")
+
+        start = time.perf_counter()
+        now = now or datetime.utcnow()
+        period = ALERT_PERIODS[frequency]
+
+        self.index.ensure_built(self.db)
+
+        # Searches whose last alert is at least one period old
+        due = {
+            search_id: last_alert_sent or now - period
+            for search_id, last_alert_sent in self.db.query(
+                SavedSearch.id, SavedSearch.last_alert_sent
+            ).filter(
+                SavedSearch.search_type == 'jobs',
+                SavedSearch.is_active == True,
+                SavedSearch.is_alert_enabled == True,
+                SavedSearch.alert_frequency == frequency
+            ).all()
+            if last_alert_sent is None or last_alert_sent <= now - period
+        }
+        if not due:
+            return {'jobs': 0, 'searches': 0, 'notified': 0, 'elapsed_seconds': 0.0}
+
+        jobs = self.db.query(Job).filter(
+            Job.is_active.is_(True),
+            Job.created_at > min(due.values()),
+            Job.created_at <= now
+        ).order_by(Job.created_at.desc()).all()
+
+        matches: Dict[uuid.UUID, tuple] = {}
+        for job in jobs:
+            document = job_document(job)
+            for percolator in self.index.percolate(document, frequency=frequency):
+                since = due.get(percolator.search_id)
+                if since is None or document['created_at'] <= since:
+                    continue
+                matches.setdefault(percolator.search_id, (percolator, []))[1].append(document)
+
+        notified = self._send(matches, now)
+
+        return {
+            'jobs': len(jobs),
+            'searches': len(matches),
+            'notified': notified,
+            'elapsed_seconds': round(time.perf_counter() - start, 3)
+        }
+
+    def _send(self, matches: Dict[uuid.UUID, tuple], sent_at: datetime) -> int:
+        """Bulk-insert alert notifications and bulk-update the searches"""
+
+        if not matches:
+            return 0
+
+        alerts = [
+            {
+                'user_id': percolator.user_id,
+                'saved_search_id': percolator.search_id,
+                'search_name': percolator.name,
+                'jobs': [(document['id'], document['title']) for document in documents]
+            }
+            for percolator, documents in matches.values()
+        ]
+
+        notified = NotificationService(self.db).notify_saved_search_alerts(alerts, commit=False)
+
+        self.db.execute(update(SavedSearch), [
+            {
+                'id': alert['saved_search_id'],
+                'last_alert_sent': sent_at,
+                'result_count': f"{len(alert['jobs'])} new job{'s' if len(alert['jobs']) != 1 else ''}"
+            }
+            for alert in alerts
+        ])
+        self.db.commit()
+
+        return notified
+
+
+def run_saved_search_alerts(job_id: uuid.UUID):
+    """Background task entry point for instant alerts; uses its own database session"""
+    db = SessionLocal()
+    try:
+        stats = SavedSearchAlertService(db).process_new_job(job_id)
+        logger.info("Saved search alerts for %s: %s", job_id, stats)
+    except Exception:
+        db.rollback()
+        logger.exception("Saved search alerts failed for %s", job_id)
+    finally:
+        db.close()
@@ -0,0 +1,75 @@
+"""
+Search Result Cache
+Caches job search pages as ID lists keyed by normalized criteria. Job writes
+bump a generation counter, which orphans every cached page at once.
+"""
+
+from typing import Any, Dict, Hashable, Optional
+import threading
+
+from core.cache import LRUCache, get_redis_client
+from core.config import settings
+
+
+class SearchResultCache:
+    """
+    Generation-versioned cache in front of job search
+
+    Entries are stored under (generation, key), so invalidation is a counter
+    increment rather than a scan. With use_redis the generation is shared
+    across workers; the local TTL bounds staleness otherwise.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.SEARCH_RESULT_CACHE_MAX_ENTRIES,
+        ttl_seconds: int = settings.SEARCH_RESULT_CACHE_TTL_SECONDS,
+        use_redis: bool = settings.SEARCH_RESULT_CACHE_USE_REDIS
+    ):
+        self.use_redis = use_redis
+        self._memory = LRUCache(max_entries, ttl_seconds)
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """Current generation; part of every cache key"""
+        redis_client = get_redis_client() if self.use_redis else None
+        if redis_client is not None:
+            try:
+                return int(redis_client.get("search:generation") or 0)
+            except Exception:
+                pass
+        return self._generation
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value for the current generation, or None"""
+        return self._memory.get((self.generation, key))
+
+    def set(self, key: Hashable, value: Any):
+        """Cache a value for the current generation"""
+        self._memory.set((self.generation, key), value)
+
+    def invalidate(self):
+        """Orphan every cached entry; call after any job write"""
+        with self._lock:
+            self._generation += 1
+
+        redis_client = get_redis_client() if self.use_redis else None
+        if redis_client is not None:
+            try:
+                redis_client.incr("search:generation")
+            except Exception:
+                pass
+
+    def clear(self):
+        """Drop all in-process entries"""
+        self._memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and the current generation"""
+        return {**self._memory.stats(), 'generation': self.generation}
+
+
+# Shared per-process cache
+search_result_cache = SearchResultCache()
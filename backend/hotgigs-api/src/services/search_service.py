@@ -3,15 +3,65 @@ Advanced Search Service
 Handles job and candidate search with advanced filtering and saved searches
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
+from sqlalchemy import or_, and_, func, case, cast, literal, select, Float
 from datetime import datetime
+import base64
+import hashlib
+import json
 import uuid
 
+from core.cache import LRUCache
+from core.config import settings
+
 from models.job import Job
 from models.candidate import CandidateProfile, CandidateSkill
 from models.saved_search import SavedSearch
+from services.ai_matching import EXPERIENCE_LEVEL_YEARS, job_work_model
+from services.location_index import location_filter, location_index
+from services.saved_search_index import saved_search_index
+from services.search_cache import search_result_cache
+from services.text_index import job_text_index
+
+
+# Exact counts reused by count="estimate" where EXPLAIN estimates are unavailable
+_count_cache = LRUCache(max_entries=1000, ttl_seconds=settings.SEARCH_COUNT_CACHE_TTL_SECONDS)
+
+# Facet histograms keyed by normalized criteria hash
+_facet_cache = LRUCache(max_entries=5000, ttl_seconds=settings.SEARCH_FACET_CACHE_TTL_SECONDS)
+
+# Salary buckets (lower bound, label) on salary_max
+SALARY_BUCKETS = [
+    (200000, '200000+'),
+    (150000, '150000-200000'),
+    (100000, '100000-150000'),
+    (50000, '50000-100000'),
+    (0, '0-50000'),
+]
+
+JOB_FACETS = ('work_model', 'employment_type', 'experience_level', 'salary', 'location')
+
+# Column behind each facet, built only for the facets requested
+JOB_FACET_EXPRESSIONS = {
+    'work_model': lambda: Job.remote_policy,
+    'employment_type': lambda: Job.job_type,
+    'experience_level': lambda: Job.experience_level,
+    'salary': lambda: case(
+        *[(Job.salary_max >= lower, label) for lower, label in SALARY_BUCKETS],
+        else_=None
+    ),
+    'location': lambda: Job.location
+}
+
+# Location facets can have many values; only the most common are returned
+MAX_FACET_VALUES = 20
+
+# posted_within_days is snapped up to one of these windows
+POSTED_WITHIN_DAYS_BUCKETS = (1, 3, 7, 14, 30, 60, 90)
+
+# Criteria matched case-insensitively (ilike / full-text), so safe to lowercase
+CASE_INSENSITIVE_CRITERIA = frozenset({'query', 'location', 'skills'})
 
 
 class SearchService:
@@ -36,38 +86,73 @@ class SearchService:
         sort_by: str = "created_at",
         sort_order: str = "desc",
         page: int = 1,
-        page_size: int = 20
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        count: str = "exact",
+        facets: Optional[List[str]] = None
     ) -> Dict[str, Any]:
         """
         Advanced job search with multiple filters
         
+        The text query uses the jobs full-text index (PostgreSQL tsvector, or
+        the in-memory BM25 index elsewhere); sort_by="relevance" orders by
+        its rank.
+        
+        Pass the previous response's next_cursor as `cursor` for constant-time
+        deep pagination; `page` remains as an OFFSET-based compatibility mode.
+        `count` is "exact", "estimate" or "none".
+        
+        `facets` names histograms (see JOB_FACETS) to compute for the filtered
+        jobs; they are returned under "facets".
+        
+        Result pages are cached as job ID lists keyed by the normalized
+        criteria until the TTL passes or a job is written. posted_within_days
+        is rounded up to a standard window (see POSTED_WITHIN_DAYS_BUCKETS).
+        
         Returns:
             Dict with jobs list, total count, and pagination info
         """
         
+        if posted_within_days:
+            posted_within_days = self._bucket_days(posted_within_days)
+        
+        criteria_key = self._criteria_key(self._normalize_job_criteria(
+            query=query, location=location, work_model=work_model,
+            employment_type=employment_type, experience_level=experience_level,
+            salary_min=salary_min, salary_max=salary_max, skills=skills,
+            posted_within_days=posted_within_days, company_id=company_id,
+            is_remote=is_remote
+        ))
+        cache_key = (
+            criteria_key, sort_by, sort_order, None if cursor else page, page_size,
+            cursor, count, tuple(sorted(set(facets or [])))
+        )
+        
+        cached = search_result_cache.get(cache_key)
+        if cached is not None:
+            return self._hydrate_jobs(cached)
+        
         # Base query
         query_obj = self.db.query(Job).filter(Job.is_active == True)
         
-        # Text search (title, description, required_skills)
+        # Text search (title, required_skills, description)
+        relevance = None
         if query:
-            search_filter = or_(
-                Job.title.ilike(f"%{query}%"),
-                Job.description.ilike(f"%{query}%"),
-                func.array_to_string(Job.required_skills, ',').ilike(f"%{query}%")
-            )
-            query_obj = query_obj.filter(search_filter)
+            query_obj, relevance = self._apply_text_search(query_obj, query)
         
-        # Location filter
+        # Location filter (trigram match on the normalized location)
         if location:
-            query_obj = query_obj.filter(Job.location.ilike(f"%{location}%"))
+            query_obj = query_obj.filter(self._location_filter(Job.location_normalized, location))
         
-        # Work model filter
+        # Work model filter (remote_policy is stored as remote, hybrid or onsite)
         if work_model:
-            query_obj = query_obj.filter(Job.work_model.in_(work_model))
+            query_obj = query_obj.filter(Job.remote_policy.in_(
+                [value.lower().replace('-', '') for value in work_model]
+            ))
         
         # Employment type filter
         if employment_type:
-            query_obj = query_obj.filter(Job.employment_type.in_(employment_type))
+            query_obj = query_obj.filter(Job.job_type.in_(employment_type))
         
         # Experience level filter
         if experience_level:
@@ -103,12 +188,14 @@ class SearchService:
         # Remote filter
         if is_remote is not None:
             if is_remote:
-                query_obj = query_obj.filter(Job.work_model == 'remote')
+                query_obj = query_obj.filter(Job.remote_policy == 'remote')
             else:
-                query_obj = query_obj.filter(Job.work_model != 'remote')
+                query_obj = query_obj.filter(or_(Job.remote_policy.is_(None), Job.remote_policy != 'remote'))
         
-        # Get total count before pagination
-        total_count = query_obj.count()
+        # Facet counts for the filtered jobs
+        facet_counts = None
+        if facets:
+            facet_counts = self._job_facets(query_obj, facets, criteria_key)
         
         # Sorting
         if sort_by == "created_at":
@@ -117,25 +204,186 @@ class SearchService:
             order_col = Job.salary_max
         elif sort_by == "title":
             order_col = Job.title
+        elif sort_by == "relevance" and relevance is not None:
+            order_col = relevance
         else:
             order_col = Job.created_at
         
-        if sort_order == "desc":
-            query_obj = query_obj.order_by(order_col.desc())
+        result = self._paginate(
+            query_obj, 'jobs', order_col, Job.id, sort_by, sort_order,
+            page, page_size, cursor, count
+        )
+        
+        if facet_counts is not None:
+            result['facets'] = facet_counts
+        
+        # Cache IDs only; ORM objects are bound to this session
+        cached = {key: value for key, value in result.items() if key != 'jobs'}
+        cached['job_ids'] = [job.id for job in result['jobs']]
+        search_result_cache.set(cache_key, cached)
+        
+        return result
+    
+    def _hydrate_jobs(self, cached: Dict[str, Any]) -> Dict[str, Any]:
+        """Rebuild a cached search page, loading its jobs in cached order"""
+        
+        job_ids = cached['job_ids']
+        jobs_by_id = {}
+        if job_ids:
+            jobs_by_id = {job.id: job for job in self.db.query(Job).filter(Job.id.in_(job_ids))}
+        
+        result = {key: value for key, value in cached.items() if key != 'job_ids'}
+        result['jobs'] = [jobs_by_id[job_id] for job_id in job_ids if job_id in jobs_by_id]
+        return result
+    
+    def _bucket_days(self, days: int) -> int:
+        """Smallest standard window covering `days`"""
+        
+        for bucket in POSTED_WITHIN_DAYS_BUCKETS:
+            if days <= bucket:
+                return bucket
+        return days
+    
+    def _job_facets(
+        self,
+        query_obj,
+        facets: List[str],
+        criteria_key: str
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Histograms for the requested facets over a filtered job query
+        
+        All facets come from one grouped query (GROUPING SETS on PostgreSQL;
+        a single scan counted in Python elsewhere) and are cached per
+        normalized criteria.
+        
+        Returns:
+            Dict of facet name -> [{'value', 'count'}], most common first
+        """
+        
+        unknown = set(facets) - set(JOB_FACETS)
+        if unknown:
+            raise ValueError(f"Unknown facets: {', '.join(sorted(unknown))}")
+        
+        names = [name for name in JOB_FACETS if name in facets]
+        cache_key = (search_result_cache.generation, criteria_key, tuple(names))
+        
+        cached = _facet_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        expressions = {name: JOB_FACET_EXPRESSIONS[name]() for name in names}
+        
+        counts: Dict[str, Dict[Any, int]] = {name: {} for name in names}
+        
+        if self.db.get_bind().dialect.name == "postgresql":
+            values = query_obj.with_entities(
+                *[expressions[name].label(name) for name in names]
+            ).subquery()
+            columns = [values.c[name] for name in names]
+            
+            stmt = select(
+                *columns,
+                *[func.grouping(column) for column in columns],
+                func.count()
+            ).group_by(func.grouping_sets(*columns))
+            
+            for row in self.db.execute(stmt):
+                row_values = row[:len(names)]
+                grouping = row[len(names):2 * len(names)]
+                for name, value, grouped_out in zip(names, row_values, grouping):
+                    if not grouped_out and value is not None:
+                        counts[name][value] = row[-1]
         else:
-            query_obj = query_obj.order_by(order_col.asc())
+            for row in query_obj.with_entities(*[expressions[name] for name in names]):
+                for name, value in zip(names, row):
+                    if value is not None:
+                        counts[name][value] = counts[name].get(value, 0) + 1
+        
+        # Report work models the way the job routes do (onsite -> on-site)
+        if 'work_model' in counts:
+            work_models: Dict[Any, int] = {}
+            for value, total in counts['work_model'].items():
+                value = job_work_model(value)
+                work_models[value] = work_models.get(value, 0) + total
+            counts['work_model'] = work_models
+        
+        result = {}
+        for name in names:
+            buckets = sorted(counts[name].items(), key=lambda item: (-item[1], str(item[0])))
+            if name == 'location':
+                buckets = buckets[:MAX_FACET_VALUES]
+            result[name] = [{'value': value, 'count': total} for value, total in buckets]
+        
+        _facet_cache.set(cache_key, result)
+        return result
+    
+    def _normalize_job_criteria(self, **criteria) -> Dict[str, Any]:
+        """
+        Canonical form of job search filters
         
-        # Pagination
-        offset = (page - 1) * page_size
-        jobs = query_obj.offset(offset).limit(page_size).all()
+        Whitespace is collapsed, case-insensitive terms are lowercased, lists
+        are deduplicated and sorted, and empty values are dropped, so
+        equivalent searches share a key.
+        """
         
-        return {
-            'jobs': jobs,
-            'total': total_count,
-            'page': page,
-            'page_size': page_size,
-            'total_pages': (total_count + page_size - 1) // page_size
-        }
+        def normalize_term(name: str, term: Any) -> str:
+            term = ' '.join(str(term).split())
+            return term.lower() if name in CASE_INSENSITIVE_CRITERIA else term
+        
+        normalized = {}
+        for name, value in criteria.items():
+            if value is None or value == [] or value == '':
+                continue
+            if isinstance(value, str):
+                value = normalize_term(name, value)
+            elif isinstance(value, (list, tuple, set)):
+                value = sorted({normalize_term(name, item) for item in value})
+            elif isinstance(value, uuid.UUID):
+                value = str(value)
+            normalized[name] = value
+        
+        return normalized
+    
+    def _criteria_key(self, normalized: Dict[str, Any]) -> str:
+        """Stable hash of normalized criteria"""
+        
+        payload = json.dumps(normalized, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    
+    def _location_filter(self, normalized_column, location: str):
+        """Fuzzy location filter; uses pg_trgm or the in-memory location index"""
+        
+        dialect_name = self.db.get_bind().dialect.name
+        if dialect_name != "postgresql":
+            location_index.ensure_built(self.db)
+        
+        return location_filter(normalized_column, location, dialect_name)
+    
+    def _apply_text_search(self, query_obj, query: str):
+        """
+        Filter jobs by a full-text query
+        
+        Returns:
+            (filtered query, relevance expression for ordering)
+        """
+        
+        if self.db.get_bind().dialect.name == "postgresql":
+            ts_query = func.websearch_to_tsquery('english', query)
+            query_obj = query_obj.filter(Job.search_vector.op('@@')(ts_query))
+            # ts_rank returns real; as float8 it round-trips exactly through a
+            # cursor, whose value is bound as float8 in the keyset predicate
+            return query_obj, cast(func.ts_rank(Job.search_vector, ts_query), Float(precision=53))
+        
+        # Fallback: in-memory BM25 index
+        job_text_index.ensure_built(self.db)
+        scores = dict(job_text_index.search(query))
+        query_obj = query_obj.filter(Job.id.in_(list(scores)))
+        
+        if not scores:
+            return query_obj, literal(0.0)
+        
+        return query_obj, case(scores, value=Job.id, else_=0.0)
     
     def search_candidates(
         self,
@@ -150,11 +398,15 @@ class SearchService:
         sort_by: str = "updated_at",
         sort_order: str = "desc",
         page: int = 1,
-        page_size: int = 20
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        count: str = "exact"
     ) -> Dict[str, Any]:
         """
         Advanced candidate search with multiple filters
         
+        Supports the same cursor and count options as search_jobs.
+        
         Returns:
             Dict with candidates list, total count, and pagination info
         """
@@ -164,21 +416,23 @@ class SearchService:
             CandidateProfile.is_active == True
         )
         
-        # Text search (headline, bio, skills)
+        # Text search (title, bio, skills)
         if query:
             search_filter = or_(
-                CandidateProfile.headline.ilike(f"%{query}%"),
+                CandidateProfile.title.ilike(f"%{query}%"),
                 CandidateProfile.bio.ilike(f"%{query}%")
             )
             query_obj = query_obj.filter(search_filter)
         
-        # Location filter
+        # Location filter (trigram match on the normalized location)
         if location:
-            query_obj = query_obj.filter(CandidateProfile.location.ilike(f"%{location}%"))
+            query_obj = query_obj.filter(
+                self._location_filter(CandidateProfile.location_normalized, location)
+            )
         
         # Experience level filter
         if experience_level:
-            query_obj = query_obj.filter(CandidateProfile.experience_level.in_(experience_level))
+            query_obj = query_obj.filter(self._experience_level_filter(experience_level))
         
         # Years of experience filter
         if years_of_experience_min is not None:
@@ -196,10 +450,7 @@ class SearchService:
         
         # Availability filter
         if availability:
-            query_obj = query_obj.filter(CandidateProfile.availability == availability)
-        
-        # Get total count before pagination
-        total_count = query_obj.count()
+            query_obj = query_obj.filter(CandidateProfile.looking_for_job.is_(availability == "available"))
         
         # Sorting
         if sort_by == "updated_at":
@@ -207,27 +458,178 @@ class SearchService:
         elif sort_by == "experience":
             order_col = CandidateProfile.years_of_experience
         elif sort_by == "headline":
-            order_col = CandidateProfile.headline
+            order_col = CandidateProfile.title
         else:
             order_col = CandidateProfile.updated_at
         
-        if sort_order == "desc":
-            query_obj = query_obj.order_by(order_col.desc())
+        return self._paginate(
+            query_obj, 'candidates', order_col, CandidateProfile.id, sort_by, sort_order,
+            page, page_size, cursor, count
+        )
+    
+    def _experience_level_filter(self, levels: List[str]):
+        """Candidates whose years of experience fall in any of the levels' ranges"""
+        
+        conditions = []
+        upper = None
+        for level, min_years in EXPERIENCE_LEVEL_YEARS:
+            if level in levels:
+                years = func.coalesce(CandidateProfile.years_of_experience, 0)
+                condition = years >= min_years
+                if upper is not None:
+                    condition = and_(condition, years < upper)
+                conditions.append(condition)
+            upper = min_years
+        
+        return or_(*conditions) if conditions else literal(False)
+    
+    # Pagination helpers
+    
+    def _paginate(
+        self,
+        query_obj,
+        result_key: str,
+        order_col,
+        id_col,
+        sort_by: str,
+        sort_order: str,
+        page: int,
+        page_size: int,
+        cursor: Optional[str],
+        count: str
+    ) -> Dict[str, Any]:
+        """
+        Count, order and paginate a search query
+        
+        Rows are ordered by (sort key, id). With a cursor, the next page starts
+        after the cursor's (sort key, id) via a keyset predicate, so its cost
+        does not depend on depth; otherwise `page` is applied with OFFSET.
+        NULL sort keys are ordered as the largest values on every database.
+        
+        Raises:
+            ValueError: If the cursor is malformed or from a different sort
+        """
+        
+        descending = sort_order == "desc"
+        signature = f"{result_key}:{sort_by}:{'desc' if descending else 'asc'}"
+        
+        # Get total count before pagination
+        total_count = self._count(query_obj, count)
+        
+        if descending:
+            query_obj = query_obj.order_by(order_col.desc().nulls_first(), id_col.desc())
         else:
-            query_obj = query_obj.order_by(order_col.asc())
+            query_obj = query_obj.order_by(order_col.asc().nulls_last(), id_col.asc())
+        
+        if cursor:
+            value, last_id = self._decode_cursor(cursor, signature)
+            query_obj = query_obj.filter(
+                self._keyset_filter(order_col, id_col, value, last_id, descending)
+            )
+        elif page > 1:
+            query_obj = query_obj.offset((page - 1) * page_size)
         
-        # Pagination
-        offset = (page - 1) * page_size
-        candidates = query_obj.offset(offset).limit(page_size).all()
+        # One extra row tells whether another page exists
+        rows = query_obj.add_columns(order_col).limit(page_size + 1).all()
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        
+        items = [row[0] for row in rows]
+        next_cursor = self._encode_cursor(signature, rows[-1][1], items[-1].id) if has_more else None
         
         return {
-            'candidates': candidates,
+            result_key: items,
             'total': total_count,
-            'page': page,
+            'total_is_estimate': count == "estimate",
+            'page': None if cursor else page,
             'page_size': page_size,
-            'total_pages': (total_count + page_size - 1) // page_size
+            'total_pages': (total_count + page_size - 1) // page_size if total_count is not None else None,
+            'next_cursor': next_cursor
         }
     
+    def _keyset_filter(self, order_col, id_col, value, last_id: uuid.UUID, descending: bool):
+        """Rows strictly after (value, last_id) in (sort key, id) order, NULLs largest"""
+        
+        if descending:
+            if value is None:
+                return or_(and_(order_col.is_(None), id_col < last_id), order_col.isnot(None))
+            return or_(order_col < value, and_(order_col == value, id_col < last_id))
+        
+        if value is None:
+            return and_(order_col.is_(None), id_col > last_id)
+        return or_(
+            order_col > value,
+            and_(order_col == value, id_col > last_id),
+            order_col.is_(None)
+        )
+    
+    def _encode_cursor(self, signature: str, value: Any, last_id: uuid.UUID) -> str:
+        """Opaque cursor for the row (value, last_id)"""
+        
+        if isinstance(value, datetime):
+            encoded_value = {'dt': value.isoformat()}
+        elif value is None or isinstance(value, (str, int, float, bool)):
+            encoded_value = value
+        else:
+            encoded_value = float(value)
+        
+        payload = json.dumps([signature, encoded_value, str(last_id)], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+    
+    def _decode_cursor(self, cursor: str, signature: str) -> Tuple[Any, uuid.UUID]:
+        """(value, last_id) from a cursor produced by _encode_cursor"""
+        
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            cursor_signature, value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+            if isinstance(value, dict):
+                value = datetime.fromisoformat(value['dt'])
+            last_id = uuid.UUID(last_id)
+        except Exception:
+            raise ValueError("Invalid cursor")
+        
+        if cursor_signature != signature:
+            raise ValueError("Cursor does not match the requested sort")
+        
+        return value, last_id
+    
+    def _count(self, query_obj, count: str) -> Optional[int]:
+        """
+        Total for a search query
+        
+        "exact" runs COUNT(*), "none" skips counting, and "estimate" uses the
+        planner's row estimate on PostgreSQL or a short-lived cached exact
+        count elsewhere.
+        """
+        
+        if count == "none":
+            return None
+        
+        if count != "estimate":
+            return query_obj.count()
+        
+        bind = self.db.get_bind()
+        compiled = query_obj.statement.compile(
+            dialect=bind.dialect,
+            compile_kwargs={"render_postcompile": True}
+        )
+        
+        if bind.dialect.name == "postgresql":
+            plan = self.db.connection().exec_driver_sql(
+                "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params
+            ).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows'])
+        
+        key = (str(compiled), repr(sorted(compiled.params.items())))
+        total_count = _count_cache.get(key)
+        if total_count is None:
+            total_count = query_obj.count()
+            _count_cache.set(key, total_count)
+        
+        return total_count
+    
     # Saved Search Management
     
     def save_search(
@@ -254,6 +656,8 @@ class SearchService:
         self.db.commit()
         self.db.refresh(saved_search)
         
+        saved_search_index.set_search(saved_search)
+        
         return saved_search
     
     def get_saved_searches(
@@ -304,6 +708,8 @@ class SearchService:
         self.db.commit()
         self.db.refresh(saved_search)
         
+        saved_search_index.set_search(saved_search)
+        
         return saved_search
     
     def delete_saved_search(self, search_id: uuid.UUID) -> bool:
@@ -319,6 +725,8 @@ class SearchService:
         saved_search.is_active = False
         self.db.commit()
         
+        saved_search_index.remove_search(saved_search.id)
+        
         return True
     
     def execute_saved_search(
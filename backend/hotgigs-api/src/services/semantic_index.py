@@ -0,0 +1,174 @@
+"""
+Semantic Index Service
+Embedding-based ANN indexes over job and candidate text, used to narrow
+matching to the nearest semantic neighbours before rule-based scoring.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+import os
+import threading
+import uuid
+
+from core.config import settings
+from models.candidate import CandidateProfile, CandidateSkill
+from models.job import Job
+from services.embeddings import IVFIndex, get_embedder
+
+
+def job_text(
+    title: Optional[str],
+    description: Optional[str],
+    required_skills: Optional[Iterable[str]],
+    preferred_skills: Optional[Iterable[str]]
+) -> str:
+    """Text embedded for a job"""
+    return '\n'.join([
+        title or '',
+        ', '.join(required_skills or []),
+        ', '.join(preferred_skills or []),
+        description or ''
+    ])
+
+
+def candidate_text(
+    title: Optional[str],
+    current_position: Optional[str],
+    bio: Optional[str],
+    skill_names: Optional[Iterable[str]]
+) -> str:
+    """Text embedded for a candidate"""
+    return '\n'.join([
+        title or '',
+        current_position or '',
+        ', '.join(skill_names or []),
+        bio or ''
+    ])
+
+
+class SemanticIndex:
+    """
+    ANN index of one entity type (jobs or candidates)
+
+    Loaded from disk (vectors memory-mapped) or built from the database on
+    first use, then kept up to date by the write routes. Updates go to an
+    in-memory buffer which is folded in and re-persisted once it grows past
+    compact_threshold.
+    """
+
+    def __init__(self, name: str, compact_threshold: int = 1000):
+        self.name = name
+        self.compact_threshold = compact_threshold
+        self.path = os.path.join(settings.SEMANTIC_INDEX_DIR, name)
+        self._lock = threading.RLock()
+        self._embedder = None
+        self._index: Optional[IVFIndex] = None
+
+    @property
+    def is_built(self) -> bool:
+        return self._index is not None
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            self._embedder = get_embedder()
+        return self._embedder
+
+    def ensure_built(self, db: Session):
+        """Load the index from disk, or build it from the database"""
+        if self._index is not None:
+            return
+
+        with self._lock:
+            if self._index is None:
+                self._index = IVFIndex.load(self.path, self.embedder.name)
+                if self._index is None:
+                    self.rebuild(db)
+
+    def rebuild(self, db: Session):
+        """Re-embed every entity, rebuild the index and persist it"""
+        with self._lock:
+            ids, texts = self._load_texts(db)
+            vectors = self.embedder.embed(texts) if texts else None
+
+            index = IVFIndex()
+            if vectors is not None:
+                index.build(ids, vectors)
+            else:
+                index.build([], self.embedder.embed(['']))
+            index.save(self.path, self.embedder.name)
+
+            self._index = index
+
+    def upsert(self, entity_id: uuid.UUID, text: str):
+        """Embed and (re-)index one entity"""
+        with self._lock:
+            if self._index is None:
+                return
+            self._index.add(str(entity_id), self.embedder.embed([text])[0])
+            self._maybe_compact()
+
+    def remove(self, entity_id: uuid.UUID):
+        """Drop an entity from the index"""
+        with self._lock:
+            if self._index is None:
+                return
+            self._index.remove(str(entity_id))
+
+    def search_text(self, text: str, k: int = settings.SEMANTIC_CANDIDATE_POOL) -> List[Tuple[uuid.UUID, float]]:
+        """Top-k (entity id, similarity) for a query text, best first"""
+        query = self.embedder.embed([text])[0]
+
+        with self._lock:
+            if self._index is None:
+                return []
+            hits = self._index.search(query, k)
+
+        return [(uuid.UUID(entity_id), score) for entity_id, score in hits]
+
+    def get_stats(self) -> Dict[str, object]:
+        """Index size counters"""
+        with self._lock:
+            return {
+                'embedder': self.embedder.name,
+                'size': len(self._index) if self._index is not None else 0,
+                'pending': self._index.pending_count if self._index is not None else 0
+            }
+
+    def _maybe_compact(self):
+        if self._index.pending_count >= self.compact_threshold:
+            self._index.save(self.path, self.embedder.name)
+
+    def _load_texts(self, db: Session) -> Tuple[List[str], List[str]]:
+        if self.name == 'jobs':
+            rows = db.query(
+                Job.id, Job.title, Job.description, Job.required_skills, Job.preferred_skills
+            ).filter(Job.is_active.is_(True)).all()
+
+            return (
+                [str(row[0]) for row in rows],
+                [job_text(*row[1:]) for row in rows]
+            )
+
+        skills_by_candidate: Dict[uuid.UUID, List[str]] = {}
+        for candidate_id, skill_name in db.query(
+            CandidateSkill.candidate_id, CandidateSkill.skill_name
+        ).all():
+            skills_by_candidate.setdefault(candidate_id, []).append(skill_name)
+
+        rows = db.query(
+            CandidateProfile.id,
+            CandidateProfile.title,
+            CandidateProfile.current_position,
+            CandidateProfile.bio
+        ).all()
+
+        return (
+            [str(row[0]) for row in rows],
+            [candidate_text(*row[1:], skills_by_candidate.get(row[0], [])) for row in rows]
+        )
+
+
+# Shared per-process indexes
+job_semantic_index = SemanticIndex('jobs')
+candidate_semantic_index = SemanticIndex('candidates')
@@ -0,0 +1,264 @@
+"""
+Skill Dictionary Service
+Normalizes skill names (aliases such as "JS" -> "javascript"), interns them to
+integer IDs and knows which skills are related or partially overlapping.
+"""
+
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+import re
+import threading
+
+import numpy as np
+
+from core.config import settings
+
+
+# Alias -> canonical skill name (both lowercase)
+SKILL_ALIASES = {
+    'js': 'javascript',
+    'ecmascript': 'javascript',
+    'es6': 'javascript',
+    'ts': 'typescript',
+    'py': 'python',
+    'python3': 'python',
+    'golang': 'go',
+    'c sharp': 'c#',
+    'csharp': 'c#',
+    'cpp': 'c++',
+    'postgres': 'postgresql',
+    'psql': 'postgresql',
+    'mongo': 'mongodb',
+    'ms sql': 'sql server',
+    'mssql': 'sql server',
+    'k8s': 'kubernetes',
+    'amazon web services': 'aws',
+    'google cloud': 'gcp',
+    'google cloud platform': 'gcp',
+    'microsoft azure': 'azure',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'angularjs': 'angular',
+    'nodejs': 'node.js',
+    'node': 'node.js',
+    'nextjs': 'next.js',
+    'ml': 'machine learning',
+    'ai': 'artificial intelligence',
+    'dl': 'deep learning',
+    'nlp': 'natural language processing',
+    'tf': 'tensorflow',
+    'sklearn': 'scikit-learn',
+    'ci/cd': 'continuous integration',
+    'ci': 'continuous integration',
+    'gh actions': 'github actions',
+    'rest api': 'rest',
+    'restful': 'rest',
+    'ux': 'user experience',
+    'ui': 'user interface',
+}
+
+# Groups of mutually related skills (canonical names)
+RELATED_SKILL_GROUPS = [
+    ['javascript', 'typescript', 'node.js'],
+    ['react', 'vue', 'angular', 'svelte', 'next.js'],
+    ['python', 'django', 'flask', 'fastapi'],
+    ['java', 'kotlin', 'scala', 'spring'],
+    ['c#', '.net', 'asp.net'],
+    ['c', 'c++', 'rust', 'go'],
+    ['postgresql', 'mysql', 'sql server', 'oracle', 'sqlite', 'sql'],
+    ['mongodb', 'cassandra', 'dynamodb', 'redis'],
+    ['aws', 'gcp', 'azure'],
+    ['docker', 'kubernetes', 'terraform', 'ansible'],
+    ['continuous integration', 'jenkins', 'github actions', 'gitlab ci'],
+    ['machine learning', 'deep learning', 'artificial intelligence', 'data science'],
+    ['tensorflow', 'pytorch', 'keras', 'scikit-learn'],
+    ['natural language processing', 'computer vision'],
+    ['pandas', 'numpy', 'data analysis'],
+    ['spark', 'hadoop', 'kafka', 'airflow'],
+    ['rest', 'graphql', 'grpc'],
+    ['user experience', 'user interface', 'figma'],
+    ['ios', 'swift', 'objective-c'],
+    ['android', 'kotlin'],
+]
+
+_WHITESPACE = re.compile(r'\s+')
+_TOKEN_SPLIT = re.compile(r'[\s\-/_.]+')
+
+
+class SkillDictionary:
+    """
+    Skill name interning, aliasing and relatedness lookups
+
+    Skills from RELATED_SKILL_GROUPS get the lowest IDs so their relations fit
+    in a dense boolean table; other skills are interned on first sight and
+    only take part in exact and partial (word-subset) matches. IDs are
+    process-local and must not be persisted.
+
+    Job skills are always interned. Candidate free text goes through
+    intern_free_text, which stops adding names after max_free_text; a
+    candidate skill no job has asked for can only earn partial credit, so
+    past the cap such names are skipped.
+    """
+
+    def __init__(
+        self,
+        aliases: Optional[Dict[str, str]] = None,
+        related_groups: Optional[List[List[str]]] = None,
+        max_free_text: Optional[int] = None
+    ):
+        self._lock = threading.Lock()
+        self._aliases = dict(SKILL_ALIASES if aliases is None else aliases)
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._tokens: List[FrozenSet[str]] = []
+        self._token_index: Dict[str, Set[int]] = {}
+        self._partial_cache: Dict[int, FrozenSet[int]] = {}
+        self.max_free_text = (
+            settings.SKILL_DICTIONARY_MAX_FREE_TEXT if max_free_text is None else max_free_text
+        )
+        self.free_text_size = 0
+
+        groups = RELATED_SKILL_GROUPS if related_groups is None else related_groups
+        for group in groups:
+            for name in group:
+                self.intern(name)
+
+        # Dense relation table over the curated graph nodes
+        self.graph_size = len(self._names)
+        self.related_table = np.zeros((self.graph_size, self.graph_size), dtype=bool)
+        for group in groups:
+            ids = [self._ids[self.canonicalize(name)] for name in group]
+            for a in ids:
+                for b in ids:
+                    if a != b:
+                        self.related_table[a, b] = True
+
+        self._related_ids: List[List[int]] = [
+            np.flatnonzero(row).tolist() for row in self.related_table
+        ]
+
+    @property
+    def size(self) -> int:
+        return len(self._names)
+
+    def canonicalize(self, name: str) -> str:
+        """Normalize case/whitespace and resolve aliases"""
+        normalized = _WHITESPACE.sub(' ', (name or '').strip().lower())
+        return self._aliases.get(normalized, normalized)
+
+    def intern(self, name: str) -> int:
+        """ID for a skill name, assigning a new one if needed"""
+        canonical = self.canonicalize(name)
+
+        skill_id = self._ids.get(canonical)
+        if skill_id is not None:
+            return skill_id
+
+        with self._lock:
+            return self._add(canonical, free_text=False)
+
+    def intern_many(self, names: Iterable[str]) -> List[int]:
+        """IDs for several skill names, preserving order"""
+        return [self.intern(name) for name in names]
+
+    def intern_free_text(self, name: str) -> Optional[int]:
+        """ID for a candidate-entered skill name, or None once the free-text tier is full"""
+        canonical = self.canonicalize(name)
+
+        skill_id = self._ids.get(canonical)
+        if skill_id is not None:
+            return skill_id
+
+        with self._lock:
+            return self._add(canonical, free_text=True)
+
+    def intern_free_text_many(self, names: Iterable[str]) -> List[int]:
+        """IDs for several candidate-entered skill names, skipping any not interned"""
+        ids = (self.intern_free_text(name) for name in names)
+        return [skill_id for skill_id in ids if skill_id is not None]
+
+    def lookup(self, name: str) -> Optional[int]:
+        """ID for a skill name, or None if it has never been seen"""
+        return self._ids.get(self.canonicalize(name))
+
+    def name(self, skill_id: int) -> str:
+        """Canonical name for an ID"""
+        return self._names[skill_id]
+
+    def related_ids(self, skill_id: int) -> List[int]:
+        """IDs of curated related skills"""
+        if skill_id < self.graph_size:
+            return self._related_ids[skill_id]
+        return []
+
+    def is_related(self, a: int, b: int) -> bool:
+        """Dense-table relatedness check"""
+        return a < self.graph_size and b < self.graph_size and bool(self.related_table[a, b])
+
+    def partial_ids(self, skill_id: int) -> FrozenSet[int]:
+        """
+        IDs of skills whose words are a strict subset or superset of this one's
+        (e.g. "react" and "react native")
+        """
+        cached = self._partial_cache.get(skill_id)
+        if cached is not None:
+            return cached
+
+        # Computed under the lock so a concurrent intern can't be missed
+        with self._lock:
+            tokens = self._tokens[skill_id]
+            candidates: Set[int] = set()
+            for token in tokens:
+                candidates |= self._token_index.get(token, set())
+
+            partial = frozenset(
+                other for other in candidates
+                if other != skill_id and (
+                    tokens < self._tokens[other] or self._tokens[other] < tokens
+                )
+            )
+
+            self._partial_cache[skill_id] = partial
+        return partial
+
+    def expand(self, names: Iterable[str]) -> Set[str]:
+        """Canonical names plus their related and partial neighbours"""
+        expanded: Set[str] = set()
+        for skill_id in {self.intern(name) for name in names}:
+            expanded.add(self._names[skill_id])
+            for other in self.related_ids(skill_id):
+                expanded.add(self._names[other])
+            for other in self.partial_ids(skill_id):
+                expanded.add(self._names[other])
+        return expanded
+
+
+    def _add(self, canonical: str, free_text: bool) -> Optional[int]:
+        """Intern a canonical name (caller holds the lock)"""
+        skill_id = self._ids.get(canonical)
+        if skill_id is not None:
+            return skill_id
+
+        if free_text:
+            if self.free_text_size >= self.max_free_text:
+                return None
+            self.free_text_size += 1
+
+        skill_id = len(self._names)
+        tokens = frozenset(t for t in _TOKEN_SPLIT.split(canonical) if t)
+        self._names.append(canonical)
+        self._tokens.append(tokens)
+        for token in tokens:
+            ids = self._token_index.setdefault(token, set())
+            # Only skills sharing a word can gain the new skill as a partial match
+            for other in ids:
+                self._partial_cache.pop(other, None)
+            ids.add(skill_id)
+        self._ids[canonical] = skill_id
+
+        return skill_id
+
+
+# Shared per-process dictionary
+skill_dictionary = SkillDictionary()
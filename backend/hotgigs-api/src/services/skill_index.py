@@ -0,0 +1,244 @@
+"""
+Skill Index Service
+In-process inverted index from normalized skill name to candidate and job IDs,
+used to prune matching to entities that share at least one skill.
+"""
+
+from typing import Dict, Set, Iterable, Optional
+from sqlalchemy.orm import Session
+import threading
+import uuid
+
+from models.candidate import CandidateSkill
+from models.job import Job
+from services.skill_dictionary import skill_dictionary
+
+
+def normalize_skill(name: str) -> str:
+    """Normalize a skill name for index lookups (aliases resolved)"""
+    return skill_dictionary.canonicalize(name)
+
+
+def _index_skill(name: str, free_text: bool = False) -> str:
+    """Normalize and intern a skill so related/partial lookups can reach it"""
+    skill = normalize_skill(name)
+    if skill:
+        if free_text:
+            skill_dictionary.intern_free_text(skill)
+        else:
+            skill_dictionary.intern(skill)
+    return skill
+
+
+class SkillIndex:
+    """
+    Inverted skill index for candidates and jobs
+
+    The index is built lazily from the database on first use and then kept
+    up to date by the write routes. Each worker process holds its own copy.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+
+        # skill -> entity ids
+        self._candidates_by_skill: Dict[str, Set[uuid.UUID]] = {}
+        self._jobs_by_required_skill: Dict[str, Set[uuid.UUID]] = {}
+        self._jobs_by_preferred_skill: Dict[str, Set[uuid.UUID]] = {}
+
+        # entity id -> skills, so entries can be replaced or removed
+        self._candidate_skills: Dict[uuid.UUID, Set[str]] = {}
+        self._job_required_skills: Dict[uuid.UUID, Set[str]] = {}
+        self._job_preferred_skills: Dict[uuid.UUID, Set[str]] = {}
+
+        # Active jobs without required skills match every candidate on skills
+        self._open_jobs: Set[uuid.UUID] = set()
+
+    @property
+    def is_built(self) -> bool:
+        return self._built
+
+    def ensure_built(self, db: Session):
+        """Build the index from the database if it has not been built yet"""
+        if self._built:
+            return
+
+        with self._lock:
+            if not self._built:
+                self.rebuild(db)
+
+    def rebuild(self, db: Session):
+        """Rebuild the full index from CandidateSkill and active Job rows"""
+
+        # Reads happen under the lock so concurrent writes are applied after the snapshot
+        with self._lock:
+            candidate_rows = db.query(CandidateSkill.candidate_id, CandidateSkill.skill_name).all()
+            job_rows = db.query(
+                Job.id, Job.required_skills, Job.preferred_skills
+            ).filter(Job.is_active.is_(True)).all()
+
+            self._candidates_by_skill.clear()
+            self._jobs_by_required_skill.clear()
+            self._jobs_by_preferred_skill.clear()
+            self._candidate_skills.clear()
+            self._job_required_skills.clear()
+            self._job_preferred_skills.clear()
+            self._open_jobs.clear()
+
+            for candidate_id, skill_name in candidate_rows:
+                self._add_candidate_skill(candidate_id, skill_name)
+
+            for job_id, required_skills, preferred_skills in job_rows:
+                self._set_job_skills(job_id, required_skills or [], preferred_skills or [])
+
+            self._built = True
+
+    # Candidate updates
+
+    def add_candidate_skill(self, candidate_id: uuid.UUID, skill_name: str):
+        """Index a newly added candidate skill"""
+        with self._lock:
+            if not self._built:
+                return
+            self._add_candidate_skill(candidate_id, skill_name)
+
+    def set_candidate_skills(self, candidate_id: uuid.UUID, skill_names: Iterable[str]):
+        """Replace all indexed skills for a candidate"""
+        with self._lock:
+            if not self._built:
+                return
+            self._remove_candidate(candidate_id)
+            for skill_name in skill_names:
+                self._add_candidate_skill(candidate_id, skill_name)
+
+    def remove_candidate(self, candidate_id: uuid.UUID):
+        """Drop a candidate from the index"""
+        with self._lock:
+            if not self._built:
+                return
+            self._remove_candidate(candidate_id)
+
+    # Job updates
+
+    def set_job_skills(
+        self,
+        job_id: uuid.UUID,
+        required_skills: Optional[Iterable[str]],
+        preferred_skills: Optional[Iterable[str]]
+    ):
+        """Index (or re-index) an active job's skills"""
+        with self._lock:
+            if not self._built:
+                return
+            self._remove_job(job_id)
+            self._set_job_skills(job_id, required_skills or [], preferred_skills or [])
+
+    def remove_job(self, job_id: uuid.UUID):
+        """Drop a job from the index"""
+        with self._lock:
+            if not self._built:
+                return
+            self._remove_job(job_id)
+
+    # Lookups
+
+    def find_candidates(self, skills: Iterable[str]) -> Set[uuid.UUID]:
+        """Candidate IDs that have at least one of the given skills"""
+        result: Set[uuid.UUID] = set()
+
+        with self._lock:
+            for skill in {normalize_skill(s) for s in skills}:
+                result |= self._candidates_by_skill.get(skill, set())
+
+        return result
+
+    def find_jobs(
+        self,
+        skills: Iterable[str],
+        include_preferred: bool = False
+    ) -> Set[uuid.UUID]:
+        """
+        Job IDs whose required skills overlap the given skills
+
+        Jobs without required skills are always included, since they give
+        every candidate a full skill score.
+        """
+        with self._lock:
+            result = set(self._open_jobs)
+
+            for skill in {normalize_skill(s) for s in skills}:
+                result |= self._jobs_by_required_skill.get(skill, set())
+                if include_preferred:
+                    result |= self._jobs_by_preferred_skill.get(skill, set())
+
+        return result
+
+    def get_stats(self) -> Dict[str, int]:
+        """Index size counters"""
+        with self._lock:
+            return {
+                'skills': len(
+                    set(self._candidates_by_skill)
+                    | set(self._jobs_by_required_skill)
+                    | set(self._jobs_by_preferred_skill)
+                ),
+                'candidates': len(self._candidate_skills),
+                'jobs': len(self._job_required_skills)
+            }
+
+    # Internal helpers (callers hold the lock)
+
+    def _add_candidate_skill(self, candidate_id: uuid.UUID, skill_name: str):
+        skill = _index_skill(skill_name, free_text=True)
+        if not skill:
+            return
+
+        self._candidates_by_skill.setdefault(skill, set()).add(candidate_id)
+        self._candidate_skills.setdefault(candidate_id, set()).add(skill)
+
+    def _remove_candidate(self, candidate_id: uuid.UUID):
+        for skill in self._candidate_skills.pop(candidate_id, set()):
+            ids = self._candidates_by_skill.get(skill)
+            if ids is not None:
+                ids.discard(candidate_id)
+                if not ids:
+                    del self._candidates_by_skill[skill]
+
+    def _set_job_skills(
+        self,
+        job_id: uuid.UUID,
+        required_skills: Iterable[str],
+        preferred_skills: Iterable[str]
+    ):
+        required = {_index_skill(s) for s in required_skills} - {''}
+        preferred = {_index_skill(s) for s in preferred_skills} - {''}
+
+        self._job_required_skills[job_id] = required
+        self._job_preferred_skills[job_id] = preferred
+
+        if not required:
+            self._open_jobs.add(job_id)
+
+        for skill in required:
+            self._jobs_by_required_skill.setdefault(skill, set()).add(job_id)
+        for skill in preferred:
+            self._jobs_by_preferred_skill.setdefault(skill, set()).add(job_id)
+
+    def _remove_job(self, job_id: uuid.UUID):
+        self._open_jobs.discard(job_id)
+
+        for skills, index in (
+            (self._job_required_skills.pop(job_id, set()), self._jobs_by_required_skill),
+            (self._job_preferred_skills.pop(job_id, set()), self._jobs_by_preferred_skill)
+        ):
+            for skill in skills:
+                ids = index.get(skill)
+                if ids is not None:
+                    ids.discard(job_id)
+                    if not ids:
+                        del index[skill]
+
+
+# Shared per-process index
+skill_index = SkillIndex()
@@ -0,0 +1,193 @@
+"""
+Text Index Service
+Pure-Python BM25 full-text index over jobs, used for relevance search when
+the database has no PostgreSQL full-text support (e.g. SQLite in tests).
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+import math
+import re
+import threading
+import uuid
+
+from models.job import Job
+
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+STOPWORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is',
+    'it', 'of', 'on', 'or', 'the', 'to', 'with', 'we', 'you', 'our', 'will'
+})
+
+# Field weights mirror the tsvector weights: title (A) > skills (B) > description (C)
+JOB_FIELD_WEIGHTS = {'title': 3.0, 'skills': 2.0, 'description': 1.0}
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase word tokens without stopwords"""
+    return [
+        token for token in _TOKEN_PATTERN.findall((text or '').lower())
+        if token not in STOPWORDS
+    ]
+
+
+class BM25Index:
+    """
+    In-memory BM25F-style index
+
+    Each document has several weighted fields; term frequencies and document
+    lengths are the weighted sums over fields.
+    """
+
+    def __init__(self, field_weights: Dict[str, float], k1: float = 1.2, b: float = 0.75):
+        self.field_weights = field_weights
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[uuid.UUID, float]] = {}
+        self._doc_terms: Dict[uuid.UUID, Dict[str, float]] = {}
+        self._doc_lengths: Dict[uuid.UUID, float] = {}
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def add(self, doc_id: uuid.UUID, fields: Dict[str, Optional[str]]):
+        """Index (or re-index) a document"""
+        self.remove(doc_id)
+
+        terms: Dict[str, float] = {}
+        length = 0.0
+        for field, weight in self.field_weights.items():
+            for token in tokenize(fields.get(field)):
+                terms[token] = terms.get(token, 0.0) + weight
+                length += weight
+
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+
+        self._doc_terms[doc_id] = terms
+        self._doc_lengths[doc_id] = length
+        self._total_length += length
+
+    def remove(self, doc_id: uuid.UUID):
+        """Drop a document"""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+
+        self._total_length -= self._doc_lengths.pop(doc_id)
+
+    def search(self, query: str) -> List[Tuple[uuid.UUID, float]]:
+        """(doc_id, score) for documents containing every query term, best first"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self._doc_lengths:
+            return []
+
+        postings = [self._postings.get(term, {}) for term in terms]
+        if any(not posting for posting in postings):
+            return []
+
+        # Intersect starting from the rarest term
+        postings.sort(key=len)
+        matches = set(postings[0])
+        for posting in postings[1:]:
+            matches &= posting.keys()
+
+        count = len(self._doc_lengths)
+        average_length = self._total_length / count or 1.0
+
+        scores = []
+        for doc_id in matches:
+            length_norm = 1 - self.b + self.b * self._doc_lengths[doc_id] / average_length
+            score = 0.0
+            for posting in postings:
+                frequency = posting[doc_id]
+                idf = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+                score += idf * frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+            scores.append((doc_id, score))
+
+        scores.sort(key=lambda item: (-item[1], str(item[0])))
+        return scores
+
+
+class JobTextIndex:
+    """
+    BM25 index over job title, required skills and description
+
+    Built lazily from the database on first use and kept up to date by the
+    job write routes, like the skill index.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._index = BM25Index(JOB_FIELD_WEIGHTS)
+
+    @property
+    def is_built(self) -> bool:
+        return self._built
+
+    def ensure_built(self, db: Session):
+        """Build the index from the database if it has not been built yet"""
+        if self._built:
+            return
+
+        with self._lock:
+            if not self._built:
+                self.rebuild(db)
+
+    def rebuild(self, db: Session):
+        """Rebuild the index from all Job rows"""
+        with self._lock:
+            rows = db.query(Job.id, Job.title, Job.required_skills, Job.description).all()
+
+            self._index = BM25Index(JOB_FIELD_WEIGHTS)
+            for job_id, title, required_skills, description in rows:
+                self._index.add(job_id, self._fields(title, required_skills, description))
+
+            self._built = True
+
+    def set_job(
+        self,
+        job_id: uuid.UUID,
+        title: Optional[str],
+        required_skills: Optional[Iterable[str]],
+        description: Optional[str]
+    ):
+        """Index (or re-index) a job"""
+        with self._lock:
+            if not self._built:
+                return
+            self._index.add(job_id, self._fields(title, required_skills, description))
+
+    def remove_job(self, job_id: uuid.UUID):
+        """Drop a job from the index"""
+        with self._lock:
+            if not self._built:
+                return
+            self._index.remove(job_id)
+
+    def search(self, query: str) -> List[Tuple[uuid.UUID, float]]:
+        """(job_id, BM25 score) for jobs matching every query term, best first"""
+        with self._lock:
+            return self._index.search(query)
+
+    def _fields(self, title, required_skills, description) -> Dict[str, str]:
+        return {
+            'title': title,
+            'skills': ' '.join(required_skills or []),
+            'description': description
+        }
+
+
+# Shared per-process index
+job_text_index = JobTextIndex()
@@ -0,0 +1,363 @@
+"""
+Typeahead Service
+Prefix index over job titles, skills, locations and company names for
+autocomplete, weighted by how many active jobs use each term.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+import bisect
+import heapq
+import json
+import os
+import re
+import threading
+import time
+import uuid
+
+from core.cache import get_redis_client
+from core.config import settings
+from models.job import Job, Company
+
+SUGGESTION_TYPES = ('title', 'skill', 'location', 'company')
+
+# Bumped by every job write in any worker (with use_redis)
+GENERATION_KEY = "typeahead:generation"
+
+_WORD_START = re.compile(r"(?:^|[\s,/(-])(?=\w)")
+
+
+def normalize_term(text: Optional[str]) -> str:
+    """Lowercase with collapsed whitespace"""
+    return ' '.join((text or '').lower().split())
+
+
+class TypeaheadIndex:
+    """
+    Sorted-array prefix index with bisect lookups
+
+    Every term is stored once per word start ("senior python developer" is
+    also reachable from "python" and "developer"), as sorted
+    (key, type, term) tuples. A prefix query bisects to the matching range
+    and keeps the most frequent terms. Results for short prefixes, whose
+    ranges are large, are memoized until the next write.
+
+    Built lazily (from a disk snapshot when a fresh one exists, otherwise
+    from the database) and kept up to date by the job write routes.
+
+    Writes only reach the index of the worker that handled them. With
+    use_redis every write also bumps a shared generation, and an index
+    behind it is refreshed on its next use; without Redis it is refreshed
+    every refresh_seconds. A refresh loads the snapshot if another worker
+    saved a newer one at the current generation, and rebuilds otherwise.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str = settings.TYPEAHEAD_SNAPSHOT_PATH,
+        snapshot_max_age_seconds: int = settings.TYPEAHEAD_SNAPSHOT_MAX_AGE_SECONDS,
+        snapshot_interval_seconds: int = settings.TYPEAHEAD_SNAPSHOT_INTERVAL_SECONDS,
+        use_redis: bool = settings.TYPEAHEAD_USE_REDIS,
+        generation_check_seconds: float = settings.TYPEAHEAD_GENERATION_CHECK_SECONDS,
+        refresh_seconds: int = settings.TYPEAHEAD_REFRESH_SECONDS
+    ):
+        self.snapshot_path = snapshot_path
+        self.snapshot_max_age_seconds = snapshot_max_age_seconds
+        self.snapshot_interval_seconds = snapshot_interval_seconds
+        self.use_redis = use_redis
+        self.generation_check_seconds = generation_check_seconds
+        self.refresh_seconds = refresh_seconds
+
+        self._lock = threading.RLock()
+        self._built = False
+        self._built_at = 0.0  # When the data held was read from the database
+        self._generation: Optional[int] = None  # Shared generation the data reflects
+        self._checked_at = 0.0
+        self._reset()
+
+    @property
+    def is_built(self) -> bool:
+        return self._built
+
+    def needs_refresh(self) -> bool:
+        """Whether ensure_built has work to do; checked at most every generation_check_seconds"""
+        if not self._built:
+            return True
+
+        now = time.monotonic()
+        if now - self._checked_at < self.generation_check_seconds:
+            return False
+        self._checked_at = now
+        return self._is_stale()
+
+    def ensure_built(self, db: Session):
+        """Load a snapshot or build from the database, if missing or stale"""
+        if self._built and not self._is_stale():
+            return
+
+        with self._lock:
+            # Another thread may have refreshed while this one waited
+            if self._built and not self._is_stale():
+                return
+
+            if not self.load_snapshot(newer_than=self._built_at if self._built else 0.0):
+                self.rebuild(db)
+
+    def rebuild(self, db: Session):
+        """Rebuild from all active jobs and snapshot the result"""
+        with self._lock:
+            # Read first, so a write racing with the query leaves the index stale
+            generation = self._shared_generation()
+            built_at = time.time()
+            rows = db.query(
+                Job.id, Job.title, Job.required_skills, Job.location, Company.name
+            ).outerjoin(Company, Company.id == Job.company_id).filter(Job.is_active.is_(True)).all()
+
+            self._reset()
+            for job_id, title, required_skills, location, company_name in rows:
+                self._add_job(
+                    job_id, self._job_terms(title, required_skills, location, company_name),
+                    keep_sorted=False
+                )
+            self._keys.sort()
+
+            self._built = True
+            self._built_at = built_at
+            self._generation = generation
+            self.save_snapshot()
+
+    def set_job(
+        self,
+        job_id: uuid.UUID,
+        title: Optional[str],
+        required_skills: Optional[Iterable[str]],
+        location: Optional[str],
+        company_name: Optional[str]
+    ):
+        """Index (or re-index) an active job's terms"""
+        with self._lock:
+            if self._built:
+                self._remove_job(job_id)
+                self._add_job(job_id, self._job_terms(title, required_skills, location, company_name))
+            self._after_write()
+
+    def remove_job(self, job_id: uuid.UUID):
+        """Drop a job's terms"""
+        with self._lock:
+            if self._built:
+                self._remove_job(job_id)
+            self._after_write()
+
+    def suggest(
+        self,
+        prefix: str,
+        limit: int = 10,
+        types: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Most frequent terms with a word starting with `prefix`"""
+        prefix = normalize_term(prefix)
+        if not prefix:
+            return []
+
+        type_filter = tuple(sorted(set(types))) if types else None
+        memo_key = (prefix, limit, type_filter)
+
+        with self._lock:
+            cached = self._memo.get(memo_key)
+            if cached is not None:
+                return cached
+
+            start = bisect.bisect_left(self._keys, (prefix,))
+            end = bisect.bisect_left(self._keys, (prefix + '\uffff',), start)
+
+            entries = {
+                (kind, term) for _, kind, term in self._keys[start:end]
+                if type_filter is None or kind in type_filter
+            }
+            top = heapq.nsmallest(
+                limit, entries, key=lambda entry: (-self._counts[entry], len(entry[1]), entry)
+            )
+            suggestions = [
+                {'text': self._display[entry], 'type': entry[0], 'count': self._counts[entry]}
+                for entry in top
+            ]
+
+            if end - start > settings.TYPEAHEAD_MEMO_MIN_RANGE:
+                self._memo[memo_key] = suggestions
+            return suggestions
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'terms': len(self._counts), 'keys': len(self._keys), 'jobs': len(self._jobs)}
+
+    def save_snapshot(self) -> bool:
+        """Write the index to the snapshot file (temp file + rename)"""
+        if not self.snapshot_path:
+            return False
+
+        with self._lock:
+            payload = {
+                'saved_at': time.time(),
+                'built_at': self._built_at,
+                'generation': self._generation,
+                'entries': [
+                    [kind, term, self._display[(kind, term)], count]
+                    for (kind, term), count in self._counts.items()
+                ],
+                'keys': self._keys,
+                'jobs': self._jobs
+            }
+            try:
+                encoded = json.dumps(payload)
+            finally:
+                self._last_snapshot = time.monotonic()
+
+        try:
+            directory = os.path.dirname(self.snapshot_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.snapshot_path + '.tmp', 'w') as f:
+                f.write(encoded)
+            os.replace(self.snapshot_path + '.tmp', self.snapshot_path)
+            return True
+        except OSError:
+            return False
+
+    def load_snapshot(self, newer_than: float = 0.0) -> bool:
+        """
+        Load the snapshot file if it exists, is fresh enough, was built from
+        the database after `newer_than` and (with use_redis) is at the current
+        shared generation
+        """
+        if not self.snapshot_path:
+            return False
+
+        try:
+            with open(self.snapshot_path) as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        saved_at = payload.get('saved_at', 0)
+        built_at = payload.get('built_at', saved_at)
+        if time.time() - saved_at > self.snapshot_max_age_seconds or built_at <= newer_than:
+            return False
+
+        shared = self._shared_generation()
+        if shared is not None and payload.get('generation') != shared:
+            return False
+
+        # Stored already aggregated and sorted, so loading does no indexing work
+        with self._lock:
+            self._reset()
+            for kind, term, display, count in payload['entries']:
+                self._counts[(kind, term)] = count
+                self._display[(kind, term)] = display
+            self._keys = [tuple(key) for key in payload['keys']]
+            self._jobs = payload['jobs']
+            self._built = True
+            self._built_at = built_at
+            self._generation = shared
+        return True
+
+    def _reset(self):
+        self._keys: List[Tuple[str, str, str]] = []
+        self._counts: Dict[Tuple[str, str], int] = {}
+        self._display: Dict[Tuple[str, str], str] = {}
+        # str(job_id) -> [type, normalized term] pairs, for re-indexing and removal
+        self._jobs: Dict[str, List[List[str]]] = {}
+        self._memo: Dict[tuple, List[Dict[str, Any]]] = {}
+        self._last_snapshot = time.monotonic()
+
+    def _job_terms(self, title, required_skills, location, company_name) -> List[Tuple[str, str]]:
+        terms = [('title', title), ('location', location), ('company', company_name)]
+        terms.extend(('skill', skill) for skill in required_skills or [])
+        return [(kind, ' '.join(text.split())) for kind, text in terms if text and text.strip()]
+
+    def _add_job(self, job_id: uuid.UUID, terms: List[Tuple[str, str]], keep_sorted: bool = True):
+        # Each distinct term counts once per job
+        unique = {}
+        for kind, text in terms:
+            unique.setdefault((kind, normalize_term(text)), text)
+
+        for entry, text in unique.items():
+            count = self._counts.get(entry, 0)
+            if count == 0:
+                self._display[entry] = text
+                for key in self._word_suffixes(entry[1]):
+                    if keep_sorted:
+                        bisect.insort(self._keys, (key, entry[0], entry[1]))
+                    else:
+                        self._keys.append((key, entry[0], entry[1]))
+            self._counts[entry] = count + 1
+
+        self._jobs[str(job_id)] = [list(entry) for entry in unique]
+        self._memo.clear()
+
+    def _remove_job(self, job_id: uuid.UUID):
+        entries = self._jobs.pop(str(job_id), None)
+        if not entries:
+            return
+
+        for kind, term in entries:
+            entry = (kind, term)
+            count = self._counts.get(entry, 0) - 1
+            if count > 0:
+                self._counts[entry] = count
+                continue
+
+            self._counts.pop(entry, None)
+            self._display.pop(entry, None)
+            for key in self._word_suffixes(term):
+                position = bisect.bisect_left(self._keys, (key, kind, term))
+                if position < len(self._keys) and self._keys[position] == (key, kind, term):
+                    del self._keys[position]
+
+        self._memo.clear()
+
+    def _after_write(self):
+        # Called with the lock held. Tell other workers; this index stays
+        # current unless another write landed since it last caught up
+        generation = self._bump_shared_generation()
+        if generation is not None and self._generation is not None and generation == self._generation + 1:
+            self._generation = generation
+
+        if not self._built:
+            return
+
+        # Snapshots are throttled, so a restarted worker can miss up to one
+        # interval of writes; the max snapshot age bounds how stale it gets
+        if time.monotonic() - self._last_snapshot >= self.snapshot_interval_seconds:
+            self.save_snapshot()
+
+    def _is_stale(self) -> bool:
+        if self._generation is not None:
+            shared = self._shared_generation()
+            if shared is not None:
+                return shared != self._generation
+        return time.time() - self._built_at >= self.refresh_seconds
+
+    def _shared_generation(self) -> Optional[int]:
+        redis_client = get_redis_client() if self.use_redis else None
+        if redis_client is None:
+            return None
+        try:
+            return int(redis_client.get(GENERATION_KEY) or 0)
+        except Exception:
+            return None
+
+    def _bump_shared_generation(self) -> Optional[int]:
+        redis_client = get_redis_client() if self.use_redis else None
+        if redis_client is None:
+            return None
+        try:
+            return int(redis_client.incr(GENERATION_KEY))
+        except Exception:
+            return None
+
+    def _word_suffixes(self, term: str) -> List[str]:
+        return sorted({term[match.end():] for match in _WORD_START.finditer(term)} | {term})
+
+
+# Shared per-process index
+typeahead_index = TypeaheadIndex()
@@ -0,0 +1,211 @@
+"""
+Unread Counter Service
+Per-user unread notification and message counts, maintained on write so the
+unread-count endpoints are primary-key lookups instead of COUNT(*) scans.
+"""
+
+from typing import Any, Dict, Mapping
+from sqlalchemy import bindparam, case, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+import time
+import uuid
+
+from models.notification import UnreadCounter
+
+COUNTER_COLUMNS = ('notifications', 'messages')
+
+_counters = UnreadCounter.__table__
+
+# Counter columns for conversations tables created before they existed
+CONVERSATION_COUNTER_STATEMENTS = [
+    "ALTER TABLE IF EXISTS conversations ADD COLUMN IF NOT EXISTS candidate_unread_count integer NOT NULL DEFAULT 0",
+    "ALTER TABLE IF EXISTS conversations ADD COLUMN IF NOT EXISTS recruiter_unread_count integer NOT NULL DEFAULT 0",
+]
+
+# Recomputes per-conversation counts from unread messages
+_RECONCILE_CONVERSATIONS = """
+WITH actual AS (
+    SELECT c.id,
+           SUM(CASE WHEN m.id IS NOT NULL AND m.sender_id <> c.candidate_id THEN 1 ELSE 0 END) AS candidate_unread,
+           SUM(CASE WHEN m.id IS NOT NULL AND m.sender_id <> c.recruiter_id THEN 1 ELSE 0 END) AS recruiter_unread
+    FROM conversations c
+    LEFT JOIN messages m ON m.conversation_id = c.id AND m.is_read = false
+    GROUP BY c.id
+)
+UPDATE conversations
+SET candidate_unread_count = actual.candidate_unread,
+    recruiter_unread_count = actual.recruiter_unread
+FROM actual
+WHERE conversations.id = actual.id
+  AND (conversations.candidate_unread_count <> actual.candidate_unread
+       OR conversations.recruiter_unread_count <> actual.recruiter_unread)
+"""
+
+# Actual per-user counts, as (user_id, n); status stores enum names
+_ACTUAL_COUNTS = {
+    'notifications': """
+        SELECT user_id, COUNT(*) AS n FROM notifications
+        WHERE is_read = false AND is_archived = false
+        GROUP BY user_id
+    """,
+    'messages': """
+        SELECT user_id, SUM(n) AS n FROM (
+            SELECT candidate_id AS user_id, candidate_unread_count AS n
+            FROM conversations WHERE status = 'ACTIVE'
+            UNION ALL
+            SELECT recruiter_id AS user_id, recruiter_unread_count AS n
+            FROM conversations WHERE status = 'ACTIVE'
+        ) participants
+        GROUP BY user_id HAVING SUM(n) > 0
+    """
+}
+
+
+class UnreadCounterService:
+    """
+    Service for the denormalized unread counters
+
+    Writers call add()/reset() inside their own transaction, so a counter
+    commits or rolls back together with the rows it counts. Counters never
+    go below zero; reconcile() repairs any drift.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_counts(self, user_id: uuid.UUID) -> Dict[str, int]:
+        """Unread counts for a user (a primary-key lookup)"""
+        row = self.db.execute(
+            _counters.select().where(_counters.c.user_id == user_id)
+        ).first()
+
+        return {column: getattr(row, column) if row else 0 for column in COUNTER_COLUMNS}
+
+    def add(self, column: str, deltas: Mapping[uuid.UUID, int]):
+        """
+        Apply per-user deltas to one counter
+
+        Args:
+            column: 'notifications' or 'messages'
+            deltas: user_id -> amount; negative amounts decrement
+        """
+
+        if column not in COUNTER_COLUMNS:
+            raise ValueError(f"Counter must be one of: {', '.join(COUNTER_COLUMNS)}")
+
+        increments = [
+            {'user_id': user_id, column: delta} for user_id, delta in deltas.items() if delta > 0
+        ]
+        decrements = [
+            {'counter_user_id': user_id, 'amount': -delta} for user_id, delta in deltas.items() if delta < 0
+        ]
+
+        if increments:
+            self._increment(column, increments)
+
+        if decrements:
+            counter = _counters.c[column]
+            self.db.execute(
+                update(_counters).where(
+                    _counters.c.user_id == bindparam('counter_user_id')
+                ).values({
+                    column: case((counter > bindparam('amount'), counter - bindparam('amount')), else_=0)
+                }),
+                decrements
+            )
+
+    def reset(self, column: str, user_id: uuid.UUID):
+        """Set one user's counter to zero (everything read)"""
+        self.db.execute(
+            update(_counters).where(_counters.c.user_id == user_id).values({column: 0})
+        )
+
+    def reconcile(self) -> Dict[str, Any]:
+        """
+        Recompute every counter from the source rows and fix the ones that drifted
+
+        Set-based: one pass per counter regardless of user count. Writes that
+        race with the pass can leave a counter off until the next run.
+
+        Returns:
+            Dict with the number of corrected rows per counter
+        """
+
+        start = time.perf_counter()
+        stats: Dict[str, Any] = {}
+
+        stats['conversations'] = self.db.execute(text(_RECONCILE_CONVERSATIONS)).rowcount
+
+        for column in COUNTER_COLUMNS:
+            actual = _ACTUAL_COUNTS[column]
+            corrected = self.db.execute(text(f"""
+                INSERT INTO unread_counters (user_id, notifications, messages)
+                SELECT user_id,
+                       {'n' if column == 'notifications' else '0'},
+                       {'n' if column == 'messages' else '0'}
+                FROM ({actual}) actual WHERE true
+                ON CONFLICT (user_id) DO UPDATE SET {column} = excluded.{column}
+                WHERE unread_counters.{column} <> excluded.{column}
+            """)).rowcount
+            # Users with no unread rows left
+            corrected += self.db.execute(text(f"""
+                UPDATE unread_counters SET {column} = 0
+                WHERE {column} <> 0
+                  AND user_id NOT IN (SELECT user_id FROM ({actual}) actual)
+            """)).rowcount
+            stats[column] = corrected
+
+        self.db.commit()
+
+        stats['elapsed_seconds'] = round(time.perf_counter() - start, 3)
+        return stats
+
+    def _increment(self, column: str, rows):
+        dialect = self.db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            insert = pg_insert if dialect == "postgresql" else sqlite_insert
+            statement = insert(_counters)
+            self.db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[_counters.c.user_id],
+                    set_={column: _counters.c[column] + statement.excluded[column]}
+                ),
+                rows
+            )
+            return
+
+        # No upsert: update existing rows, then insert the missing ones
+        existing = {
+            user_id for (user_id,) in self.db.execute(
+                _counters.select().with_only_columns(_counters.c.user_id).where(
+                    _counters.c.user_id.in_([row['user_id'] for row in rows])
+                )
+            )
+        }
+        counter = _counters.c[column]
+        updates = [
+            {'counter_user_id': row['user_id'], 'amount': row[column]}
+            for row in rows if row['user_id'] in existing
+        ]
+        if updates:
+            self.db.execute(
+                update(_counters).where(
+                    _counters.c.user_id == bindparam('counter_user_id')
+                ).values({column: counter + bindparam('amount')}),
+                updates
+            )
+        inserts = [row for row in rows if row['user_id'] not in existing]
+        if inserts:
+            self.db.execute(_counters.insert(), inserts)
+
+
+def ensure_conversation_counters(connection: Connection):
+    """Add the per-conversation counter columns (PostgreSQL; idempotent)"""
+    if connection.dialect.name != "postgresql":
+        return
+
+    for statement in CONVERSATION_COUNTER_STATEMENTS:
+        connection.execute(text(statement))
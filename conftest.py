@@ -0,0 +1,16 @@
+"""
+Shared pytest setup
+Puts the API sources on the import path. Set TEST_DATABASE_URL to a seeded
+PostgreSQL database to also run the route smoke tests.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend', 'hotgigs-api', 'src'))
+
+if os.environ.get("TEST_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.environ["TEST_DATABASE_URL"]
+
+# Script that exercises a live deployment when imported; run it directly
+collect_ignore = ["test_phase2_api.py"]
@@ -0,0 +1,189 @@
+"""
+Matching Tests
+Scalar vs vectorized scoring, top-k ranking, the match score cache and the
+skill dictionary.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from services.ai_matching import AIMatchingService, experience_level_for_years, job_work_model
+from services.match_cache import MatchScoreCache, SCORE_VERSION
+from services.skill_dictionary import SkillDictionary
+
+CANDIDATES = [
+    {
+        'id': 'c1', 'updated_at': datetime(2024, 1, 1),
+        'skills': ['Python', 'Django', 'PostgreSQL'],
+        'years_of_experience': 6, 'location': 'New York, NY',
+        'remote_preference': False, 'education': [{'degree': 'Bachelor of Science'}]
+    },
+    {
+        'id': 'c2', 'updated_at': datetime(2024, 1, 2),
+        'skills': ['React', 'JS'],
+        'years_of_experience': 1, 'location': 'San Francisco, CA',
+        'remote_preference': True, 'education': []
+    },
+    {
+        'id': 'c3', 'updated_at': datetime(2024, 1, 3),
+        'skills': ['react native', 'kubernetes', 'go'],
+        'years_of_experience': 9, 'location': 'Austin, TX',
+        'remote_preference': False, 'education': [{'degree': 'Master'}]
+    },
+]
+
+JOBS = [
+    {
+        'id': 'j1', 'updated_at': datetime(2024, 2, 1),
+        'required_skills': ['python', 'postgres'], 'preferred_skills': ['flask'],
+        'experience_level': 'senior', 'location': 'New York, NY',
+        'work_model': job_work_model('onsite'), 'requirements': ["Bachelor's degree"]
+    },
+    {
+        'id': 'j2', 'updated_at': datetime(2024, 2, 2),
+        'required_skills': ['react'], 'preferred_skills': ['typescript'],
+        'experience_level': 'entry', 'location': 'Remote',
+        'work_model': job_work_model('remote'), 'requirements': []
+    },
+    {
+        'id': 'j3', 'updated_at': datetime(2024, 2, 3),
+        'required_skills': ['kubernetes', 'rust'], 'preferred_skills': [],
+        'experience_level': 'lead', 'location': 'Austin, TX',
+        'work_model': job_work_model('hybrid'), 'requirements': []
+    },
+    {
+        'id': 'j4', 'updated_at': datetime(2024, 2, 4),
+        'required_skills': [], 'preferred_skills': ['go'],
+        'experience_level': 'mid', 'location': 'Chicago, IL',
+        'work_model': job_work_model(None), 'requirements': []
+    },
+]
+
+
+@pytest.fixture
+def service():
+    return AIMatchingService(SkillDictionary())
+
+
+def test_experience_level_for_years():
+    assert experience_level_for_years(None) == 'entry'
+    assert experience_level_for_years(1) == 'entry'
+    assert experience_level_for_years(2) == 'mid'
+    assert experience_level_for_years(5) == 'senior'
+    assert experience_level_for_years(8) == 'lead'
+    assert experience_level_for_years(20) == 'executive'
+
+
+def test_job_work_model_normalizes_onsite():
+    assert job_work_model('onsite') == 'on-site'
+    assert job_work_model('On Site') == 'on-site'
+    assert job_work_model(None) == 'on-site'
+    assert job_work_model('Remote') == 'remote'
+    assert job_work_model('hybrid') == 'hybrid'
+
+
+def test_onsite_job_scores_location(service):
+    result = service.calculate_match_score(CANDIDATES[0], JOBS[0])
+    assert result['breakdown']['location'] == 100.0
+
+    remote_candidate = {**CANDIDATES[1], 'location': 'Boston, MA'}
+    result = service.calculate_match_score(remote_candidate, JOBS[0])
+    assert result['breakdown']['location'] == 40.0
+
+
+def test_match_features_derive_experience_from_years(service):
+    assert service.build_match_features({'years_of_experience': 6})['experience_level'] == \
+        service.experience_levels['senior']
+    assert service.build_match_features({})['experience_level'] == service.experience_levels['entry']
+
+
+def test_batch_scores_match_scalar_scores(service):
+    for candidate in CANDIDATES:
+        ranked = {job['id']: job for job in service.rank_jobs_for_candidate(candidate, JOBS)}
+        for job in JOBS:
+            scalar = service.calculate_match_score(candidate, job)
+            assert ranked[job['id']]['match_score'] == scalar['match_score'], (candidate['id'], job['id'])
+            assert ranked[job['id']]['match_breakdown'] == scalar['breakdown'], (candidate['id'], job['id'])
+
+    for job in JOBS:
+        ranked = {c['id']: c for c in service.rank_candidates_for_job(CANDIDATES, job)}
+        for candidate in CANDIDATES:
+            scalar = service.calculate_match_score(candidate, job)
+            assert ranked[candidate['id']]['match_score'] == scalar['match_score'], (candidate['id'], job['id'])
+
+
+def test_top_k_matches_full_ranking(service):
+    for k in (0, 1, 2, len(JOBS), len(JOBS) + 3):
+        top = service.top_jobs_for_candidate(CANDIDATES[2], JOBS, k)
+        ranked = service.rank_jobs_for_candidate(CANDIDATES[2], JOBS)[:k]
+        assert [job['id'] for job in top] == [job['id'] for job in ranked]
+
+    top = service.top_candidates_for_job(CANDIDATES, JOBS[1], 2)
+    ranked = service.rank_candidates_for_job(CANDIDATES, JOBS[1])[:2]
+    assert [c['id'] for c in top] == [c['id'] for c in ranked]
+
+
+def test_match_cache_serves_repeat_pairs(service):
+    cache = MatchScoreCache(max_entries=100, ttl_seconds=60, use_redis=False)
+
+    first = service.top_jobs_for_candidate(CANDIDATES[0], JOBS, 3, cache=cache)
+    assert cache.stats()['misses'] == len(JOBS)
+
+    second = service.top_jobs_for_candidate(CANDIDATES[0], JOBS, 3, cache=cache)
+    assert cache.stats()['hits'] == len(JOBS)
+    assert second == first
+
+    scalar = service.calculate_match_score(CANDIDATES[0], JOBS[0], cache=cache)
+    assert scalar['match_score'] == service.calculate_match_score(CANDIDATES[0], JOBS[0])['match_score']
+
+
+def test_match_cache_keys_change_with_updates():
+    cache = MatchScoreCache(max_entries=10, ttl_seconds=60, use_redis=False)
+    key = cache.make_key(CANDIDATES[0], JOBS[0])
+
+    assert key.startswith(f'match:v{SCORE_VERSION}:')
+    assert cache.make_key({**CANDIDATES[0], 'updated_at': datetime(2025, 1, 1)}, JOBS[0]) != key
+    assert cache.make_key({'skills': []}, JOBS[0]) is None
+
+
+def test_skill_dictionary_aliases_and_relations():
+    dictionary = SkillDictionary()
+
+    assert dictionary.canonicalize('  JS ') == 'javascript'
+    assert dictionary.intern('ReactJS') == dictionary.intern('react')
+    assert dictionary.is_related(dictionary.intern('python'), dictionary.intern('django'))
+    assert not dictionary.is_related(dictionary.intern('python'), dictionary.intern('react'))
+    assert {'react', 'react native', 'vue'} <= dictionary.expand(['react', 'react native'])
+
+
+def test_partial_match_does_not_depend_on_interning_history(service):
+    # 'react native' has never been seen: the first call must already give partial credit
+    first = service._calculate_skill_match(['react'], ['react native'], [])
+    second = service._calculate_skill_match(['react'], ['react native'], [])
+    assert first == second == 40.0
+
+
+def test_partial_cache_sees_new_skills():
+    dictionary = SkillDictionary()
+    rust = dictionary.intern('rust')
+    embedded = dictionary.intern('rust embedded')
+    assert dictionary.partial_ids(rust) == {embedded}
+
+    unrelated = dictionary.partial_ids(dictionary.intern('python'))
+    async_rust = dictionary.intern('rust async')
+    assert dictionary.partial_ids(rust) == {embedded, async_rust}
+    assert dictionary.partial_ids(dictionary.intern('python')) == unrelated
+
+
+def test_free_text_skills_are_bounded():
+    dictionary = SkillDictionary(max_free_text=2)
+    size = dictionary.size
+
+    ids = dictionary.intern_free_text_many(['basket weaving', 'python', 'juggling', 'origami'])
+    assert len(ids) == 3
+    assert dictionary.lookup('origami') is None
+    assert dictionary.size == size + 2
+
+    # Job skills are always interned
+    assert dictionary.intern('origami') == dictionary.intern_free_text('origami')
@@ -0,0 +1,151 @@
+"""
+Notification Tests
+Buffered writer (dedup and retries), push hub and unread counters.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from models.user import User
+from services.notification_hub import NotificationHub, RESYNC_EVENT
+from services.notification_service import NotificationService
+from services.notification_writer import NotificationWriter
+from services.unread_counters import UnreadCounterService, _counters
+
+
+class FakeSession:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def inserts(monkeypatch):
+    """Batches passed to the bulk insert; set `failures` to make the next ones fail"""
+    state = {'batches': [], 'failures': 0}
+
+    def create_notifications_bulk(self, notifications, commit=True):
+        state['batches'].append(list(notifications))
+        if state['failures']:
+            state['failures'] -= 1
+            raise RuntimeError("database unavailable")
+        return [uuid.uuid4() for _ in notifications]
+
+    monkeypatch.setattr(NotificationService, 'create_notifications_bulk', create_notifications_bulk)
+    return state
+
+
+def make_writer(**kwargs):
+    # A long interval keeps the background thread out of the way; tests flush
+    return NotificationWriter(flush_interval_ms=60000, session_factory=FakeSession, **kwargs)
+
+
+def test_writer_drops_exact_duplicates(inserts):
+    writer = make_writer()
+    user_id, application_id = uuid.uuid4(), uuid.uuid4()
+
+    assert writer.submit(user_id, 'application_status', 'Update', 'Shortlisted', related_application_id=application_id)
+    assert not writer.submit(user_id, 'application_status', 'Update', 'Shortlisted', related_application_id=application_id)
+    assert writer.flush() == 1
+
+    # Still inside the dedup window after the write
+    assert not writer.submit(user_id, 'application_status', 'Update', 'Shortlisted', related_application_id=application_id)
+    assert writer.stats()['deduplicated'] == 2
+
+
+def test_writer_keeps_distinct_notifications_about_the_same_entity(inserts):
+    writer = make_writer()
+    user_id, application_id = uuid.uuid4(), uuid.uuid4()
+
+    assert writer.submit(user_id, 'application_status', 'Update', 'Shortlisted', related_application_id=application_id)
+    assert writer.submit(user_id, 'application_status', 'Update', 'Interview', related_application_id=application_id)
+    assert writer.flush() == 2
+
+
+def test_writer_retries_failed_batches(inserts):
+    writer = make_writer(max_attempts=3)
+    inserts['failures'] = 2
+    writer.submit(uuid.uuid4(), 'new_message', 'Message', 'Hello')
+
+    assert writer.flush() == 0
+    assert writer.flush() == 0
+    assert writer.flush() == 1
+    assert writer.stats() == {'buffered': 0, 'written': 1, 'deduplicated': 0, 'retried': 2, 'failed': 0}
+
+
+def test_writer_gives_up_after_max_attempts(inserts):
+    writer = make_writer(max_attempts=2)
+    inserts['failures'] = 10
+    user_id = uuid.uuid4()
+    writer.submit(user_id, 'new_message', 'Message', 'Hello')
+
+    assert writer.flush() == 0
+    assert writer.flush() == 0
+    assert writer.flush() == 0
+    assert len(inserts['batches']) == 2
+    assert writer.stats()['failed'] == 1
+
+    # Dropped rows no longer block a resubmission
+    inserts['failures'] = 0
+    assert writer.submit(user_id, 'new_message', 'Message', 'Hello')
+    assert writer.flush() == 1
+
+
+def test_hub_delivers_to_open_streams():
+    hub = NotificationHub(queue_size=10, use_redis=False)
+    user_id = uuid.uuid4()
+
+    async def run():
+        async with hub.connect(user_id) as queue:
+            hub.publish(user_id, 'notification', {'title': 'Hi'})
+            hub.publish(uuid.uuid4(), 'notification', {'title': 'Someone else'})
+            return await asyncio.wait_for(queue.get(), 1)
+
+    assert asyncio.run(run()) == ('notification', '{"title": "Hi"}')
+    assert hub.stats()['published'] == 1
+    assert not hub.is_listening(user_id)
+
+
+def test_hub_resyncs_slow_streams():
+    hub = NotificationHub(queue_size=2, use_redis=False)
+    user_id = uuid.uuid4()
+
+    async def run():
+        async with hub.connect(user_id) as queue:
+            for n in range(3):
+                hub.publish(user_id, 'notification', {'n': n})
+            await asyncio.sleep(0)
+            return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    assert asyncio.run(run()) == [RESYNC_EVENT]
+    assert hub.stats()['dropped'] == 2
+
+
+def test_unread_counters():
+    engine = create_engine('sqlite://')
+    User.__table__.create(engine)
+    _counters.create(engine)
+
+    with Session(engine) as db:
+        counters = UnreadCounterService(db)
+        user_id = uuid.uuid4()
+
+        counters.add('notifications', {user_id: 3})
+        counters.add('notifications', {user_id: 2})
+        counters.add('messages', {user_id: 1})
+        assert counters.get_counts(user_id) == {'notifications': 5, 'messages': 1}
+
+        # Never below zero
+        counters.add('notifications', {user_id: -10})
+        counters.reset('messages', user_id)
+        assert counters.get_counts(user_id) == {'notifications': 0, 'messages': 0}
+
+        assert counters.get_counts(uuid.uuid4()) == {'notifications': 0, 'messages': 0}
+        with pytest.raises(ValueError):
+            counters.add('likes', {user_id: 1})
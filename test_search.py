@@ -0,0 +1,180 @@
+"""
+Search Tests
+Keyset cursors, criteria normalization, facets and the search result cache.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import services.typeahead
+from services.search_cache import SearchResultCache
+from services.search_service import JOB_FACETS, JOB_FACET_EXPRESSIONS, SearchService
+from services.typeahead import TypeaheadIndex
+
+
+class FakeFacetQuery:
+    """Stands in for a filtered job query on a non-PostgreSQL database"""
+
+    def __init__(self, rows_by_column):
+        self.rows_by_column = rows_by_column
+        self.requested = None
+
+    def with_entities(self, *expressions):
+        self.requested = expressions
+        columns = [self.rows_by_column[expression.key] for expression in expressions]
+        return list(zip(*columns))
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def incr(self, key):
+        self.values[key] = self.values.get(key, 0) + 1
+        return self.values[key]
+
+
+class FakeJobsSession:
+    """Answers the typeahead rebuild query with a fixed list of active jobs"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def query(self, *columns):
+        return self
+
+    def outerjoin(self, *args):
+        return self
+
+    def filter(self, *args):
+        return self
+
+    def all(self):
+        return list(self.rows)
+
+
+@pytest.fixture
+def service():
+    bind = SimpleNamespace(dialect=SimpleNamespace(name="sqlite"))
+    return SearchService(SimpleNamespace(get_bind=lambda: bind))
+
+
+def test_cursor_round_trip(service):
+    last_id = uuid.uuid4()
+    for value in (datetime(2024, 5, 1, 12, 30), 'Senior Engineer', 120000, 0.25, None):
+        cursor = service._encode_cursor('jobs:created_at:desc', value, last_id)
+        assert service._decode_cursor(cursor, 'jobs:created_at:desc') == (value, last_id)
+
+
+def test_cursor_rejects_other_sorts_and_garbage(service):
+    cursor = service._encode_cursor('jobs:created_at:desc', 5, uuid.uuid4())
+
+    with pytest.raises(ValueError):
+        service._decode_cursor(cursor, 'jobs:salary:desc')
+    with pytest.raises(ValueError):
+        service._decode_cursor('not-a-cursor', 'jobs:created_at:desc')
+
+
+def test_equivalent_criteria_share_a_key(service):
+    a = service._normalize_job_criteria(query='  Python   Developer ', skills=['Go', 'python', 'go'], location=None)
+    b = service._normalize_job_criteria(query='python developer', skills=['python', 'go'], work_model=[])
+    assert service._criteria_key(a) == service._criteria_key(b)
+
+    c = service._normalize_job_criteria(query='python developer', employment_type=['contract'])
+    assert service._criteria_key(a) != service._criteria_key(c)
+
+
+def test_posted_within_days_buckets(service):
+    assert service._bucket_days(1) == 1
+    assert service._bucket_days(5) == 7
+    assert service._bucket_days(31) == 60
+    assert service._bucket_days(365) == 365
+
+
+def test_facets_use_job_columns():
+    assert JOB_FACET_EXPRESSIONS['work_model']().key == 'remote_policy'
+    assert JOB_FACET_EXPRESSIONS['employment_type']().key == 'job_type'
+    assert set(JOB_FACET_EXPRESSIONS) == set(JOB_FACETS)
+
+
+def test_facets_build_only_requested_expressions(service):
+    query = FakeFacetQuery({'remote_policy': ['onsite', 'remote', 'onsite']})
+
+    facets = service._job_facets(query, ['work_model'], criteria_key=uuid.uuid4().hex)
+
+    assert len(query.requested) == 1
+    assert facets == {'work_model': [{'value': 'on-site', 'count': 2}, {'value': 'remote', 'count': 1}]}
+
+
+def test_unknown_facets_are_rejected(service):
+    with pytest.raises(ValueError):
+        service._job_facets(FakeFacetQuery({}), ['status'], criteria_key=uuid.uuid4().hex)
+
+
+def test_candidate_experience_filter_uses_years(service):
+    sql = str(service._experience_level_filter(['mid']).compile(
+        dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}
+    ))
+    assert 'years_of_experience' in sql
+    assert '>= 2' in sql and '< 5' in sql
+
+
+def test_search_cache_invalidation_orphans_pages():
+    cache = SearchResultCache(max_entries=10, ttl_seconds=60, use_redis=False)
+    cache.set('page-1', {'job_ids': ['a', 'b']})
+    assert cache.get('page-1') == {'job_ids': ['a', 'b']}
+
+    generation = cache.generation
+    cache.invalidate()
+    assert cache.generation == generation + 1
+    assert cache.get('page-1') is None
+
+
+def test_typeahead_picks_up_other_workers_writes(monkeypatch, tmp_path):
+    redis = FakeRedis()
+    monkeypatch.setattr(services.typeahead, 'get_redis_client', lambda: redis)
+
+    def worker():
+        return TypeaheadIndex(
+            snapshot_path=str(tmp_path / 'typeahead.json'), snapshot_interval_seconds=0,
+            use_redis=True, generation_check_seconds=0
+        )
+
+    python_job, rust_job = uuid.uuid4(), uuid.uuid4()
+    db = FakeJobsSession([(python_job, 'Python Developer', ['python'], 'New York', 'Acme')])
+    writer, reader = worker(), worker()
+    writer.ensure_built(db)
+    reader.ensure_built(db)
+    assert [s['text'] for s in reader.suggest('pyth')] == ['python', 'Python Developer']
+
+    # The job write lands on the other worker
+    db.rows = [(rust_job, 'Rust Engineer', ['rust'], 'Austin', 'Beta')]
+    writer.remove_job(python_job)
+    writer.set_job(rust_job, 'Rust Engineer', ['rust'], 'Austin', 'Beta')
+    assert not writer.needs_refresh()
+    assert reader.needs_refresh()
+
+    reader.ensure_built(db)
+    assert reader.suggest('pyth') == []
+    assert [s['text'] for s in reader.suggest('rus')] == ['rust', 'Rust Engineer']
+
+
+def test_typeahead_refreshes_after_ttl_without_redis(monkeypatch):
+    monkeypatch.setattr(services.typeahead, 'get_redis_client', lambda: None)
+    index = TypeaheadIndex(snapshot_path='', refresh_seconds=0, generation_check_seconds=0)
+
+    db = FakeJobsSession([])
+    index.ensure_built(db)
+    assert index.suggest('go') == []
+
+    db.rows = [(uuid.uuid4(), 'Go Developer', ['go'], 'Chicago', 'Gamma')]
+    assert index.needs_refresh()
+    index.ensure_built(db)
+    assert [s['text'] for s in index.suggest('go')] == ['go', 'Go Developer']